@@ -1,12 +1,40 @@
 from . import analytical as analytical
+from . import branching as branching
+from . import checkpoint as checkpoint
+from . import cohort as cohort
+from . import control as control
+from . import cost as cost
+from . import histograms as histograms
+from . import history as history
+from . import jobqueue as jobqueue
+from . import output as output
+from . import projection as projection
+from . import rates as rates
+from . import reducers as reducers
+from . import replication as replication
+from . import sampling as sampling
+from . import sequential as sequential
+from . import stopping as stopping
+from . import streams as streams
+from . import sweep as sweep
+from . import vectorised as vectorised
 from .birth_death import adjust_aces as adjust_aces
+from .birth_death import adjust_aces_array as adjust_aces_array
 from .birth_death import adjust_age_for_aces as adjust_age_for_aces
 from .birth_death import birth as birth
+from .birth_death import birth_array as birth_array
 from .birth_death import death as death
+from .birth_death import death_array as death_array
 from .birth_death import (
     sample_intergenerational_number_of_aces as sample_intergenerational_number_of_aces,
 )
 from .birth_death import sample_number_of_aces as sample_number_of_aces
+from .birth_death import sample_number_of_aces_array as sample_number_of_aces_array
 from .individual import Individual as Individual
+from .population import Population as Population
 from .simulation import get_population as get_population
+from .simulation import get_population_array as get_population_array
 from .simulation import uk_population_pyramid as uk_population_pyramid
+from .simulation import (
+    uk_population_pyramid_array as uk_population_pyramid_array,
+)
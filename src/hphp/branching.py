@@ -0,0 +1,184 @@
+"""
+Share a warm-up between runs with different parameters.
+
+Runs that start from the same population and differ only in the parameters
+used after a warm-up can simulate the warm-up once: `warm_up` returns a
+snapshot of the run (a `hphp.checkpoint.Checkpoint`, which can be saved with
+`hphp.checkpoint.save`) and `fork` continues it with any parameters. Each
+continuation draws from its own random stream so continuations are
+independent of each other and of the warm-up.
+"""
+
+import concurrent.futures
+import functools
+import importlib
+from collections.abc import Callable, Iterable
+from types import ModuleType
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from . import simulation, streams
+from .checkpoint import Checkpoint, generator
+from .individual import Individual
+from .population import Population
+from .reducers import Reducer, observe
+
+
+def warm_up(
+    number_of_years: int,
+    initial_population: npt.NDArray[np.int64] | Population | list[Individual],
+    reducers: Iterable[Reducer] = (),
+    engine: ModuleType = simulation,
+    seed: int | np.random.Generator | None = None,
+    **parameters: Any,
+) -> Checkpoint:
+    """
+    Simulate the first `number_of_years` of a run of `engine.stream` and
+    return a snapshot of its final state.
+
+    The `reducers` observe every year of the warm-up and are part of the
+    snapshot. An int `seed` seeds a `numpy.random.Generator`.
+    """
+    rng = np.random.default_rng(seed)
+    reducers = list(reducers)
+    population = initial_population
+    for population in engine.stream(
+        number_of_years=number_of_years,
+        initial_population=initial_population,
+        seed=rng,
+        **parameters,
+    ):
+        observe((population,), reducers)
+    return Checkpoint(
+        year=number_of_years,
+        population=population,
+        rng_state=dict(rng.bit_generator.state),
+        reducers=reducers,
+    )
+
+
+def fork(
+    snapshot: Checkpoint,
+    number_of_years: int,
+    reducers: Iterable[Reducer],
+    engine: ModuleType = simulation,
+    seed: int | np.random.Generator | None = None,
+    **parameters: Any,
+) -> list[Reducer]:
+    """
+    Continue a snapshot for `number_of_years` with the given parameters.
+
+    As for `stream`, the `reducers` observe the population of the snapshot
+    first and then each of the `number_of_years` years that follow. With a
+    `seed` of None the continuation carries on the random stream of the
+    snapshot, which makes the warm-up and the fork the same as a single run;
+    forks meant to be independent should each have their own seed (see
+    `fork_all`). As for `warm_up`, an int `seed` seeds a
+    `numpy.random.Generator`.
+    """
+    rng = generator(snapshot.rng_state) if seed is None else np.random.default_rng(seed)
+    reducers = list(reducers)
+    observe(
+        engine.stream(
+            number_of_years=number_of_years,
+            initial_population=snapshot.population,
+            seed=rng,
+            **parameters,
+        ),
+        reducers,
+    )
+    return reducers
+
+
+def fork_all(
+    snapshot: Checkpoint,
+    number_of_years: int,
+    parameters: Iterable[dict[str, Any]],
+    reducers: Callable[[], list[Reducer]],
+    engine: ModuleType = simulation,
+    seed: int | None = None,
+    rep: int = 0,
+    processes: int | None = 1,
+) -> list[list[Reducer]]:
+    """
+    Fork a snapshot once for each dictionary of `parameters`.
+
+    Each fork draws from the stream of `hphp.streams` keyed by its
+    parameters, the year of the snapshot and `rep`, so forks are independent
+    and reproducible for a given `seed`.
+
+    Parameters
+    ----------
+    snapshot : Checkpoint
+        The state to continue (see `warm_up`).
+
+    number_of_years : int
+        Number of years to simulate after the snapshot.
+
+    parameters : iterable of dict
+        The parameters of each fork, passed on to `engine.stream`.
+
+    reducers : callable
+        Called with no argument to create the reducers of each fork.
+
+    engine : module
+        The engine to run: `hphp.simulation`, `hphp.vectorised` or
+        `hphp.cohort`.
+
+    seed : int or None
+        Base seed of the random streams.
+
+    rep : int
+        Index of the replicate that the snapshot belongs to.
+
+    processes : int or None
+        Number of worker processes (the number of CPUs if None). With 1 the
+        forks run one after another in this process.
+
+    Returns
+    -------
+    reducers : list of lists of Reducer
+        The reducers of each fork, in the order of `parameters`.
+    """
+    parameters = [dict(fork_parameters) for fork_parameters in parameters]
+    seeds = [
+        streams.seed_sequence(
+            seed=seed,
+            configuration=(snapshot.year, *sorted(fork_parameters.items())),
+            rep=rep,
+        )
+        for fork_parameters in parameters
+    ]
+    # Modules cannot be sent to worker processes so the engine is passed by
+    # name.
+    run = functools.partial(
+        _fork,
+        snapshot,
+        number_of_years,
+        reducers=reducers,
+        engine_name=engine.__name__,
+    )
+    if processes == 1:
+        return list(map(run, seeds, parameters))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(run, seeds, parameters))
+
+
+def _fork(
+    snapshot: Checkpoint,
+    number_of_years: int,
+    seed_sequence: np.random.SeedSequence,
+    parameters: dict[str, Any],
+    reducers: Callable[[], list[Reducer]],
+    engine_name: str,
+) -> list[Reducer]:
+    return fork(
+        snapshot,
+        number_of_years=number_of_years,
+        reducers=reducers(),
+        engine=importlib.import_module(engine_name),
+        seed=np.random.default_rng(seed_sequence),
+        **parameters,
+    )
@@ -0,0 +1,202 @@
+"""
+Checkpoint a run so that it can be resumed after being interrupted.
+
+A checkpoint holds everything the `stream` of an engine needs to carry on
+from a given year: the population, the state of the random number generator
+and the year, along with the state of the reducers summarising the run. It
+is written to a single compressed `.npz` file.
+
+Resuming from a checkpoint gives exactly the same results as a run that was
+never interrupted.
+"""
+
+import json
+import os
+import pickle
+from collections.abc import Iterable
+from types import ModuleType
+from typing import Any, NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+from . import simulation
+from .individual import Individual
+from .population import Population, as_counts, from_individuals, to_individuals
+from .reducers import Reducer
+
+# How the population of a checkpoint is stored.
+INDIVIDUALS, POPULATION, COUNTS = "individuals", "population", "counts"
+
+
+class Checkpoint(NamedTuple):
+    """
+    The state of a run after observing `year`.
+    """
+
+    year: int
+    population: npt.NDArray[np.int64] | Population | list[Individual]
+    rng_state: dict[str, Any]
+    reducers: list[Reducer]
+
+
+def save(path: str, checkpoint: Checkpoint) -> None:
+    """
+    Write a checkpoint to `path`.
+
+    The file is written under a temporary name and then renamed so an
+    interruption never leaves a partial checkpoint.
+    """
+    population = checkpoint.population
+    arrays: dict[str, npt.NDArray]
+    if isinstance(population, Population):
+        kind, arrays = POPULATION, population._asdict()
+    elif isinstance(population, list):
+        kind, arrays = INDIVIDUALS, from_individuals(population)._asdict()
+    else:
+        kind, arrays = COUNTS, {"counts": population}
+    metadata = {
+        "year": checkpoint.year,
+        "kind": kind,
+        "rng_state": checkpoint.rng_state,
+    }
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as f:
+        np.savez_compressed(
+            f,
+            metadata=np.frombuffer(json.dumps(metadata).encode(), dtype=np.uint8),
+            reducers=np.frombuffer(pickle.dumps(checkpoint.reducers), dtype=np.uint8),
+            allow_pickle=False,
+            **arrays,
+        )
+    os.replace(temporary_path, path)
+
+
+def load(path: str) -> Checkpoint:
+    """
+    Read the checkpoint written to `path` by `save`.
+    """
+    with np.load(path) as data:
+        metadata = json.loads(data["metadata"].tobytes())
+        reducers = pickle.loads(data["reducers"].tobytes())
+        if metadata["kind"] == COUNTS:
+            population = data["counts"]
+        else:
+            population = Population(
+                **{field: data[field] for field in Population._fields}
+            )
+            population = population._replace(weight=float(population.weight))
+            if metadata["kind"] == INDIVIDUALS:
+                population = to_individuals(population)
+    return Checkpoint(
+        year=metadata["year"],
+        population=population,
+        rng_state=metadata["rng_state"],
+        reducers=reducers,
+    )
+
+
+def generator(rng_state: dict[str, Any]) -> np.random.Generator:
+    """
+    Return a generator in the state `rng_state` (see
+    `numpy.random.BitGenerator.state`).
+    """
+    bit_generator = getattr(np.random, rng_state["bit_generator"])()
+    bit_generator.state = rng_state
+    return np.random.Generator(bit_generator)
+
+
+def simulate(
+    path: str,
+    number_of_years: int,
+    initial_population: npt.NDArray[np.int64] | Population | list[Individual],
+    reducers: Iterable[Reducer],
+    engine: ModuleType = simulation,
+    seed: int | np.random.Generator | None = None,
+    every: int = 10,
+    **parameters: Any,
+) -> list[Reducer]:
+    """
+    Observe a run of `engine.stream` with `reducers`, writing a checkpoint to
+    `path` every `every` years and at the end of the run.
+
+    If `path` already holds a checkpoint the run resumes from it, ignoring
+    `initial_population`, `reducers` and `seed`, and gives the same results as
+    if it had never stopped.
+
+    Parameters
+    ----------
+    path : str
+        Path of the checkpoint file.
+
+    number_of_years : int
+        Number of years to simulate.
+
+    initial_population : array, Population or list of Individual
+        Initial population state, in a form accepted by `engine`.
+
+    reducers : iterable of Reducer
+        Reducers summarising the run (see `hphp.reducers`).
+
+    engine : module
+        The engine to run: `hphp.simulation`, `hphp.vectorised` or
+        `hphp.cohort`.
+
+    seed : int, Generator or None
+        Random seed or generator. An int seeds a `numpy.random.Generator`
+        rather than the global state so that its state can be saved.
+
+    every : int
+        Number of years between checkpoints.
+
+    **parameters
+        The parameters of the model passed on to `engine.stream`.
+
+    Returns
+    -------
+    reducers : list of Reducer
+        The reducers, updated with every year of the run. After resuming
+        these are the reducers of the checkpoint rather than those passed in.
+    """
+    if os.path.exists(path):
+        checkpoint = load(path)
+        year = checkpoint.year
+        population = checkpoint.population
+        reducers = checkpoint.reducers
+        rng = generator(checkpoint.rng_state)
+    else:
+        year = 0
+        population = initial_population
+        reducers = list(reducers)
+        rng = np.random.default_rng(seed)
+        _update(reducers, population)
+        save(
+            path, Checkpoint(year, population, dict(rng.bit_generator.state), reducers)
+        )
+
+    populations = engine.stream(
+        number_of_years=number_of_years - year,
+        initial_population=population,
+        seed=rng,
+        **parameters,
+    )
+    # The first population is the one of the checkpoint, already observed.
+    next(populations)
+    for population in populations:
+        year += 1
+        _update(reducers, population)
+        if year % every == 0 or year == number_of_years:
+            save(
+                path,
+                Checkpoint(year, population, dict(rng.bit_generator.state), reducers),
+            )
+    return reducers
+
+
+def _update(
+    reducers: list[Reducer],
+    population: npt.NDArray[np.int64] | Population | list[Individual],
+) -> None:
+    counts = as_counts(population)
+    for reducer in reducers:
+        reducer.update(counts)
@@ -0,0 +1,196 @@
+from collections.abc import Iterator
+
+import numpy as np
+import numpy.typing as npt
+
+from .individual import FEMALE, MALE, MAXIMUM_NUMBER_OF_ACES, Individual
+from .population import COUNTS_SHAPE, Population, from_individuals, to_counts
+from .rates import (
+    INTERGENERATIONAL_ACE_DISTRIBUTION,
+    PROBABILITY_OF_DEATH,
+    fertility_surface,
+)
+
+# The (sex, age, number of aces) of every cell of a count array.
+_, _AGE, _NUMBER_OF_ACES = np.indices(COUNTS_SHAPE)
+
+# Indices of the ace moves of `ace_move_probabilities`.
+TRAUMA, HEAL, NO_CHANGE = range(3)
+
+
+def ace_move_probabilities(
+    probability_of_heal: float, probability_of_trauma: float
+) -> npt.NDArray[np.float64]:
+    """
+    Return the probability that a survivor in each (sex, age, number of aces)
+    cell gains an ace, loses an ace or keeps their number of aces, as in
+    `hphp.birth_death.adjust_aces`.
+
+    A trauma that would take someone past `MAXIMUM_NUMBER_OF_ACES` and healing
+    of someone with no aces leave the number of aces unchanged.
+    """
+    trauma = np.where(_AGE < 18, probability_of_trauma, 0.0)
+    heal = (1 - trauma) * probability_of_heal
+    trauma = np.where(_NUMBER_OF_ACES < MAXIMUM_NUMBER_OF_ACES, trauma, 0.0)
+    heal = np.where(_NUMBER_OF_ACES > 0, heal, 0.0)
+    return np.stack((trauma, heal, np.clip(1 - trauma - heal, 0, 1)), axis=-1)
+
+
+def step(
+    counts: npt.NDArray[np.int64],
+    rng: np.random.Generator,
+    probability_of_male_birth: float,
+    alpha: float = 1.1,
+    tempo_years_per_ace: int = 3,
+    probability_of_heal: float = 0,
+    probability_of_trauma: float = 0,
+) -> npt.NDArray[np.int64]:
+    """
+    Advance the number of individuals in each (sex, age, number of aces) cell
+    by one year.
+
+    Individuals in a cell are exchangeable so this draws, for each cell, the
+    number of births and deaths from binomial distributions and the number
+    of children with each sex and number of aces and the number of survivors
+    gaining or losing an ace from multinomial distributions. This has the
+    same distribution as `hphp.vectorised.step` at a cost that does not depend
+    on the size of the population.
+    """
+    # ---- Births ----
+    births = rng.binomial(
+        counts[FEMALE],
+        fertility_surface(alpha=alpha, tempo_years_per_ace=tempo_years_per_ace),
+    )
+    probability_of_sex = np.zeros(COUNTS_SHAPE[0])
+    probability_of_sex[MALE] = probability_of_male_birth
+    probability_of_sex[FEMALE] = 1 - probability_of_male_birth
+    children = rng.multinomial(
+        births.sum(axis=0),
+        (
+            probability_of_sex[None, :, None]
+            * INTERGENERATIONAL_ACE_DISTRIBUTION[:, None, :]
+        ).reshape(MAXIMUM_NUMBER_OF_ACES + 1, -1),
+    ).sum(axis=0)
+
+    # ---- Deaths ----
+    survivors = rng.binomial(counts, 1 - PROBABILITY_OF_DEATH[:, :, None])
+
+    # ---- Healing and trauma ----
+    moves = rng.multinomial(
+        survivors,
+        ace_move_probabilities(
+            probability_of_heal=probability_of_heal,
+            probability_of_trauma=probability_of_trauma,
+        ),
+    )
+    next_counts = np.zeros(COUNTS_SHAPE, dtype=np.int64)
+    next_counts[:, 1:, :] += moves[:, :-1, :, NO_CHANGE]
+    next_counts[:, 1:, 1:] += moves[:, :-1, :-1, TRAUMA]
+    next_counts[:, 1:, :-1] += moves[:, :-1, 1:, HEAL]
+    next_counts[:, 0, :] = children.reshape(COUNTS_SHAPE[0], COUNTS_SHAPE[2])
+    return next_counts
+
+
+def simulate(
+    number_of_years: int,
+    initial_population: npt.NDArray[np.int64] | Population | list[Individual],
+    probability_of_male_birth: float,
+    alpha: float = 1.1,
+    tempo_years_per_ace: int = 3,
+    seed: int | np.random.Generator | None = None,
+    probability_of_heal: float = 0,
+    probability_of_trauma: float = 0,
+) -> list[npt.NDArray[np.int64]]:
+    """
+    Simulate the model of `hphp.simulation.simulate` as the number of
+    individuals in each (sex, age, number of aces) cell.
+
+    Individuals only differ through their sex, age and number of aces so the
+    counts of `hphp.population.to_counts` describe a population completely.
+    Each year is advanced with `step` which costs the same whatever the size
+    of the population. The results have the same distribution as
+    `hphp.simulation.simulate`; individuals can be recovered with
+    `hphp.population.from_counts`.
+
+    Parameters
+    ----------
+    number_of_years : int
+        Number of years to simulate.
+
+    initial_population : array, Population or list of Individual
+        Initial population state. An array gives the number of individuals
+        in each cell and has shape `hphp.population.COUNTS_SHAPE`.
+
+    probability_of_male_birth : float
+        Probability that a newborn is male.
+
+    alpha : float, default=1.1
+        Multiplicative fertility factor (quantum effect).
+
+    tempo_years_per_ace : int, default=3
+        Number of years by which reproduction is shifted earlier per ACE
+        (tempo effect).
+
+    seed : int, Generator or None
+        Random seed or generator for reproducibility.
+
+    probability_of_heal : float
+        Annual probability that an individual reduces their ACE count by one.
+
+    probability_of_trauma : float
+        Annual probability that a child experiences an additional ACE.
+
+    Returns
+    -------
+    populations : list of arrays
+        A history of the counts at each year.
+    """
+    return list(
+        stream(
+            number_of_years=number_of_years,
+            initial_population=initial_population,
+            probability_of_male_birth=probability_of_male_birth,
+            alpha=alpha,
+            tempo_years_per_ace=tempo_years_per_ace,
+            seed=seed,
+            probability_of_heal=probability_of_heal,
+            probability_of_trauma=probability_of_trauma,
+        )
+    )
+
+
+def stream(
+    number_of_years: int,
+    initial_population: npt.NDArray[np.int64] | Population | list[Individual],
+    probability_of_male_birth: float,
+    alpha: float = 1.1,
+    tempo_years_per_ace: int = 3,
+    seed: int | np.random.Generator | None = None,
+    probability_of_heal: float = 0,
+    probability_of_trauma: float = 0,
+) -> Iterator[npt.NDArray[np.int64]]:
+    """
+    Yield the population at each year of `simulate`, starting with the
+    initial population.
+
+    Only the current year is kept in memory. For a given seed this yields
+    exactly the populations returned by `simulate`.
+    """
+    if isinstance(initial_population, list):
+        initial_population = from_individuals(initial_population)
+    if isinstance(initial_population, Population):
+        initial_population = to_counts(initial_population)
+    rng = np.random.default_rng(seed)
+    population = np.asarray(initial_population)
+    yield population
+    for _ in range(number_of_years):
+        population = step(
+            population,
+            rng=rng,
+            probability_of_male_birth=probability_of_male_birth,
+            alpha=alpha,
+            tempo_years_per_ace=tempo_years_per_ace,
+            probability_of_heal=probability_of_heal,
+            probability_of_trauma=probability_of_trauma,
+        )
+        yield population
@@ -0,0 +1,195 @@
+"""
+Estimate the outcome of a configuration with a control variate.
+
+Much of the variance between the reps of a configuration comes from their
+random initial populations. The expected-value projection of `hphp.projection`
+started from the initial population of a rep predicts its outcome and is
+cheap to compute. Its mean over initial populations is estimated from the
+predictions of many more random initial populations than there are reps (the
+projection of the expected initial population is not that mean, as the
+metrics are not linear in the counts). Using the prediction as a control
+variate removes the part of the variance that it explains, so the same
+precision needs fewer reps.
+
+The outcome of a rep is the mean of a metric of `hphp.reducers.Summary` over
+the years from a warm-up on, as for `hphp.sequential.Precision`.
+"""
+
+from collections.abc import Iterable
+
+import numpy as np
+import numpy.typing as npt
+import scipy.stats
+
+from . import simulation, streams
+from .individual import Individual
+from .population import COUNTS_SHAPE, Counts, Population, as_counts
+from .projection import projection_matrix
+from .reducers import Summary
+from .replication import (
+    Configuration,
+    Replicate,
+    initial_population,
+    stream_configuration,
+)
+from .sequential import Estimate, Precision
+
+# The key of the branch of the seed tree (see `hphp.streams`) of the initial
+# populations of `sampled_outcomes`.
+CONTROL = ("control variate",)
+
+
+def projected_outcomes(
+    configuration: Configuration,
+    initial_populations: Iterable[Counts | Population | list[Individual]],
+    metric: str = "prop_traumatised",
+    warm_up: int = 0,
+) -> npt.NDArray[np.float64]:
+    """
+    Return the outcome of the expected-value projection of a configuration
+    from each of `initial_populations`.
+    """
+    matrix = projection_matrix(
+        probability_of_male_birth=configuration.probability_of_male_birth,
+        alpha=configuration.alpha,
+        probability_of_heal=configuration.probability_of_heal,
+        probability_of_trauma=configuration.probability_of_trauma,
+    )
+    states = np.stack(
+        [
+            np.asarray(as_counts(population), dtype=float).ravel()
+            for population in initial_populations
+        ],
+        axis=1,
+    )
+    summary = Summary(trauma_threshold=configuration.trauma_threshold)
+    values = []
+    for year in range(configuration.years + 1):
+        if year >= warm_up:
+            values.append(
+                [
+                    summary.reduce(state.reshape(COUNTS_SHAPE))[metric]
+                    for state in states.T
+                ]
+            )
+        states = matrix @ states
+    return np.nanmean(values, axis=0)
+
+
+def sampled_outcomes(
+    configuration: Configuration,
+    samples: int = 1000,
+    seed: int | None = None,
+    metric: str = "prop_traumatised",
+    warm_up: int = 0,
+) -> npt.NDArray[np.float64]:
+    """
+    Return the `projected_outcomes` of a configuration from `samples` random
+    initial populations, drawn as those of `hphp.replication.run_replicate`
+    but from streams of their own, so independent of the reps.
+
+    Their mean estimates the mean of the control of `estimate`.
+    """
+    rng = np.random.default_rng(
+        streams.seed_sequence(
+            seed, configuration=(*CONTROL, *stream_configuration(configuration))
+        )
+    )
+    return projected_outcomes(
+        configuration,
+        [
+            simulation.get_population_array(
+                number_of_individuals=configuration.initial_population_size,
+                seed=rng,
+                counts=True,
+            )
+            for _ in range(samples)
+        ],
+        metric=metric,
+        warm_up=warm_up,
+    )
+
+
+def control_variate_estimate(
+    outcomes: npt.NDArray[np.float64],
+    controls: npt.NDArray[np.float64],
+    control_mean: float,
+    confidence: float = 0.95,
+    control_mean_variance: float = 0.0,
+) -> Estimate:
+    """
+    Return the control variate estimate of the mean of `outcomes`.
+
+    Each outcome is adjusted by `beta * (control - control_mean)` with
+    `beta` the least squares slope of the outcomes on the controls, and the
+    confidence interval is that of the residuals of the regression, widened
+    by `beta ** 2 * control_mean_variance` when the control mean is itself an
+    estimate. Reps with a NaN outcome or control are left out.
+    """
+    keep = ~(np.isnan(outcomes) | np.isnan(controls))
+    outcomes, controls = outcomes[keep], controls[keep]
+    samples = len(outcomes)
+    if samples < 3:
+        return Estimate(
+            mean=float(np.mean(outcomes)) if samples else np.nan,
+            half_width=np.inf,
+            samples=samples,
+        )
+    variance = np.var(controls, ddof=1)
+    beta = np.cov(outcomes, controls)[0, 1] / variance if variance > 0 else 0.0
+    adjusted = outcomes - beta * (controls - control_mean)
+    quantile = scipy.stats.t.ppf((1 + confidence) / 2, df=samples - 2)
+    residuals = outcomes - beta * controls
+    standard_error = np.sqrt(
+        np.var(residuals, ddof=2) / samples + beta**2 * control_mean_variance
+    )
+    return Estimate(
+        mean=float(adjusted.mean()),
+        half_width=float(quantile * standard_error),
+        samples=samples,
+    )
+
+
+def estimate(
+    configuration: Configuration,
+    replicates: Iterable[Replicate],
+    seed: int,
+    metric: str = "prop_traumatised",
+    warm_up: int = 0,
+    confidence: float = 0.95,
+    control_samples: int = 1000,
+) -> Estimate:
+    """
+    Return the control variate estimate of the mean outcome of the
+    replicates of a configuration run with `seed`.
+
+    The initial population of each replicate is recreated from its random
+    stream (see `hphp.replication.initial_population`), which needs the seed
+    the replicates were run with. The replicates should be independent, so
+    not antithetic. The control mean is estimated with `sampled_outcomes`
+    from `control_samples` initial populations.
+    """
+    if seed is None:
+        raise ValueError("the seed of the replicates is needed to recreate them")
+    replicates = list(replicates)
+    outcomes = Precision(metric=metric, warm_up=warm_up).outcomes(replicates)
+    controls = projected_outcomes(
+        configuration,
+        [
+            initial_population(configuration, rep=replicate.rep, seed=seed)
+            for replicate in replicates
+        ],
+        metric=metric,
+        warm_up=warm_up,
+    )
+    sampled = sampled_outcomes(
+        configuration, control_samples, seed=seed, metric=metric, warm_up=warm_up
+    )
+    sampled = sampled[~np.isnan(sampled)]
+    return control_variate_estimate(
+        outcomes,
+        controls,
+        control_mean=float(sampled.mean()),
+        confidence=confidence,
+        control_mean_variance=float(np.var(sampled, ddof=1) / len(sampled)),
+    )
@@ -0,0 +1,90 @@
+"""
+Predict the cost of running a configuration.
+
+The time taken by a run of `hphp.replication.run_replicate` is proportional to
+the number of individual-years it simulates, which depends heavily on the
+parameters: with a high alpha and a low probability of healing the population
+grows exponentially. `expected_individual_years` computes the expected number from
+the projection of `hphp.projection`, and `CostModel` turns it into a time,
+learning from the measured times of completed runs.
+"""
+
+import numpy as np
+
+from .projection import project
+from .replication import Configuration, expected_initial_population
+
+
+def expected_individual_years(configuration: Configuration) -> float:
+    """
+    Return the expected total size of the population over all the years of a
+    run of `configuration` started from `hphp.simulation.get_population_array`.
+
+    In bounded-size mode the size of each year is capped at `max_population`.
+    """
+    populations = project(
+        number_of_years=configuration.years,
+        initial_population=expected_initial_population(configuration),
+        probability_of_male_birth=configuration.probability_of_male_birth,
+        alpha=configuration.alpha,
+        probability_of_heal=configuration.probability_of_heal,
+        probability_of_trauma=configuration.probability_of_trauma,
+    )
+    sizes = np.array([population.sum() for population in populations])
+    if configuration.max_population is not None:
+        sizes = np.minimum(sizes, configuration.max_population)
+    return float(sizes.sum())
+
+
+class CostModel:
+    """
+    Predict the number of seconds taken by a run of a configuration.
+
+    Before any run is observed the prediction is the expected number of
+    individual-years, which orders configurations correctly. Once runs have
+    been observed with `observe`, a configuration that has run is predicted to
+    take the mean of its measured times and any other configuration its
+    expected individual-years times the measured seconds per expected
+    individual-year over all observed runs.
+    """
+
+    def __init__(self) -> None:
+        self.individual_years: dict[Configuration, float] = {}
+        self.seconds: dict[Configuration, list[float]] = {}
+        self.total_seconds = 0.0
+        self.total_individual_years = 0.0
+
+    def expected_individual_years(self, configuration: Configuration) -> float:
+        if configuration not in self.individual_years:
+            self.individual_years[configuration] = expected_individual_years(
+                configuration
+            )
+        return self.individual_years[configuration]
+
+    def observe(self, configuration: Configuration, seconds: float) -> None:
+        """
+        Record the measured duration of a run of `configuration`.
+        """
+        self.seconds.setdefault(configuration, []).append(seconds)
+        self.total_seconds += seconds
+        self.total_individual_years += self.expected_individual_years(configuration)
+
+    def seconds_per_individual_year(self) -> float:
+        """
+        Return the measured seconds per expected individual-year (1 if no run
+        has been observed).
+        """
+        if self.total_individual_years == 0:
+            return 1.0
+        return self.total_seconds / self.total_individual_years
+
+    def predict(self, configuration: Configuration) -> float:
+        """
+        Return the predicted number of seconds of a run of `configuration`.
+        """
+        if configuration in self.seconds:
+            return float(np.mean(self.seconds[configuration]))
+        return (
+            self.expected_individual_years(configuration)
+            * self.seconds_per_individual_year()
+        )
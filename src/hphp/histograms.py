@@ -0,0 +1,160 @@
+"""
+Keep the number of aces of every year of a run to analyse trauma thresholds
+afterwards.
+
+The summaries of a run (see `hphp.reducers.Summary`) reduce the number of
+aces to the proportion of individuals with at least a trauma threshold of
+them, so every threshold needs a run of its own. The histograms of the
+number of aces of each year (see `hphp.reducers.AceHistogram`), optionally
+split into age bands, hold everything that any threshold needs in a few
+numbers a year: `Histograms` gathers them for the reps of a configuration,
+`save` and `load` write and read them next to `main.csv` (see
+`hphp.output`), and `proportion_traumatised`, `mean_aces` and
+`threshold_table` compute their metrics for every threshold, rep and year at
+once.
+"""
+
+from collections.abc import Iterable
+from typing import BinaryIO, NamedTuple, Self
+
+import numpy as np
+import numpy.typing as npt
+
+from .population import COUNTS_SHAPE
+from .reducers import ALL_AGES
+from .replication import Replicate
+
+
+class Histograms(NamedTuple):
+    """
+    The histograms of the number of aces of the reps of a configuration.
+
+    `counts` has shape (number of reps, number of years, number of age
+    bands, number of aces), with the bands between consecutive `age_bands`.
+    The years after the end of a rep cut short (see `hphp.stopping`) are
+    NaN.
+    """
+
+    reps: npt.NDArray[np.int64]
+    age_bands: npt.NDArray[np.int64]
+    counts: npt.NDArray[np.float64]
+
+    @classmethod
+    def from_replicates(cls, replicates: Iterable[Replicate]) -> Self:
+        """
+        Return the histograms of `replicates`, which must have the same age
+        bands. Replicates without histograms are NaN.
+        """
+        replicates = list(replicates)
+        age_bands = {replicate.age_bands for replicate in replicates}
+        if len(age_bands) > 1:
+            raise ValueError(f"replicates with different age bands: {age_bands}")
+        histograms = [
+            replicate.ace_histograms
+            for replicate in replicates
+            if replicate.ace_histograms is not None
+        ]
+        (age_bands,) = age_bands or {ALL_AGES}
+        number_of_years = max((len(histogram) for histogram in histograms), default=0)
+        counts = np.full(
+            (len(replicates), number_of_years, len(age_bands) - 1, COUNTS_SHAPE[2]),
+            np.nan,
+        )
+        for rep_counts, replicate in zip(counts, replicates):
+            if replicate.ace_histograms is not None:
+                rep_counts[: len(replicate.ace_histograms)] = replicate.ace_histograms
+        return cls(
+            reps=np.array([replicate.rep for replicate in replicates], dtype=np.int64),
+            age_bands=np.array(age_bands, dtype=np.int64),
+            counts=counts,
+        )
+
+    def save(self, path: str | BinaryIO) -> None:
+        """
+        Write the histograms to the `.npz` file `path` (a name or an open
+        file).
+        """
+        np.savez_compressed(path, **self._asdict())
+
+    @classmethod
+    def load(cls, path: str) -> Self:
+        """
+        Read histograms written by `save`.
+        """
+        with np.load(path) as data:
+            return cls(**{field: data[field] for field in cls._fields})
+
+
+def proportion_traumatised(
+    histograms: Histograms,
+    trauma_thresholds: Iterable[int],
+    age_band: int | None = None,
+) -> npt.NDArray[np.float64]:
+    """
+    Return the proportion of individuals with at least each of
+    `trauma_thresholds` aces, in age band `age_band` or in the whole
+    population if None.
+
+    The result has shape (number of thresholds, number of reps, number of
+    years) and is NaN for empty populations and years after the end of a
+    rep.
+    """
+    by_aces = _by_aces(histograms, age_band)
+    # at_least[..., k] is the number of individuals with at least k aces.
+    at_least = np.concatenate(
+        (
+            by_aces[..., ::-1].cumsum(axis=-1)[..., ::-1],
+            np.zeros_like(by_aces[..., :1]),
+        ),
+        axis=-1,
+    )
+    thresholds = np.clip(list(trauma_thresholds), 0, by_aces.shape[-1])
+    traumatised = np.moveaxis(at_least[..., thresholds], -1, 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return traumatised / by_aces.sum(axis=-1)
+
+
+def mean_aces(
+    histograms: Histograms, age_band: int | None = None
+) -> npt.NDArray[np.float64]:
+    """
+    Return the mean number of aces in age band `age_band`, or in the whole
+    population if None, with shape (number of reps, number of years).
+    """
+    by_aces = _by_aces(histograms, age_band)
+    total_aces = (by_aces * np.arange(by_aces.shape[-1])).sum(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return total_aces / by_aces.sum(axis=-1)
+
+
+def threshold_table(
+    histograms: Histograms,
+    trauma_thresholds: Iterable[int],
+    age_band: int | None = None,
+) -> dict[str, npt.NDArray]:
+    """
+    Return `proportion_traumatised` for every threshold as the columns
+    `trauma_threshold`, `rep`, `year` and `prop_traumatised` of a table (for
+    example for `pandas.DataFrame`), with a row for each threshold, rep and
+    year, that can be joined with `main.csv` on the rep and year.
+    """
+    trauma_thresholds = np.array(list(trauma_thresholds), dtype=np.int64)
+    proportions = proportion_traumatised(histograms, trauma_thresholds, age_band)
+    threshold, rep, year = np.meshgrid(
+        trauma_thresholds,
+        histograms.reps,
+        np.arange(proportions.shape[2]),
+        indexing="ij",
+    )
+    return {
+        "trauma_threshold": threshold.ravel(),
+        "rep": rep.ravel(),
+        "year": year.ravel(),
+        "prop_traumatised": proportions.ravel(),
+    }
+
+
+def _by_aces(histograms: Histograms, age_band: int | None) -> npt.NDArray[np.float64]:
+    if age_band is None:
+        return histograms.counts.sum(axis=2)
+    return histograms.counts[:, :, age_band]
@@ -0,0 +1,149 @@
+"""
+Keep the whole history of a run as (sex, age, number of aces) counts.
+
+A year of `hphp.simulation.simulate` is a list of as many individuals as the
+population has, but the counts of each (sex, age, number of aces) cell (see
+`hphp.population.to_counts`) hold the same information in `COUNTS_SHAPE`
+numbers whatever the size of the population. `History` is a reducer that
+records these counts every year: any year can be turned back into its
+individuals and summaries such as the pyramid of every year are computed at
+once over the whole history.
+"""
+
+from collections.abc import Iterable
+from typing import Self
+
+import numpy as np
+import numpy.typing as npt
+
+from .individual import MALE, Individual
+from .population import COUNTS_SHAPE, Counts, Population, from_counts, to_individuals
+from .reducers import Reducer, observe
+
+
+class History(Reducer):
+    """
+    The counts of the population of every year of a run.
+
+    `result` has shape (number of years, *COUNTS_SHAPE). The counts are
+    integers, or floats for a weighted population (see
+    `hphp.population.thin`). Weighted counts estimate the modelled population
+    rather than count individuals, so the years of a weighted history cannot
+    be turned back into a population.
+    """
+
+    def reduce(self, counts: Counts) -> Counts:
+        return np.array(counts)
+
+    def result(self) -> Counts:
+        if not self.values:
+            return np.zeros((0, *COUNTS_SHAPE), dtype=np.int64)
+        return np.stack(self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @classmethod
+    def from_populations(
+        cls,
+        populations: Iterable[npt.NDArray[np.int64] | Population | list[Individual]],
+    ) -> Self:
+        """
+        Return the history of `populations`, typically the output of the
+        `simulate` or `stream` of one of the engines.
+        """
+        history = cls()
+        observe(populations, [history])
+        return history
+
+    def population(self, year: int) -> Population:
+        """
+        Return the population of `year`, in order of sex, age and number of
+        aces.
+
+        Raises a ValueError if the year is weighted.
+        """
+        counts = self.values[year]
+        if not np.issubdtype(counts.dtype, np.integer):
+            raise ValueError(
+                f"year {year} of the history is weighted: its counts estimate "
+                "the modelled population and cannot be turned into individuals"
+            )
+        return from_counts(counts)
+
+    def individuals(self, year: int) -> list[Individual]:
+        """
+        Return the individuals of `year`, in order of sex, age and number of
+        aces.
+        """
+        return to_individuals(self.population(year))
+
+    def sizes(self) -> Counts:
+        """
+        Return the size of the population of each year.
+        """
+        return self.result().sum(axis=(1, 2, 3))
+
+    def pyramids(self) -> Counts:
+        """
+        Return the number of males and of females of each age of each year,
+        with shape (number of years, 2, number of ages).
+        """
+        return self.result().sum(axis=3)
+
+    def males(self) -> Counts:
+        """
+        Return the number of males of each year.
+        """
+        return self.result()[:, MALE].sum(axis=(1, 2))
+
+    def mean_aces(self) -> npt.NDArray[np.float64]:
+        """
+        Return the mean number of aces of each year (NaN for an empty
+        population).
+        """
+        by_aces = self.result().sum(axis=(1, 2))
+        return _mean(by_aces, np.arange(by_aces.shape[1]))
+
+    def mean_age(self) -> npt.NDArray[np.float64]:
+        """
+        Return the mean age of each year (NaN for an empty population).
+        """
+        by_age = self.result().sum(axis=(1, 3))
+        return _mean(by_age, np.arange(by_age.shape[1]))
+
+    def proportion_traumatised(
+        self, trauma_threshold: int = 1
+    ) -> npt.NDArray[np.float64]:
+        """
+        Return the proportion of individuals with at least `trauma_threshold`
+        aces of each year (NaN for an empty population).
+        """
+        by_aces = self.result().sum(axis=(1, 2))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return by_aces[:, trauma_threshold:].sum(axis=1) / by_aces.sum(axis=1)
+
+    def save(self, path: str) -> None:
+        """
+        Write the history to the `.npz` file `path`.
+        """
+        np.savez_compressed(path, counts=self.result())
+
+    @classmethod
+    def load(cls, path: str) -> Self:
+        """
+        Read a history written by `save`.
+        """
+        history = cls()
+        with np.load(path) as data:
+            history.values = list(data["counts"])
+        return history
+
+
+def _mean(counts: Counts, values: npt.NDArray[np.int64]) -> npt.NDArray[np.float64]:
+    """
+    Return the mean of `values` for each row of `counts`, where each value
+    occurs `counts` times, NaN for rows without any.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (counts * values).sum(axis=1) / counts.sum(axis=1)
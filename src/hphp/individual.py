@@ -1,5 +1,10 @@
 from typing import NamedTuple
 
+SEXES = ("Male", "Female")
+MALE = SEXES.index("Male")
+FEMALE = SEXES.index("Female")
+MAXIMUM_NUMBER_OF_ACES = 8
+
 
 class Individual(NamedTuple):
     sex: str
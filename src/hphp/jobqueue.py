@@ -0,0 +1,419 @@
+"""
+A durable queue of sweep tasks shared by any number of workers.
+
+The queue is a SQLite database holding a row for every (configuration, rep)
+task. Workers claim tasks atomically and hold them for a lease that they
+renew while they run, so a task whose worker is killed becomes claimable
+again once its lease expires. Failed tasks are retried up to
+`max_attempts` times. The result of each completed task is stored with it
+and the worker completing the last rep of a configuration writes its
+results (see `hphp.output`).
+
+Workers can be started or killed at any time, from any process or machine
+that can open the database, without repeating or losing completed work.
+SQLite relies on file locks, which some network filesystems do not
+implement correctly: the database should be on a local disk or on a
+filesystem with working POSIX locks.
+"""
+
+import concurrent.futures
+import json
+import os
+import pickle
+import socket
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from typing import NamedTuple
+
+from . import output
+from .cost import expected_individual_years
+from .replication import Configuration, Replicate, run_replicate
+
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    configuration TEXT NOT NULL,
+    repetitions INTEGER NOT NULL,
+    seed TEXT NOT NULL,
+    pyramid_years TEXT NOT NULL,
+    rep INTEGER NOT NULL,
+    cost REAL NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    error TEXT,
+    result BLOB,
+    completed_at REAL,
+    UNIQUE (configuration, repetitions, seed, rep)
+);
+CREATE INDEX IF NOT EXISTS tasks_by_status ON tasks (status, cost);
+"""
+
+# The columns of a `Task`, in order.
+_TASK_COLUMNS = "id, configuration, rep, repetitions, seed, pyramid_years, attempts"
+
+
+class Task(NamedTuple):
+    """
+    A claimed task: the arguments of `hphp.replication.run_replicate` and the
+    number of times it has been claimed.
+    """
+
+    id: int
+    configuration: Configuration
+    rep: int
+    repetitions: int
+    seed: int | None
+    pyramid_years: tuple[int, ...]
+    attempts: int
+
+
+class JobQueue:
+    """
+    A queue of tasks stored in the SQLite database at `path` (created if it
+    does not exist).
+
+    Parameters
+    ----------
+    path : str
+        Path of the database.
+
+    lease_seconds : float
+        How long a claim lasts without being renewed.
+
+    max_attempts : int
+        Number of times a task is claimed before it is marked as failed.
+    """
+
+    def __init__(
+        self, path: str, lease_seconds: float = 600, max_attempts: int = 3
+    ) -> None:
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        connection = sqlite3.connect(self.path, timeout=60)
+        try:
+            connection.executescript(_SCHEMA)
+        finally:
+            connection.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Yield a connection holding the write lock of the database, committing
+        on success and rolling back on error.
+        """
+        connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+        finally:
+            connection.close()
+
+    def add(
+        self,
+        configurations: Iterable[Configuration],
+        repetitions: int,
+        seed: int | None = None,
+        pyramid_years: Iterable[int] = output.PYRAMID_YEARS,
+        cost: Callable[[Configuration], float] | None = expected_individual_years,
+    ) -> int:
+        """
+        Add a task for every rep of every configuration and return the number
+        of tasks added. Tasks already in the queue are left as they are.
+
+        Tasks are claimed in decreasing order of `cost` (see `hphp.cost`), so
+        the longest runs start first, and otherwise in the order they were
+        added. With a `cost` of None tasks are claimed in the order they were
+        added.
+        """
+        pyramid_years_json = json.dumps(list(pyramid_years))
+        rows = []
+        for configuration in configurations:
+            configuration_cost = 0.0 if cost is None else cost(configuration)
+            rows.extend(
+                (
+                    json.dumps(configuration._asdict()),
+                    repetitions,
+                    json.dumps(seed),
+                    pyramid_years_json,
+                    rep,
+                    configuration_cost,
+                )
+                for rep in range(repetitions)
+            )
+        with self._transaction() as connection:
+            before = connection.total_changes
+            connection.executemany(
+                "INSERT OR IGNORE INTO tasks "
+                "(configuration, repetitions, seed, pyramid_years, rep, cost) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            return connection.total_changes - before
+
+    def claim(self, worker: str) -> Task | None:
+        """
+        Claim a pending task, or a running task whose lease has expired, for
+        `worker`. Return None if no task can be claimed.
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE tasks SET status = ? "
+                "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                (FAILED, RUNNING, now, self.max_attempts),
+            )
+            row = connection.execute(
+                f"SELECT {_TASK_COLUMNS} FROM tasks "
+                "WHERE status = ? OR (status = ? AND lease_expires < ?) "
+                "ORDER BY cost DESC, id LIMIT 1",
+                (PENDING, RUNNING, now),
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE tasks SET status = ?, worker = ?, lease_expires = ?, "
+                "attempts = attempts + 1 WHERE id = ?",
+                (RUNNING, worker, now + self.lease_seconds, row[0]),
+            )
+        return _task(row)._replace(attempts=row[-1] + 1)
+
+    def renew(self, task: Task, worker: str) -> bool:
+        """
+        Extend the lease of a task claimed by `worker`. Return False if the
+        task is no longer held by `worker`.
+        """
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE tasks SET lease_expires = ? "
+                "WHERE id = ? AND status = ? AND worker = ?",
+                (time.time() + self.lease_seconds, task.id, RUNNING, worker),
+            )
+            return cursor.rowcount == 1
+
+    def complete(
+        self, task: Task, worker: str, replicate: Replicate
+    ) -> list[Replicate] | None:
+        """
+        Record the result of a task claimed by `worker`.
+
+        Return the replicates of the configuration of the task, in rep order,
+        if this completes it, an empty list if other reps of the configuration
+        are still to run and None if the task is no longer held by `worker` (so
+        the result is not recorded).
+        """
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE tasks SET status = ?, result = ?, completed_at = ?, "
+                "lease_expires = NULL WHERE id = ? AND status = ? AND worker = ?",
+                (DONE, pickle.dumps(replicate), time.time(), task.id, RUNNING, worker),
+            )
+            if cursor.rowcount == 0:
+                return None
+            results = connection.execute(
+                "SELECT result FROM tasks "
+                "WHERE configuration = ? AND repetitions = ? AND seed = ? "
+                "AND status = ? ORDER BY rep",
+                (
+                    json.dumps(task.configuration._asdict()),
+                    task.repetitions,
+                    json.dumps(task.seed),
+                    DONE,
+                ),
+            ).fetchall()
+        if len(results) < task.repetitions:
+            return []
+        return [pickle.loads(result) for (result,) in results]
+
+    def fail(self, task: Task, worker: str, error: str) -> None:
+        """
+        Record that a task claimed by `worker` failed. It is claimed again
+        unless it has been attempted `max_attempts` times.
+        """
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                "error = ?, lease_expires = NULL "
+                "WHERE id = ? AND status = ? AND worker = ?",
+                (self.max_attempts, FAILED, PENDING, error, task.id, RUNNING, worker),
+            )
+
+    def completed(self) -> Iterator[tuple[Task, list[Replicate]]]:
+        """
+        Yield a task of each configuration whose reps are all done, with its
+        replicates in rep order.
+        """
+        with self._transaction() as connection:
+            rows = connection.execute(
+                f"SELECT {_TASK_COLUMNS} FROM tasks WHERE id IN ("
+                "SELECT MIN(id) FROM tasks GROUP BY configuration, repetitions, seed "
+                "HAVING SUM(status = ?) = repetitions)",
+                (DONE,),
+            ).fetchall()
+        for row in rows:
+            task = _task(row)
+            with self._transaction() as connection:
+                results = connection.execute(
+                    "SELECT result FROM tasks WHERE configuration = ? "
+                    "AND repetitions = ? AND seed = ? ORDER BY rep",
+                    (row[1], task.repetitions, row[4]),
+                ).fetchall()
+            yield task, [pickle.loads(result) for (result,) in results]
+
+    def counts(self) -> dict[str, int]:
+        """
+        Return the number of tasks with each status.
+        """
+        with self._transaction() as connection:
+            rows = connection.execute(
+                "SELECT status, COUNT(*) FROM tasks GROUP BY status"
+            ).fetchall()
+        return {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0, **dict(rows)}
+
+
+def work(
+    path: str,
+    output_dir: str,
+    worker: str | None = None,
+    lease_seconds: float = 600,
+    max_attempts: int = 3,
+    columnar: bool = False,
+) -> int:
+    """
+    Claim and run tasks from the queue at `path` until none can be claimed,
+    writing the results of each completed configuration to `output_dir`, as
+    columns if `columnar` (see `hphp.output.write`).
+
+    The lease of the running task is renewed in the background. Before
+    returning, this also writes any completed configuration whose results are
+    missing (for example because the worker that completed it was killed
+    while writing). Returns the number of tasks this worker completed, not
+    counting those whose lease was taken over by another worker.
+    """
+    if worker is None:
+        worker = f"{socket.gethostname()}:{os.getpid()}"
+    queue = JobQueue(path, lease_seconds=lease_seconds, max_attempts=max_attempts)
+    completed = 0
+    while (task := queue.claim(worker)) is not None:
+        stop = threading.Event()
+        heartbeat = threading.Thread(
+            target=_renew_until,
+            args=(queue, task, worker, stop, lease_seconds / 3),
+            daemon=True,
+        )
+        heartbeat.start()
+        try:
+            replicate = run_replicate(
+                task.configuration,
+                task.rep,
+                seed=task.seed,
+                pyramid_years=task.pyramid_years,
+            )
+        except Exception as error:
+            queue.fail(task, worker, error=repr(error))
+            continue
+        finally:
+            stop.set()
+            heartbeat.join()
+        replicates = queue.complete(task, worker, replicate)
+        if replicates is None:
+            continue
+        completed += 1
+        if replicates:
+            _write(
+                output_dir=output_dir,
+                task=task,
+                replicates=replicates,
+                columnar=columnar,
+            )
+    for task, replicates in queue.completed():
+        path = os.path.join(
+            output_dir, output.directory_name(task.configuration, task.repetitions)
+        )
+        if not output.is_complete(path, columnar=columnar):
+            _write(
+                output_dir=output_dir,
+                task=task,
+                replicates=replicates,
+                columnar=columnar,
+            )
+    return completed
+
+
+def run_workers(
+    path: str,
+    output_dir: str,
+    processes: int | None = None,
+    lease_seconds: float = 600,
+    max_attempts: int = 3,
+    columnar: bool = False,
+) -> int:
+    """
+    Run `work` in `processes` worker processes (the number of CPUs if None)
+    and return the number of tasks they completed.
+    """
+    processes = processes or os.cpu_count() or 1
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [
+            executor.submit(
+                work,
+                path,
+                output_dir,
+                lease_seconds=lease_seconds,
+                max_attempts=max_attempts,
+                columnar=columnar,
+            )
+            for _ in range(processes)
+        ]
+        return sum(future.result() for future in futures)
+
+
+def _task(row: tuple) -> Task:
+    task_id, configuration, rep, repetitions, seed, pyramid_years, attempts = row
+    return Task(
+        id=task_id,
+        configuration=Configuration(**json.loads(configuration)),
+        rep=rep,
+        repetitions=repetitions,
+        seed=json.loads(seed),
+        pyramid_years=tuple(json.loads(pyramid_years)),
+        attempts=attempts,
+    )
+
+
+def _write(
+    output_dir: str, task: Task, replicates: list[Replicate], columnar: bool
+) -> None:
+    output.write(
+        path=os.path.join(
+            output_dir, output.directory_name(task.configuration, task.repetitions)
+        ),
+        configuration=task.configuration,
+        repetitions=task.repetitions,
+        seed=task.seed,
+        replicates=replicates,
+        columnar=columnar,
+    )
+
+
+def _renew_until(
+    queue: JobQueue,
+    task: Task,
+    worker: str,
+    stop: threading.Event,
+    interval: float,
+) -> None:
+    while not stop.wait(interval):
+        queue.renew(task, worker)
@@ -0,0 +1,411 @@
+"""
+Write the replicates of a configuration in the layout read by the figures.
+
+Each configuration has a directory (see `directory_name`) holding `main.csv`,
+with a row of summary statistics for each rep and year, marked with the year
+and reason if the rep stopped early and whether the year was carried forward
+from the year it stopped rather than simulated (see `hphp.stopping`),
+`pyramids.csv`, with the number of males and females of each age for each rep
+and recorded year, and `histograms.npz`, with the number of individuals with
+each number of aces for each rep and year, from which the metrics of any
+trauma threshold can be computed afterwards (see `hphp.histograms`).
+
+The same results can be written as columns instead (see `write_columns`): a
+`columns` directory holds a typed `.npy` array for each column of `main.csv`
+and `pyramids.csv` and `metadata.json` holds the input parameters once,
+rather than on every row. `read_columns` memory-maps the arrays, which is far
+cheaper than parsing the text of the csv files.
+"""
+
+import csv
+import json
+import os
+import shutil
+from collections.abc import Iterable
+from typing import Any, Literal, NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .histograms import Histograms
+from .rates import NUMBER_OF_AGES
+from .replication import Configuration, Replicate
+from .stopping import is_carried_forward
+
+# Years at which the pyramids are recorded.
+PYRAMID_YEARS = (0, 50, 100, 150, 200)
+
+MAIN = "main.csv"
+PYRAMIDS = "pyramids.csv"
+HISTOGRAMS = "histograms.npz"
+COLUMNS = "columns"
+METADATA = "metadata.json"
+
+SUMMARY_FIELDNAMES = (
+    "population_size",
+    "males",
+    "females",
+    "mean_age",
+    "mean_aces",
+    "prop_traumatised",
+    "mean_age_traumatised",
+    "mean_age_not_traumatised",
+)
+STOP_FIELDNAMES = ("stop_year", "stop_reason", "carried_forward")
+PYRAMID_FIELDNAMES = ("rep", "year", "age_group", "males", "females")
+# The columns of the pyramids written by `write_columns`: `pyramids` has a
+# (males, females) row of counts by age for each rep and recorded year.
+PYRAMID_COLUMNS = ("pyramid_rep", "pyramid_year", "pyramids")
+
+# The stop year and reason of the reps that did not stop early in the columns.
+NO_STOP_YEAR = -1
+NO_STOP_REASON = ""
+
+
+class Columns(NamedTuple):
+    """
+    The results of a configuration read by `read_columns`: the input
+    parameters and the arrays of the columns of `main.csv` (`main`) and of
+    the pyramids (`pyramids`, see `PYRAMID_COLUMNS`).
+    """
+
+    parameters: dict[str, Any]
+    main: dict[str, npt.NDArray]
+    pyramids: dict[str, npt.NDArray]
+
+    def table(self) -> dict[str, npt.NDArray]:
+        """
+        Return the columns of `main.csv`, with each input parameter as a
+        constant column that takes no memory (for example for
+        `pandas.DataFrame`).
+        """
+        number_of_rows = len(self.main["rep"])
+        return {
+            "rep": self.main["rep"],
+            "year": self.main["year"],
+            **{
+                name: np.broadcast_to(np.array(value), number_of_rows)
+                for name, value in self.parameters.items()
+            },
+            **{
+                name: self.main[name]
+                for name in (*SUMMARY_FIELDNAMES, *STOP_FIELDNAMES)
+            },
+        }
+
+    def pyramid_table(self) -> dict[str, npt.NDArray]:
+        """
+        Return the columns of `pyramids.csv`.
+        """
+        pyramids = self.pyramids["pyramids"]
+        number_of_ages = pyramids.shape[2]
+        return {
+            "rep": np.repeat(self.pyramids["pyramid_rep"], number_of_ages),
+            "year": np.repeat(self.pyramids["pyramid_year"], number_of_ages),
+            "age_group": np.tile(np.arange(number_of_ages), len(pyramids)),
+            "males": pyramids[:, 0].ravel(),
+            "females": pyramids[:, 1].ravel(),
+        }
+
+
+def directory_name(configuration: Configuration, repetitions: int) -> str:
+    """
+    Return the name of the directory of the results of a configuration.
+    """
+    name = (
+        f"alpha{float(configuration.alpha)}_"
+        f"male{float(configuration.probability_of_male_birth)}_"
+        f"heal{float(configuration.probability_of_heal)}_"
+        f"trauma{float(configuration.probability_of_trauma)}_"
+        f"thr{configuration.trauma_threshold}_"
+        f"reps{repetitions}"
+    )
+    if configuration.max_population is not None:
+        name += f"_max{configuration.max_population}"
+    if configuration.population_ceiling is not None:
+        name += f"_ceiling{configuration.population_ceiling}"
+    if configuration.stationarity_window is not None:
+        name += (
+            f"_stationarity{configuration.stationarity_window}"
+            f"x{float(configuration.stationarity_tolerance)}"
+        )
+    if configuration.common_random_numbers:
+        name += "_crn"
+    if configuration.antithetic:
+        name += "_antithetic"
+    return name
+
+
+def input_parameters(
+    configuration: Configuration, repetitions: int, seed: int | None
+) -> dict[str, float | int | None]:
+    """
+    Return the input parameters repeated on every row of `main.csv`.
+
+    `max_population` and the stopping rules are only included for
+    configurations that use them.
+    """
+    parameters = {
+        "repetitions": repetitions,
+        "years": configuration.years,
+        "initial_population_size": configuration.initial_population_size,
+        "alpha": configuration.alpha,
+        "probability_of_male_birth": configuration.probability_of_male_birth,
+        "probability_of_heal": configuration.probability_of_heal,
+        "probability_of_trauma": configuration.probability_of_trauma,
+        "trauma_threshold": configuration.trauma_threshold,
+        "base_seed": seed,
+    }
+    for name in ("max_population", "population_ceiling", "stationarity_window"):
+        if getattr(configuration, name) is not None:
+            parameters[name] = getattr(configuration, name)
+    if configuration.stationarity_window is not None:
+        parameters["stationarity_tolerance"] = configuration.stationarity_tolerance
+    if configuration.common_random_numbers:
+        parameters["common_random_numbers"] = True
+    if configuration.antithetic:
+        parameters["antithetic"] = True
+    return parameters
+
+
+def is_complete(path: str, columnar: bool = False) -> bool:
+    """
+    Return whether `path` holds the complete results of a configuration,
+    written by `write_columns` if `columnar` and by `write_csv` otherwise.
+    """
+    if columnar:
+        return os.path.exists(os.path.join(path, COLUMNS, METADATA))
+    return all(os.path.exists(os.path.join(path, name)) for name in (MAIN, PYRAMIDS))
+
+
+def write(
+    path: str,
+    configuration: Configuration,
+    repetitions: int,
+    seed: int | None,
+    replicates: Iterable[Replicate],
+    columnar: bool = False,
+) -> None:
+    """
+    Write the results of the replicates of a configuration with
+    `write_columns` if `columnar` and with `write_csv` otherwise.
+    """
+    writer = write_columns if columnar else write_csv
+    writer(
+        path=path,
+        configuration=configuration,
+        repetitions=repetitions,
+        seed=seed,
+        replicates=replicates,
+    )
+
+
+def write_csv(
+    path: str,
+    configuration: Configuration,
+    repetitions: int,
+    seed: int | None,
+    replicates: Iterable[Replicate],
+) -> None:
+    """
+    Write `main.csv`, `pyramids.csv` and `histograms.npz` of the replicates
+    of a configuration to the directory `path`.
+
+    Each file is written under a temporary name and then renamed, `main.csv`
+    last, so an interrupted write never leaves results that `is_complete`
+    accepts.
+    """
+    os.makedirs(path, exist_ok=True)
+    parameters = input_parameters(
+        configuration=configuration, repetitions=repetitions, seed=seed
+    )
+
+    replicates = list(replicates)
+    rows = []
+    pyramid_rows = []
+    for replicate in replicates:
+        rep, stop = replicate.rep, replicate.stop
+        marks = (
+            {} if stop is None else {"stop_year": stop.year, "stop_reason": stop.reason}
+        )
+        for year, summary in enumerate(replicate.summaries):
+            rows.append(
+                {
+                    "rep": rep,
+                    "year": year,
+                    **parameters,
+                    **summary,
+                    **marks,
+                    "carried_forward": is_carried_forward(stop, year),
+                }
+            )
+        for year, (male_counts, female_counts) in zip(
+            replicate.pyramid_years, replicate.pyramids
+        ):
+            for age_group in range(NUMBER_OF_AGES):
+                pyramid_rows.append(
+                    {
+                        "rep": rep,
+                        "year": year,
+                        "age_group": age_group,
+                        "males": round(float(male_counts[age_group])),
+                        "females": round(float(female_counts[age_group])),
+                    }
+                )
+
+    _write_histograms(path, replicates)
+    _write_rows(os.path.join(path, PYRAMIDS), PYRAMID_FIELDNAMES, pyramid_rows)
+    _write_rows(
+        os.path.join(path, MAIN),
+        ("rep", "year", *parameters, *SUMMARY_FIELDNAMES, *STOP_FIELDNAMES),
+        rows,
+    )
+
+
+def _write_rows(path: str, fieldnames: Iterable[str], rows: list[dict]) -> None:
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(fieldnames))
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(temporary_path, path)
+
+
+def write_columns(
+    path: str,
+    configuration: Configuration,
+    repetitions: int,
+    seed: int | None,
+    replicates: Iterable[Replicate],
+) -> None:
+    """
+    Write the results of `write_csv` as a `columns` directory of `.npy`
+    arrays, with the input parameters in its `metadata.json`, and
+    `histograms.npz` to the directory `path`.
+
+    The stop year and reason of the reps that did not stop early are
+    `NO_STOP_YEAR` and `NO_STOP_REASON`. `metadata.json` is written last so an
+    interrupted write never leaves results that `is_complete` accepts.
+    """
+    replicates = list(replicates)
+    parameters = input_parameters(
+        configuration=configuration, repetitions=repetitions, seed=seed
+    )
+    number_of_years = [len(replicate.summaries) for replicate in replicates]
+    stops = [
+        (NO_STOP_YEAR, NO_STOP_REASON)
+        if replicate.stop is None
+        else (replicate.stop.year, replicate.stop.reason)
+        for replicate in replicates
+    ]
+    main = {
+        "rep": np.repeat(
+            np.array([replicate.rep for replicate in replicates], dtype=np.int64),
+            number_of_years,
+        ),
+        "year": np.array(
+            [year for n in number_of_years for year in range(n)], dtype=np.int64
+        ),
+        **{
+            name: np.array(
+                [
+                    summary[name]
+                    for replicate in replicates
+                    for summary in replicate.summaries
+                ],
+                dtype=np.float64,
+            )
+            for name in SUMMARY_FIELDNAMES
+        },
+        "stop_year": np.repeat(
+            np.array([year for year, _ in stops], dtype=np.int64), number_of_years
+        ),
+        "stop_reason": np.repeat(
+            np.array([reason for _, reason in stops], dtype=str), number_of_years
+        ),
+        "carried_forward": np.array(
+            [
+                is_carried_forward(replicate.stop, year)
+                for replicate in replicates
+                for year in range(len(replicate.summaries))
+            ],
+            dtype=bool,
+        ),
+    }
+    pyramids = {
+        "pyramid_rep": np.repeat(
+            np.array([replicate.rep for replicate in replicates], dtype=np.int64),
+            [len(replicate.pyramid_years) for replicate in replicates],
+        ),
+        "pyramid_year": np.array(
+            [year for replicate in replicates for year in replicate.pyramid_years],
+            dtype=np.int64,
+        ),
+        # The empty first array keeps the shape when there are no replicates.
+        "pyramids": np.concatenate(
+            [
+                np.zeros((0, 2, NUMBER_OF_AGES)),
+                *(
+                    np.reshape(
+                        replicate.pyramids,
+                        (len(replicate.pyramid_years), 2, NUMBER_OF_AGES),
+                    )
+                    for replicate in replicates
+                ),
+            ]
+        )
+        .round()
+        .astype(np.int64),
+    }
+
+    columns_path = os.path.join(path, COLUMNS)
+    if os.path.exists(columns_path):
+        shutil.rmtree(columns_path)
+    os.makedirs(columns_path)
+    for name, values in {**main, **pyramids}.items():
+        np.save(os.path.join(columns_path, f"{name}.npy"), values)
+    _write_histograms(path, replicates)
+    metadata_path = os.path.join(columns_path, METADATA)
+    with open(f"{metadata_path}.tmp", "w") as f:
+        json.dump(
+            {"parameters": parameters, "main": list(main), "pyramids": list(pyramids)},
+            f,
+            indent=2,
+        )
+    os.replace(f"{metadata_path}.tmp", metadata_path)
+
+
+def read_columns(
+    path: str, mmap_mode: Literal["r+", "r", "w+", "c"] | None = "r"
+) -> Columns:
+    """
+    Read the results written by `write_columns` to the directory `path`.
+
+    The arrays are memory-mapped with `mmap_mode` (see `numpy.load`), so only
+    the parts that are used are read, or read into memory if None.
+    """
+    columns_path = os.path.join(path, COLUMNS)
+    with open(os.path.join(columns_path, METADATA)) as f:
+        metadata = json.load(f)
+
+    def load(names: Iterable[str]) -> dict[str, npt.NDArray]:
+        return {
+            name: np.load(
+                os.path.join(columns_path, f"{name}.npy"), mmap_mode=mmap_mode
+            )
+            for name in names
+        }
+
+    return Columns(
+        parameters=metadata["parameters"],
+        main=load(metadata["main"]),
+        pyramids=load(metadata["pyramids"]),
+    )
+
+
+def _write_histograms(path: str, replicates: list[Replicate]) -> None:
+    histograms_path = os.path.join(path, HISTOGRAMS)
+    os.makedirs(path, exist_ok=True)
+    with open(f"{histograms_path}.tmp", "wb") as f:
+        Histograms.from_replicates(replicates).save(f)
+    os.replace(f"{histograms_path}.tmp", histograms_path)
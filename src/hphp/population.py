@@ -0,0 +1,134 @@
+from collections.abc import Iterable
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .individual import MAXIMUM_NUMBER_OF_ACES, SEXES, Individual
+from .rates import NUMBER_OF_AGES
+
+COUNTS_SHAPE = (len(SEXES), NUMBER_OF_AGES, MAXIMUM_NUMBER_OF_ACES + 1)
+
+# The (sex, age, number of aces) counts of a population: integers, or floats
+# for a weighted population (see `as_counts`).
+Counts = npt.NDArray[np.int64] | npt.NDArray[np.float64]
+
+
+class Population(NamedTuple):
+    """
+    A population stored as parallel arrays (struct of arrays).
+
+    The i-th individual has sex `SEXES[sex[i]]`, age `age[i]` and
+    `number_of_aces[i]` adverse childhood experiences.
+
+    Each individual stands for `weight` individuals of the modelled
+    population: this is 1 unless the population has been reduced with `thin`.
+    """
+
+    sex: npt.NDArray[np.int8]
+    age: npt.NDArray[np.int64]
+    number_of_aces: npt.NDArray[np.int64]
+    weight: float = 1.0
+
+
+def from_individuals(individuals: Iterable[Individual]) -> Population:
+    """
+    Create a `Population` from individuals.
+    """
+    individuals = list(individuals)
+    return Population(
+        sex=np.array(
+            [SEXES.index(individual.sex) for individual in individuals], dtype=np.int8
+        ),
+        age=np.array([individual.age for individual in individuals], dtype=np.int64),
+        number_of_aces=np.array(
+            [individual.number_of_aces for individual in individuals], dtype=np.int64
+        ),
+    )
+
+
+def to_individuals(population: Population) -> list[Individual]:
+    """
+    Create the individuals of a `Population`.
+    """
+    return [
+        Individual(sex=SEXES[sex], age=int(age), number_of_aces=int(number_of_aces))
+        for sex, age, number_of_aces in zip(
+            population.sex, population.age, population.number_of_aces
+        )
+    ]
+
+
+def to_counts(population: Population) -> npt.NDArray[np.int64]:
+    """
+    Return the number of individuals of a `Population` in each cell of a
+    (sex, age, number of aces) array of shape `COUNTS_SHAPE`.
+
+    These are the individuals actually held, whatever their weight (see
+    `as_counts`).
+    """
+    cells = np.ravel_multi_index(
+        (population.sex, population.age, population.number_of_aces), COUNTS_SHAPE
+    )
+    return np.bincount(cells, minlength=np.prod(COUNTS_SHAPE)).reshape(COUNTS_SHAPE)
+
+
+def from_counts(counts: npt.NDArray[np.int64]) -> Population:
+    """
+    Create a `Population` with the given number of individuals in each
+    (sex, age, number of aces) cell.
+    """
+    counts = np.asarray(counts)
+    sex, age, number_of_aces = np.indices(counts.shape)
+    repeats = counts.ravel()
+    return Population(
+        sex=np.repeat(sex.ravel(), repeats).astype(np.int8),
+        age=np.repeat(age.ravel(), repeats).astype(np.int64),
+        number_of_aces=np.repeat(number_of_aces.ravel(), repeats).astype(np.int64),
+    )
+
+
+def as_counts(population: Counts | Population | Iterable[Individual]) -> Counts:
+    """
+    Return the (sex, age, number of aces) counts of a population held by any
+    of the engines: a count array, a `Population` or individuals.
+
+    The counts of a weighted `Population` are multiplied by its weight so they
+    estimate the counts of the modelled population.
+    """
+    if isinstance(population, Population):
+        counts = to_counts(population)
+        if population.weight != 1:
+            return counts.astype(np.float64) * population.weight
+        return counts
+    if isinstance(population, np.ndarray):
+        if np.issubdtype(population.dtype, np.integer):
+            return np.asarray(population, dtype=np.int64)
+        return np.asarray(population, dtype=np.float64)
+    return to_counts(from_individuals(population))
+
+
+def thin(
+    population: Population, max_population: int, rng: np.random.Generator
+) -> Population:
+    """
+    Reduce a population to at most `max_population` individuals.
+
+    If the population of `size` individuals is larger, `max_population`
+    individuals are kept at random (without replacement, in their original
+    order) and the weight is multiplied by `size / max_population`. Every
+    kept individual then stands for the new weight of individuals of the
+    full population (`size / max_population` of them when the population was
+    not thinned before), so weighted counts (see `as_counts`) are unbiased
+    estimates of the counts of the full population.
+    """
+    size = len(population.age)
+    if size <= max_population:
+        return population
+    kept = np.sort(rng.choice(size, size=max_population, replace=False))
+    return Population(
+        sex=population.sex[kept],
+        age=population.age[kept],
+        number_of_aces=population.number_of_aces[kept],
+        weight=population.weight * size / max_population,
+    )
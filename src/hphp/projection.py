@@ -0,0 +1,178 @@
+import numpy as np
+import numpy.typing as npt
+import scipy.sparse
+import scipy.sparse.linalg
+
+from .cohort import HEAL, NO_CHANGE, TRAUMA, ace_move_probabilities
+from .individual import FEMALE, MALE, Individual
+from .population import COUNTS_SHAPE, Population, from_individuals, to_counts
+from .rates import (
+    INTERGENERATIONAL_ACE_DISTRIBUTION,
+    PROBABILITY_OF_DEATH,
+    fertility_surface,
+)
+
+NUMBER_OF_CELLS = int(np.prod(COUNTS_SHAPE))
+
+
+def projection_matrix(
+    probability_of_male_birth: float,
+    alpha: float = 1.1,
+    tempo_years_per_ace: int = 3,
+    probability_of_heal: float = 0,
+    probability_of_trauma: float = 0,
+) -> scipy.sparse.csr_array:
+    """
+    Return the multi-state Leslie matrix of the agent-based model.
+
+    Entry (i, j) is the expected number of individuals in cell i of the
+    flattened (sex, age, number of aces) count array next year per
+    individual in cell j this year. It combines survival (`death`), ageing,
+    healing and trauma (`adjust_aces`) and births (`birth` with the tempo
+    shift and the alpha multiplier) whose sex and number of aces follow
+    `probability_of_male_birth` and `sample_intergenerational_number_of_aces`.
+
+    Multiplying a flattened count array by this matrix gives the expected
+    count array a year later.
+    """
+    cells = np.arange(NUMBER_OF_CELLS).reshape(COUNTS_SHAPE)
+
+    # ---- Survival, ageing, healing and trauma ----
+    survival = 1 - PROBABILITY_OF_DEATH[:, :, None]
+    moves = survival[..., None] * ace_move_probabilities(
+        probability_of_heal=probability_of_heal,
+        probability_of_trauma=probability_of_trauma,
+    )
+    rows = [
+        cells[:, 1:, :].ravel(),
+        cells[:, 1:, 1:].ravel(),
+        cells[:, 1:, :-1].ravel(),
+    ]
+    columns = [
+        cells[:, :-1, :].ravel(),
+        cells[:, :-1, :-1].ravel(),
+        cells[:, :-1, 1:].ravel(),
+    ]
+    values = [
+        moves[:, :-1, :, NO_CHANGE].ravel(),
+        moves[:, :-1, :-1, TRAUMA].ravel(),
+        moves[:, :-1, 1:, HEAL].ravel(),
+    ]
+
+    # ---- Births ----
+    fertility = fertility_surface(alpha=alpha, tempo_years_per_ace=tempo_years_per_ace)
+    for sex, probability_of_sex in (
+        (MALE, probability_of_male_birth),
+        (FEMALE, 1 - probability_of_male_birth),
+    ):
+        # (mother age, mother aces, child aces)
+        births = (
+            probability_of_sex
+            * fertility[:, :, None]
+            * INTERGENERATIONAL_ACE_DISTRIBUTION[None, :, :]
+        )
+        rows.append(np.broadcast_to(cells[sex, 0, None, None, :], births.shape).ravel())
+        columns.append(np.broadcast_to(cells[FEMALE, :, :, None], births.shape).ravel())
+        values.append(births.ravel())
+
+    values_array = np.concatenate(values)
+    nonzero = values_array > 0
+    return scipy.sparse.csr_array(
+        (
+            values_array[nonzero],
+            (np.concatenate(rows)[nonzero], np.concatenate(columns)[nonzero]),
+        ),
+        shape=(NUMBER_OF_CELLS, NUMBER_OF_CELLS),
+    )
+
+
+def project(
+    number_of_years: int,
+    initial_population: npt.NDArray[np.float64] | Population | list[Individual],
+    probability_of_male_birth: float,
+    alpha: float = 1.1,
+    tempo_years_per_ace: int = 3,
+    probability_of_heal: float = 0,
+    probability_of_trauma: float = 0,
+) -> list[npt.NDArray[np.float64]]:
+    """
+    Project the expected number of individuals in each (sex, age, number of
+    aces) cell forward in time.
+
+    This is the expected value of `hphp.cohort.simulate` (and so of
+    `hphp.simulation.simulate`) for the same parameters, obtained by
+    repeatedly applying `projection_matrix`.
+
+    Returns
+    -------
+    populations : list of arrays
+        The expected counts at each year, with shape
+        `hphp.population.COUNTS_SHAPE`.
+    """
+    if isinstance(initial_population, list):
+        initial_population = from_individuals(initial_population)
+    if isinstance(initial_population, Population):
+        counts = to_counts(initial_population).astype(float)
+    else:
+        counts = np.asarray(initial_population, dtype=float)
+    matrix = projection_matrix(
+        probability_of_male_birth=probability_of_male_birth,
+        alpha=alpha,
+        tempo_years_per_ace=tempo_years_per_ace,
+        probability_of_heal=probability_of_heal,
+        probability_of_trauma=probability_of_trauma,
+    )
+    state = counts.ravel()
+    populations = [state.reshape(COUNTS_SHAPE)]
+    for _ in range(number_of_years):
+        state = matrix @ state
+        populations.append(state.reshape(COUNTS_SHAPE))
+    return populations
+
+
+def dominant_eigenpair(
+    probability_of_male_birth: float,
+    alpha: float = 1.1,
+    tempo_years_per_ace: int = 3,
+    probability_of_heal: float = 0,
+    probability_of_trauma: float = 0,
+) -> tuple[float, npt.NDArray[np.float64]]:
+    """
+    Return the asymptotic growth rate and stable structure of the model.
+
+    These are the dominant eigenvalue of `projection_matrix` (the factor by
+    which the expected population grows each year in the long run) and the
+    corresponding eigenvector, normalised to sum to 1 and reshaped to
+    `hphp.population.COUNTS_SHAPE`.
+    """
+    matrix = projection_matrix(
+        probability_of_male_birth=probability_of_male_birth,
+        alpha=alpha,
+        tempo_years_per_ace=tempo_years_per_ace,
+        probability_of_heal=probability_of_heal,
+        probability_of_trauma=probability_of_trauma,
+    )
+    eigenvalues, eigenvectors = scipy.sparse.linalg.eigs(matrix, k=1, which="LR")
+    vector = np.abs(eigenvectors[:, 0].real)
+    return float(eigenvalues[0].real), (vector / vector.sum()).reshape(COUNTS_SHAPE)
+
+
+def stable_ace_distribution(
+    probability_of_male_birth: float,
+    alpha: float = 1.1,
+    tempo_years_per_ace: int = 3,
+    probability_of_heal: float = 0,
+    probability_of_trauma: float = 0,
+) -> npt.NDArray[np.float64]:
+    """
+    Return the long run proportion of the population with 0, 1, ..., 8 aces
+    from the stable structure of `dominant_eigenpair`.
+    """
+    _, structure = dominant_eigenpair(
+        probability_of_male_birth=probability_of_male_birth,
+        alpha=alpha,
+        tempo_years_per_ace=tempo_years_per_ace,
+        probability_of_heal=probability_of_heal,
+        probability_of_trauma=probability_of_trauma,
+    )
+    return structure.sum(axis=(0, 1))
@@ -0,0 +1,558 @@
+"""
+Demographic rates of the model.
+
+The UN mortality and fertility schedules and the ACE distributions are read
+once into NumPy arrays indexed by sex, age and number of aces so that every
+engine and analysis script shares a single source of rates. Scalar lookups
+(`death_probability`, `birth_probability`) serve the individual based code
+in `hphp.birth_death` and array lookups (`probability_of_death`,
+`probability_of_birth`) the array and count based engines.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import numpy.typing as npt
+
+from .individual import FEMALE, MALE, MAXIMUM_NUMBER_OF_ACES, SEXES
+
+# Probability of death at a given age, indexed by age, from the UN's Life
+# Tables (based on 1985). Anyone older than the last entry dies.
+PROBABILITY_OF_DEATH_AT_GIVEN_AGE: dict[str, tuple[float, ...]] = {
+    "Male": (
+        0.07446,
+        0.01592,
+        0.00925,
+        0.00641,
+        0.00485,
+        0.00377,
+        0.00299,
+        0.00241,
+        0.00199,
+        0.00172,
+        0.00157,
+        0.00150,
+        0.00150,
+        0.00153,
+        0.00161,
+        0.00173,
+        0.00189,
+        0.00209,
+        0.00230,
+        0.00248,
+        0.00265,
+        0.00279,
+        0.00290,
+        0.00303,
+        0.00311,
+        0.00312,
+        0.00310,
+        0.00309,
+        0.00313,
+        0.00317,
+        0.00326,
+        0.00334,
+        0.00345,
+        0.00356,
+        0.00368,
+        0.00385,
+        0.00400,
+        0.00407,
+        0.00433,
+        0.00455,
+        0.00488,
+        0.00516,
+        0.00550,
+        0.00596,
+        0.00634,
+        0.00686,
+        0.00736,
+        0.00785,
+        0.00848,
+        0.00909,
+        0.00992,
+        0.01064,
+        0.01154,
+        0.01240,
+        0.01327,
+        0.01428,
+        0.01534,
+        0.01660,
+        0.01805,
+        0.01963,
+        0.02168,
+        0.02369,
+        0.02580,
+        0.02821,
+        0.03048,
+        0.03334,
+        0.03566,
+        0.03874,
+        0.04193,
+        0.04536,
+        0.04968,
+        0.05367,
+        0.05856,
+        0.06368,
+        0.06924,
+        0.07541,
+        0.08165,
+        0.08858,
+        0.09608,
+        0.10417,
+        0.11372,
+        0.12342,
+        0.13357,
+        0.14442,
+        0.15646,
+        0.16863,
+        0.17992,
+        0.19350,
+        0.20749,
+        0.22131,
+        0.23581,
+        0.25014,
+        0.26705,
+        0.28080,
+        0.29747,
+        0.31033,
+        0.32555,
+        0.34112,
+        0.35664,
+        0.37224,
+        1.0000,
+    ),
+    "Female": (
+        0.07033,
+        0.01503,
+        0.00883,
+        0.00630,
+        0.00494,
+        0.00393,
+        0.00312,
+        0.00246,
+        0.00194,
+        0.00159,
+        0.00141,
+        0.00132,
+        0.00130,
+        0.00131,
+        0.00137,
+        0.00145,
+        0.00155,
+        0.00166,
+        0.00177,
+        0.00183,
+        0.00188,
+        0.00192,
+        0.00197,
+        0.00205,
+        0.00211,
+        0.00214,
+        0.00216,
+        0.00217,
+        0.00222,
+        0.00226,
+        0.00231,
+        0.00236,
+        0.00242,
+        0.00247,
+        0.00254,
+        0.00264,
+        0.00280,
+        0.00288,
+        0.00306,
+        0.00326,
+        0.00346,
+        0.00360,
+        0.00376,
+        0.00393,
+        0.00409,
+        0.00433,
+        0.00459,
+        0.00488,
+        0.00530,
+        0.00571,
+        0.00622,
+        0.00670,
+        0.00720,
+        0.00766,
+        0.00811,
+        0.00865,
+        0.00927,
+        0.01002,
+        0.01096,
+        0.01199,
+        0.01329,
+        0.01457,
+        0.01605,
+        0.01767,
+        0.01921,
+        0.02124,
+        0.02314,
+        0.02537,
+        0.02758,
+        0.02976,
+        0.03265,
+        0.03525,
+        0.03877,
+        0.04252,
+        0.04665,
+        0.05145,
+        0.05614,
+        0.06161,
+        0.06740,
+        0.07378,
+        0.08176,
+        0.08972,
+        0.09839,
+        0.10751,
+        0.11900,
+        0.13060,
+        0.14029,
+        0.15284,
+        0.16478,
+        0.17836,
+        0.19303,
+        0.20629,
+        0.22322,
+        0.23829,
+        0.25346,
+        0.27026,
+        0.28709,
+        0.30468,
+        0.32225,
+        0.33985,
+        1.0000,
+    ),
+}
+
+# Overall probability of a birth at a given age from the UN's fertility data.
+PROBABILITY_OF_A_BIRTH_AT_GIVEN_AGE: dict[int, float] = {
+    15: 0.013355,
+    16: 0.025160000000000002,
+    17: 0.040733,
+    18: 0.058070000000000004,
+    19: 0.07627800000000001,
+    20: 0.096371,
+    21: 0.110794,
+    22: 0.12112600000000001,
+    23: 0.12814699999999998,
+    24: 0.13259,
+    25: 0.134492,
+    26: 0.133936,
+    27: 0.131562,
+    28: 0.127503,
+    29: 0.121737,
+    30: 0.113844,
+    31: 0.105234,
+    32: 0.096591,
+    33: 0.087627,
+    34: 0.078933,
+    35: 0.07048399999999999,
+    36: 0.061793999999999995,
+    37: 0.053277,
+    38: 0.044770000000000004,
+    39: 0.036818,
+    40: 0.029645,
+    41: 0.023043,
+    42: 0.017268000000000002,
+    43: 0.012609,
+    44: 0.009054,
+    45: 0.006445,
+    46: 0.0046559999999999995,
+    47: 0.003414,
+    48: 0.0025670000000000003,
+    49: 0.0017,
+}
+
+# Percentage of individuals with a given number of ACEs, by group, from the
+# Canadian Longitudinal Study on Aging (see `sample_number_of_aces`).
+ACE_PERCENTAGES: dict[int, dict[str, float]] = {
+    0: {"Total": 38.4, "Male": 40.6, "Female": 36.3},
+    1: {"Total": 26.0, "Male": 26.8, "Female": 25.2},
+    2: {"Total": 15.5, "Male": 15.3, "Female": 15.7},
+    3: {"Total": 9.4, "Male": 9.2, "Female": 9.6},
+    4: {"Total": 5.6, "Male": 4.6, "Female": 6.6},
+    5: {"Total": 3.0, "Male": 2.2, "Female": 3.9},
+    6: {"Total": 1.5, "Male": 1.1, "Female": 1.9},
+    7: {"Total": 0.5, "Male": 0.2, "Female": 0.8},
+    8: {"Total": 0.1, "Male": 0.1, "Female": 0.2},
+}
+
+# Probability of a child having 0, 1, ..., 8 ACEs for each class of maternal
+# ACEs (0, 1, 2-3 and 4+, see `maternal_ace_class`). The grouped child classes
+# of the source table (2-3 and 4+) are split evenly between their members.
+INTERGENERATIONAL_ACE_PROBABILITIES: tuple[tuple[float, ...], ...] = (
+    (
+        0.426,
+        0.258,
+        0.258 / 2,
+        0.258 / 2,
+        0.058 / 5,
+        0.058 / 5,
+        0.058 / 5,
+        0.058 / 5,
+        0.058 / 5,
+    ),
+    (
+        0.378,
+        0.297,
+        0.215 / 2,
+        0.215 / 2,
+        0.11 / 5,
+        0.11 / 5,
+        0.11 / 5,
+        0.11 / 5,
+        0.11 / 5,
+    ),
+    (
+        0.304,
+        0.284,
+        0.213 / 2,
+        0.213 / 2,
+        0.199 / 5,
+        0.199 / 5,
+        0.199 / 5,
+        0.199 / 5,
+        0.199 / 5,
+    ),
+    (
+        0.251,
+        0.232,
+        0.238 / 2,
+        0.238 / 2,
+        0.279 / 5,
+        0.279 / 5,
+        0.279 / 5,
+        0.279 / 5,
+        0.279 / 5,
+    ),
+)
+
+# Age groups (inclusive bounds) of the UK population from the Office of
+# National Statistics, with the proportion of the population in each group and
+# the proportion of each group that is male (see
+# `hphp.simulation.uk_population_pyramid`).
+UK_AGE_GROUPS: tuple[tuple[int, int], ...] = (
+    (0, 4),
+    (5, 9),
+    (10, 14),
+    (15, 19),
+    (20, 24),
+    (25, 29),
+    (30, 34),
+    (35, 39),
+    (40, 44),
+    (45, 49),
+    (50, 54),
+    (55, 59),
+    (60, 64),
+    (65, 69),
+    (70, 74),
+    (75, 79),
+    (80, 84),
+    (85, 89),
+    (90, 94),
+    (95, 99),
+    (100, 100),
+)
+UK_AGE_GROUP_PROBABILITIES: tuple[float, ...] = (
+    0.0513237924129001,
+    0.058884838521506,
+    0.0619580723863934,
+    0.0581970881968707,
+    0.057191298005245,
+    0.0645622406293206,
+    0.067976013212672,
+    0.0661025261737008,
+    0.0645271046276757,
+    0.0591204711779157,
+    0.0659205275903903,
+    0.0678406510281835,
+    0.0618128189745511,
+    0.052067346975442,
+    0.046912910297153,
+    0.042289292978169,
+    0.0265148374094072,
+    0.0166564873142573,
+    0.00758816578718646,
+    0.00220091619043483,
+    0.000352600110625258,
+)
+UK_PROBABILITY_OF_MALE_BY_AGE_GROUP: tuple[float, ...] = (
+    0.513176005009623,
+    0.512991799271436,
+    0.512329630786584,
+    0.512666396758669,
+    0.51361696250989,
+    0.513646750154748,
+    0.506477500050494,
+    0.496241825649744,
+    0.494564798361146,
+    0.495115030573354,
+    0.491374605424786,
+    0.48998347880055,
+    0.488664442959425,
+    0.484560127591707,
+    0.47659713065616,
+    0.466910754637479,
+    0.442840041647411,
+    0.412134823892074,
+    0.363299078984743,
+    0.3002958083752,
+    0.216002344665885,
+)
+
+# Everyone dies at the last age of the life tables so no one is ever older.
+NUMBER_OF_AGES = len(PROBABILITY_OF_DEATH_AT_GIVEN_AGE["Male"])
+
+# Probability of death indexed by (sex, age).
+PROBABILITY_OF_DEATH: npt.NDArray[np.float64] = np.array(
+    [PROBABILITY_OF_DEATH_AT_GIVEN_AGE[sex] for sex in SEXES]
+)
+PROBABILITY_OF_DEATH.flags.writeable = False
+
+# Probability of a birth indexed by age.
+PROBABILITY_OF_A_BIRTH: npt.NDArray[np.float64] = np.zeros(NUMBER_OF_AGES)
+for _age, _probability in PROBABILITY_OF_A_BIRTH_AT_GIVEN_AGE.items():
+    PROBABILITY_OF_A_BIRTH[_age] = _probability
+PROBABILITY_OF_A_BIRTH.flags.writeable = False
+
+
+def maternal_ace_class(number_of_maternal_aces: int) -> int:
+    """
+    Return the row of `INTERGENERATIONAL_ACE_PROBABILITIES` for a mother with
+    the given number of aces: 0, 1, 2-3 or 4+.
+    """
+    if number_of_maternal_aces in (2, 3):
+        return 2
+    if number_of_maternal_aces >= 4:
+        return 3
+    return number_of_maternal_aces
+
+
+# Distribution of the number of aces of a child (columns) indexed by the
+# number of maternal aces (rows).
+INTERGENERATIONAL_ACE_DISTRIBUTION: npt.NDArray[np.float64] = np.array(
+    [
+        np.array(INTERGENERATIONAL_ACE_PROBABILITIES[maternal_ace_class(aces)])
+        / sum(INTERGENERATIONAL_ACE_PROBABILITIES[maternal_ace_class(aces)])
+        for aces in range(MAXIMUM_NUMBER_OF_ACES + 1)
+    ]
+)
+INTERGENERATIONAL_ACE_DISTRIBUTION.flags.writeable = False
+
+
+# Distribution of the number of aces indexed by (sex, number of aces).
+ACE_DISTRIBUTION: npt.NDArray[np.float64] = np.array(
+    [
+        [ACE_PERCENTAGES[aces][sex] for aces in range(MAXIMUM_NUMBER_OF_ACES + 1)]
+        for sex in SEXES
+    ]
+)
+ACE_DISTRIBUTION /= ACE_DISTRIBUTION.sum(axis=1, keepdims=True)
+ACE_DISTRIBUTION.flags.writeable = False
+
+
+# Distribution of the UK population indexed by (sex, age): ages are uniform
+# within their age group.
+UK_POPULATION_DISTRIBUTION: npt.NDArray[np.float64] = np.zeros(
+    (len(SEXES), NUMBER_OF_AGES)
+)
+for (_lower, _upper), _probability, _male in zip(
+    UK_AGE_GROUPS, UK_AGE_GROUP_PROBABILITIES, UK_PROBABILITY_OF_MALE_BY_AGE_GROUP
+):
+    _width = _upper - _lower + 1
+    UK_POPULATION_DISTRIBUTION[MALE, _lower : _upper + 1] = (
+        _probability * _male / _width
+    )
+    UK_POPULATION_DISTRIBUTION[FEMALE, _lower : _upper + 1] = (
+        _probability * (1 - _male) / _width
+    )
+UK_POPULATION_DISTRIBUTION /= UK_POPULATION_DISTRIBUTION.sum()
+UK_POPULATION_DISTRIBUTION.flags.writeable = False
+
+
+def death_probability(age: int, sex: str) -> float:
+    """
+    Return the probability that an individual of a given age and sex dies
+    within the year. Any sex other than male uses the female table.
+    """
+    if sex != SEXES[MALE]:
+        sex = SEXES[FEMALE]
+    try:
+        return PROBABILITY_OF_DEATH_AT_GIVEN_AGE[sex][age]
+    except IndexError:
+        return 1.0
+
+
+def birth_probability(
+    age: int, number_of_aces: int = 0, alpha: float = 1.0, tempo_years_per_ace: int = 3
+) -> float:
+    """
+    Return the probability that a female of a given age and number of aces
+    gives birth within the year (see `hphp.birth_death.birth`).
+    """
+    # ---- Tempo effect (earlier reproduction) ----
+    probability = PROBABILITY_OF_A_BIRTH_AT_GIVEN_AGE.get(
+        age - tempo_years_per_ace * number_of_aces, 0.0
+    )
+    # ---- Quantum effect (replicator-style multiplier) ----
+    # Minimal two-type interpretation: traumatised if ACE >= 1
+    if number_of_aces >= 1:
+        probability = min(1.0, alpha * probability)
+    return probability
+
+
+@lru_cache(maxsize=128)
+def fertility_surface(
+    alpha: float = 1.0, tempo_years_per_ace: int = 3
+) -> npt.NDArray[np.float64]:
+    """
+    Return the probability of a birth indexed by (age, number of aces) with
+    the fertility schedule shifted by `tempo_years_per_ace` years per ace and
+    scaled by `alpha` for those with at least one ace.
+
+    Surfaces are computed once per (alpha, tempo_years_per_ace) and are read
+    only.
+    """
+    age, number_of_aces = np.indices((NUMBER_OF_AGES, MAXIMUM_NUMBER_OF_ACES + 1))
+    adjusted_age = age - tempo_years_per_ace * number_of_aces
+    in_schedule = (adjusted_age >= 0) & (adjusted_age < NUMBER_OF_AGES)
+    surface = np.zeros(age.shape)
+    surface[in_schedule] = PROBABILITY_OF_A_BIRTH[adjusted_age[in_schedule]]
+    exposed = number_of_aces >= 1
+    surface[exposed] = np.minimum(1.0, alpha * surface[exposed])
+    surface.flags.writeable = False
+    return surface
+
+
+def probability_of_death(
+    age: npt.NDArray[np.int64], sex: npt.NDArray[np.int8]
+) -> npt.NDArray[np.float64]:
+    """
+    Return the probability of death of individuals of given ages and sexes
+    (indices of `SEXES`).
+    """
+    probability = np.ones(np.shape(age))
+    in_table = age < NUMBER_OF_AGES
+    probability[in_table] = PROBABILITY_OF_DEATH[sex[in_table], age[in_table]]
+    return probability
+
+
+def probability_of_birth(
+    age: npt.NDArray[np.int64],
+    number_of_aces: npt.NDArray[np.int64],
+    alpha: float = 1.0,
+    tempo_years_per_ace: int = 3,
+) -> npt.NDArray[np.float64]:
+    """
+    Return the probability of a birth for individuals of given ages and
+    numbers of aces, looked up in `fertility_surface`.
+    """
+    surface = fertility_surface(alpha=alpha, tempo_years_per_ace=tempo_years_per_ace)
+    probability = np.zeros(np.shape(age))
+    in_table = age < NUMBER_OF_AGES
+    probability[in_table] = surface[age[in_table], number_of_aces[in_table]]
+    return probability
@@ -0,0 +1,210 @@
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from .individual import MALE, Individual
+from .population import Counts, Population, as_counts
+from .rates import NUMBER_OF_AGES
+
+_AGES = np.arange(NUMBER_OF_AGES)
+
+# The edges of a single age band holding every age (see `AceHistogram`).
+ALL_AGES = (0, NUMBER_OF_AGES)
+
+
+class Reducer(ABC):
+    """
+    Summarise a population each year of a run.
+
+    Reducers are updated with the (sex, age, number of aces) counts of the
+    population (see `hphp.population.to_counts`) which every engine can
+    produce from its own state without building individuals, so a summary
+    only costs a pass over the counts and the history of the run is never
+    kept.
+
+    Subclasses implement `reduce` which returns the summary of one year.
+
+    The counts of a weighted population (see `hphp.population.thin`) are
+    floats, so sizes are rounded to the nearest individual.
+    """
+
+    def __init__(self) -> None:
+        self.values: list[Any] = []
+
+    @abstractmethod
+    def reduce(self, counts: Counts) -> Any:
+        """
+        Return the summary of the population with `counts`.
+        """
+
+    def update(self, counts: Counts) -> None:
+        self.values.append(self.reduce(counts))
+
+    def result(self) -> Any:
+        """
+        Return the summaries of every year so far.
+        """
+        return np.array(self.values)
+
+
+class PopulationSize(Reducer):
+    """The number of individuals."""
+
+    def reduce(self, counts: Counts) -> int:
+        return round(float(counts.sum()))
+
+
+class SexCounts(Reducer):
+    """The number of males and of females."""
+
+    def reduce(self, counts: Counts) -> tuple[int, int]:
+        males, females = counts.sum(axis=(1, 2))
+        return round(float(males)), round(float(females))
+
+
+class MeanAge(Reducer):
+    """The mean age (NaN for an empty population)."""
+
+    def reduce(self, counts: Counts) -> float:
+        return _mean(counts.sum(axis=(0, 2)), _AGES)
+
+
+class MeanAces(Reducer):
+    """The mean number of aces (NaN for an empty population)."""
+
+    def reduce(self, counts: Counts) -> float:
+        by_aces = counts.sum(axis=(0, 1))
+        return _mean(by_aces, np.arange(len(by_aces)))
+
+
+class ProportionTraumatised(Reducer):
+    """
+    The proportion of individuals with at least `trauma_threshold` aces (NaN
+    for an empty population).
+    """
+
+    def __init__(self, trauma_threshold: int = 1) -> None:
+        super().__init__()
+        self.trauma_threshold = trauma_threshold
+
+    def reduce(self, counts: Counts) -> float:
+        size = counts.sum()
+        if size == 0:
+            return np.nan
+        return float(counts[:, :, self.trauma_threshold :].sum() / size)
+
+
+class Pyramid(Reducer):
+    """
+    The number of males and of females of each single year of age, for the
+    years of the run in `years` (every year if None).
+
+    `result` has shape (number of recorded years, 2, number of ages) with the
+    recorded years in `recorded_years`.
+    """
+
+    def __init__(self, years: Iterable[int] | None = None) -> None:
+        super().__init__()
+        self.years = None if years is None else set(years)
+        self.year = 0
+        self.recorded_years: list[int] = []
+
+    def reduce(self, counts: Counts) -> Counts:
+        return counts.sum(axis=2)
+
+    def update(self, counts: Counts) -> None:
+        if self.years is None or self.year in self.years:
+            self.recorded_years.append(self.year)
+            super().update(counts)
+        self.year += 1
+
+
+class AceHistogram(Reducer):
+    """
+    The number of individuals with each number of aces in each age band.
+
+    `age_bands` are the edges of the bands: band `i` holds the ages from
+    `age_bands[i]` up to but excluding `age_bands[i + 1]`. The default single
+    band (`ALL_AGES`) is the whole population.
+
+    `result` has shape (number of years, number of bands, number of aces).
+    """
+
+    def __init__(self, age_bands: Iterable[int] = ALL_AGES) -> None:
+        super().__init__()
+        self.age_bands = tuple(age_bands)
+
+    def reduce(self, counts: Counts) -> Counts:
+        by_age_and_aces = counts.sum(axis=0)
+        cumulative = np.concatenate(
+            (np.zeros_like(by_age_and_aces[:1]), by_age_and_aces.cumsum(axis=0))
+        )
+        edges = np.array(self.age_bands)
+        return cumulative[edges[1:]] - cumulative[edges[:-1]]
+
+
+class Summary(Reducer):
+    """
+    The summary statistics of a population used for the figures: size,
+    number of males and females, mean age, mean number of aces, proportion
+    traumatised and the mean age of the traumatised and not traumatised
+    (NaN when the group is empty).
+
+    `result` is a list with a dictionary for each year.
+    """
+
+    def __init__(self, trauma_threshold: int = 1) -> None:
+        super().__init__()
+        self.trauma_threshold = trauma_threshold
+
+    def reduce(self, counts: Counts) -> dict[str, float]:
+        size = round(float(counts.sum()))
+        males = round(float(counts[MALE].sum()))
+        by_age_and_aces = counts.sum(axis=0)
+        traumatised = by_age_and_aces[:, self.trauma_threshold :].sum(axis=1)
+        not_traumatised = by_age_and_aces[:, : self.trauma_threshold].sum(axis=1)
+        by_aces = by_age_and_aces.sum(axis=0)
+        return {
+            "population_size": size,
+            "males": males,
+            "females": size - males,
+            "mean_age": _mean(by_age_and_aces.sum(axis=1), _AGES),
+            "mean_aces": _mean(by_aces, np.arange(len(by_aces))),
+            "prop_traumatised": (
+                float(traumatised.sum() / counts.sum()) if size > 0 else np.nan
+            ),
+            "mean_age_traumatised": _mean(traumatised, _AGES),
+            "mean_age_not_traumatised": _mean(not_traumatised, _AGES),
+        }
+
+    def result(self) -> list[dict[str, float]]:
+        return list(self.values)
+
+
+def _mean(counts: Counts, values: npt.NDArray[np.int64]) -> float:
+    """
+    Return the mean of `values` where each value occurs `counts` times, NaN if
+    there are none.
+    """
+    total = counts.sum()
+    if total == 0:
+        return np.nan
+    return float((counts * values).sum() / total)
+
+
+def observe(
+    populations: Iterable[npt.NDArray[np.int64] | Population | list[Individual]],
+    reducers: Iterable[Reducer],
+) -> None:
+    """
+    Update every reducer with each population of `populations`, typically
+    the `stream` of one of the engines, as the run goes.
+    """
+    reducers = list(reducers)
+    for population in populations:
+        counts = as_counts(population)
+        for reducer in reducers:
+            reducer.update(counts)
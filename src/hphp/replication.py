@@ -0,0 +1,298 @@
+"""
+Run the replicates of a configuration of the model, optionally in parallel.
+
+Each replicate draws from its own streams of `hphp.streams` so the results
+only depend on the base seed, the configuration and the rep: running the
+replicates one after another or spread over a pool of processes gives
+exactly the same output.
+"""
+
+import concurrent.futures
+import functools
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+from . import reducers, simulation, stopping, streams, vectorised
+from .population import Population
+from .rates import ACE_DISTRIBUTION, UK_POPULATION_DISTRIBUTION
+
+
+class Configuration(NamedTuple):
+    """
+    The parameters of a run of `hphp.vectorised.simulate` summarised with
+    `hphp.reducers.Summary`.
+
+    With a `max_population` the run is in bounded-size mode: it thins the
+    population to at most `max_population` weighted individuals, and the
+    summaries are weighted estimates for the full population.
+
+    With `common_random_numbers` the run draws from the common random numbers
+    of its rep (see `hphp.streams.common_generators`), which are shared by
+    every configuration: the difference between configurations is then estimated
+    with a much lower variance from the same number of reps.
+
+    With `antithetic` the reps come in pairs (reps 0 and 1, 2 and 3, ...):
+    the second rep of a pair draws 1 - u wherever the first draws a uniform
+    u, both for its initial population (see
+    `hphp.simulation.get_population_from_uniforms`) and for its dynamics (see
+    `hphp.streams.Antithetic`). The mean of a pair then has a lower variance
+    than that of two independent reps for outcomes that are monotone in the
+    uniforms, such as the mean number of aces (see
+    `hphp.sequential.paired_estimate`).
+
+    A run stops early once its population is extinct (the rest of the run
+    is then empty), once its population exceeds `population_ceiling` or, if
+    `stationarity_window` is set, once its summaries are stationary over
+    that many years (see `hphp.stopping`). The last year is carried forward
+    after extinction or stationarity and the run is cut short after passing
+    the ceiling.
+    """
+
+    years: int = 100
+    initial_population_size: int = 1000
+    alpha: float = 1.1
+    probability_of_male_birth: float = 0.51
+    probability_of_heal: float = 0.01
+    probability_of_trauma: float = 0.01
+    trauma_threshold: int = 1
+    max_population: int | None = None
+    population_ceiling: int | None = None
+    stationarity_window: int | None = None
+    stationarity_tolerance: float = 1e-3
+    common_random_numbers: bool = False
+    antithetic: bool = False
+
+
+class Replicate(NamedTuple):
+    """
+    The output of one replicate: a summary for each year (see
+    `hphp.reducers.Summary`), the pyramids of the recorded years (see
+    `hphp.reducers.Pyramid`), if the run stopped early its
+    `hphp.stopping.Stop` and the number of individuals with each number of
+    aces in each of the bands `age_bands` for each year (see
+    `hphp.reducers.AceHistogram`).
+    """
+
+    rep: int
+    summaries: list[dict[str, float]]
+    pyramid_years: list[int]
+    pyramids: npt.NDArray[np.int64]
+    stop: stopping.Stop | None = None
+    ace_histograms: npt.NDArray[np.int64] | None = None
+    age_bands: tuple[int, ...] = reducers.ALL_AGES
+
+
+def stream_configuration(configuration: Configuration) -> tuple[Any, ...]:
+    """
+    Return the values of a configuration that its random streams are keyed
+    by (see `hphp.streams.generators`).
+
+    The trauma threshold and the stopping rules only affect the summaries
+    so they are left out: configurations that only differ by them simulate
+    the same populations. `max_population` is only included when it is set so that
+    the streams of unbounded configurations are unchanged.
+    """
+    values = (
+        configuration.years,
+        configuration.initial_population_size,
+        configuration.alpha,
+        configuration.probability_of_male_birth,
+        configuration.probability_of_heal,
+        configuration.probability_of_trauma,
+    )
+    if configuration.max_population is not None:
+        values += (configuration.max_population,)
+    return values
+
+
+def run_replicate(
+    configuration: Configuration,
+    rep: int,
+    seed: int | None = None,
+    pyramid_years: Iterable[int] = (),
+    age_bands: Iterable[int] = reducers.ALL_AGES,
+) -> Replicate:
+    """
+    Run replicate `rep` of a configuration.
+
+    The initial population is created at once with
+    `hphp.simulation.get_population_array` and simulated with
+    `hphp.vectorised.stream`. The histograms of the number of aces are kept
+    for each band of ages between consecutive `age_bands`.
+    """
+    population_rng, dynamics_rng = random_streams(configuration, rep=rep, seed=seed)
+    initial_population = _initial_population(configuration, rep, population_rng)
+    summary = reducers.Summary(trauma_threshold=configuration.trauma_threshold)
+    pyramid = reducers.Pyramid(years=pyramid_years)
+    ace_histogram = reducers.AceHistogram(age_bands=age_bands)
+    stop = stopping.observe(
+        vectorised.stream(
+            number_of_years=configuration.years,
+            initial_population=initial_population,
+            probability_of_male_birth=configuration.probability_of_male_birth,
+            alpha=configuration.alpha,
+            probability_of_heal=configuration.probability_of_heal,
+            probability_of_trauma=configuration.probability_of_trauma,
+            seed=dynamics_rng,
+            max_population=configuration.max_population,
+        ),
+        [summary, pyramid, ace_histogram],
+        rules=stopping_rules(configuration),
+    )
+    if stop is not None and stop.reason in stopping.CARRY_FORWARD:
+        stopping.carry_forward(
+            [summary, pyramid, ace_histogram],
+            stop,
+            number_of_years=configuration.years - stop.year,
+        )
+    return Replicate(
+        rep=rep,
+        summaries=summary.result(),
+        pyramid_years=pyramid.recorded_years,
+        pyramids=pyramid.result(),
+        stop=stop,
+        ace_histograms=ace_histogram.result(),
+        age_bands=ace_histogram.age_bands,
+    )
+
+
+def random_streams(
+    configuration: Configuration, rep: int, seed: int | None = None
+) -> tuple[np.random.Generator, np.random.Generator | streams.CommonRandomNumbers]:
+    """
+    Return the generator of the initial population of replicate `rep` of a
+    configuration and the random numbers of its dynamics (see
+    `hphp.streams`).
+    """
+    if configuration.antithetic:
+        population_rng, dynamics_rng = streams.process_generators(
+            seed=seed,
+            configuration=(
+                streams.COMMON
+                if configuration.common_random_numbers
+                else stream_configuration(configuration)
+            ),
+            rep=rep // 2,
+        )
+        return population_rng, dynamics_rng._replace(antithetic=rep % 2 == 1)
+    if configuration.common_random_numbers:
+        return streams.common_generators(seed=seed, rep=rep)
+    population_rng, dynamics_rng = streams.generators(
+        seed=seed, configuration=stream_configuration(configuration), rep=rep
+    )
+    return population_rng, dynamics_rng
+
+
+def initial_population(
+    configuration: Configuration, rep: int, seed: int | None = None
+) -> Population:
+    """
+    Return the initial population of replicate `rep` of a configuration, as
+    `run_replicate` creates it.
+
+    With a seed of None this is a new random population rather than that of
+    any particular run.
+    """
+    population_rng, _ = random_streams(configuration, rep=rep, seed=seed)
+    return _initial_population(configuration, rep, population_rng)
+
+
+def expected_initial_population(
+    configuration: Configuration,
+) -> npt.NDArray[np.float64]:
+    """
+    Return the expected (sex, age, number of aces) counts of the initial
+    population of a configuration.
+    """
+    return (
+        configuration.initial_population_size
+        * UK_POPULATION_DISTRIBUTION[:, :, None]
+        * ACE_DISTRIBUTION[:, None, :]
+    )
+
+
+def stopping_rules(configuration: Configuration) -> list[stopping.StoppingRule]:
+    """
+    Return the stopping rules of a configuration (see `Configuration`).
+    """
+    rules: list[stopping.StoppingRule] = [stopping.Extinction()]
+    if configuration.population_ceiling is not None:
+        rules.append(stopping.Ceiling(configuration.population_ceiling))
+    if configuration.stationarity_window is not None:
+        rules.append(
+            stopping.Stationarity(
+                window=configuration.stationarity_window,
+                tolerance=configuration.stationarity_tolerance,
+                trauma_threshold=configuration.trauma_threshold,
+            )
+        )
+    return rules
+
+
+def replicate(
+    configuration: Configuration,
+    repetitions: int,
+    seed: int | None = None,
+    pyramid_years: Iterable[int] = (),
+    processes: int | None = None,
+    age_bands: Iterable[int] = reducers.ALL_AGES,
+) -> list[Replicate]:
+    """
+    Run `repetitions` replicates of a configuration.
+
+    Parameters
+    ----------
+    configuration : Configuration
+        The parameters of the runs.
+
+    repetitions : int
+        Number of replicates.
+
+    seed : int or None
+        Base seed of the random streams of the replicates.
+
+    pyramid_years : iterable of int
+        Years at which to record the population pyramid.
+
+    processes : int or None
+        Number of worker processes (the number of CPUs if None). With 1 the
+        replicates run one after another in this process.
+
+    age_bands : iterable of int
+        Edges of the age bands of the histograms of the number of aces (see
+        `hphp.reducers.AceHistogram`).
+
+    Returns
+    -------
+    replicates : list of Replicate
+        The replicates in rep order. For a given seed these do not depend on
+        the number of processes.
+    """
+    run = functools.partial(
+        run_replicate,
+        configuration,
+        seed=seed,
+        pyramid_years=tuple(pyramid_years),
+        age_bands=tuple(age_bands),
+    )
+    if processes == 1:
+        return [run(rep=rep) for rep in range(repetitions)]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(run, range(repetitions)))
+
+
+def _initial_population(
+    configuration: Configuration, rep: int, population_rng: np.random.Generator
+) -> Population:
+    if configuration.antithetic:
+        uniforms = population_rng.random((3, configuration.initial_population_size))
+        return simulation.get_population_from_uniforms(
+            1 - uniforms if rep % 2 else uniforms
+        )
+    return simulation.get_population_array(
+        number_of_individuals=configuration.initial_population_size,
+        seed=population_rng,
+    )
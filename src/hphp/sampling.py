@@ -0,0 +1,125 @@
+"""
+Categorical samplers with precomputed tables.
+
+`np.random.choice` normalises its probabilities and builds a cumulative
+distribution on every call. The samplers here build Walker alias tables once
+per distribution so that each draw costs O(1) whatever the number of
+categories, and draw any number of values in a single call.
+"""
+
+import numpy as np
+import numpy.typing as npt
+
+from .rates import (
+    ACE_DISTRIBUTION,
+    INTERGENERATIONAL_ACE_DISTRIBUTION,
+    UK_POPULATION_DISTRIBUTION,
+)
+
+
+class CategoricalSampler:
+    """
+    Sample from one or more categorical distributions over 0, 1, ..., k - 1.
+
+    `probabilities` has shape (k,) for a single distribution or (rows, k)
+    for a distribution per row (for example one per sex). Rows are normalised
+    so need not sum to 1.
+
+    The alias table of each row is built once (Vose's method): a draw picks
+    a column uniformly and keeps it with probability `acceptance[row,
+    column]`, otherwise returns `alias[row, column]`. `quantile` instead
+    inverts the cumulative distribution, which is monotone in the uniform.
+    """
+
+    def __init__(self, probabilities: npt.ArrayLike) -> None:
+        probabilities = np.asarray(probabilities, dtype=float)
+        self.single = probabilities.ndim == 1
+        probabilities = np.atleast_2d(probabilities)
+        probabilities = probabilities / probabilities.sum(axis=1, keepdims=True)
+        self.probabilities = probabilities
+        self.cdf = np.cumsum(probabilities, axis=1)
+        self.number_of_rows, self.number_of_categories = probabilities.shape
+        self.acceptance = np.ones(probabilities.shape)
+        self.alias = np.tile(
+            np.arange(self.number_of_categories), (self.number_of_rows, 1)
+        )
+        for row, row_probabilities in enumerate(probabilities):
+            self._build_row(row, row_probabilities)
+
+    def _build_row(self, row: int, probabilities: npt.NDArray[np.float64]) -> None:
+        scaled = list(probabilities * self.number_of_categories)
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.acceptance[row, less] = scaled[less]
+            self.alias[row, less] = more
+            scaled[more] += scaled[less] - 1
+            if scaled[more] < 1:
+                small.append(more)
+            else:
+                large.append(more)
+        # Anything left over has probability 1 up to rounding error.
+        for i in small + large:
+            self.acceptance[row, i] = 1
+
+    def sample(
+        self,
+        rng: np.random.Generator,
+        rows: npt.ArrayLike | None = None,
+        size: int | tuple[int, ...] | None = None,
+    ) -> npt.NDArray[np.int64]:
+        """
+        Draw a category for each entry of `rows` (the distribution to use),
+        or `size` categories from a single distribution.
+        """
+        rows = self._rows(rows=rows, size=size)
+        uniforms = rng.random(rows.shape) * self.number_of_categories
+        columns = uniforms.astype(np.int64)
+        # Guard against rounding up to the number of categories.
+        columns = np.minimum(columns, self.number_of_categories - 1)
+        accept = uniforms - columns < self.acceptance[rows, columns]
+        return np.where(accept, columns, self.alias[rows, columns])
+
+    def quantile(
+        self, uniforms: npt.ArrayLike, rows: npt.ArrayLike | None = None
+    ) -> npt.NDArray[np.int64]:
+        """
+        Return the category whose cumulative probability first exceeds each
+        of `uniforms` (the inverse of the cumulative distribution).
+
+        Larger uniforms give larger categories so, unlike `sample`, this
+        preserves the ordering of the uniforms it is given.
+        """
+        uniforms = np.asarray(uniforms)
+        rows = self._rows(rows=rows, size=uniforms.shape)
+        categories = (uniforms[..., None] >= self.cdf[rows]).sum(axis=-1)
+        return np.minimum(categories, self.number_of_categories - 1)
+
+    def _rows(
+        self, rows: npt.ArrayLike | None, size: int | tuple[int, ...] | None
+    ) -> npt.NDArray[np.int64]:
+        if rows is not None:
+            return np.asarray(rows)
+        if not self.single:
+            raise ValueError("rows is required with more than one distribution")
+        return np.zeros(size if size is not None else (), dtype=np.int64)
+
+
+# Number of aces indexed by sex (see `hphp.birth_death.sample_number_of_aces`).
+ACE_SAMPLER = CategoricalSampler(ACE_DISTRIBUTION)
+
+# Number of aces of a child indexed by the number of maternal aces (see
+# `hphp.birth_death.sample_intergenerational_number_of_aces`).
+INTERGENERATIONAL_ACE_SAMPLER = CategoricalSampler(INTERGENERATIONAL_ACE_DISTRIBUTION)
+
+# Cell of the flattened (sex, age) UK population distribution (see
+# `hphp.simulation.uk_population_pyramid`): draws combine the age group, the
+# age within the group and the sex.
+UK_POPULATION_SAMPLER = CategoricalSampler(UK_POPULATION_DISTRIBUTION.ravel())
+
+# Sex of the UK population and age given the sex, for inverting the
+# distribution of each separately (see
+# `hphp.simulation.get_population_from_uniforms`).
+UK_SEX_SAMPLER = CategoricalSampler(UK_POPULATION_DISTRIBUTION.sum(axis=1))
+UK_AGE_SAMPLER = CategoricalSampler(UK_POPULATION_DISTRIBUTION)
@@ -0,0 +1,201 @@
+"""
+Run replicates of a configuration until an estimate is precise enough.
+
+Configurations far from the threshold of the model settle after a few reps
+while those near it need many more. Rather than running the same number of
+reps for every configuration, `replicate_until` adds reps in batches until
+the confidence interval of the mean of an outcome of the reps (for example
+the mean number of aces after a warm-up) is narrow enough, as set by a
+`Precision`.
+
+Rep `r` of a configuration is the same whichever batch it runs in (see
+`hphp.replication`), so the replicates are always the first reps of a fixed
+run and the number of reps only depends on the outcomes.
+
+The reps of an antithetic configuration are not independent: `estimate`
+treats them as if they were and `paired_estimate` uses the means of the
+pairs, which are.
+"""
+
+import concurrent.futures
+import functools
+from collections.abc import Iterable
+from typing import NamedTuple
+
+import numpy as np
+import scipy.stats
+
+from .replication import Configuration, Replicate, run_replicate
+
+
+class Estimate(NamedTuple):
+    """
+    The mean of the outcomes of some reps with the half-width of its
+    confidence interval, from `samples` independent samples.
+    """
+
+    mean: float
+    half_width: float
+    samples: int
+
+
+class Precision(NamedTuple):
+    """
+    The target precision of the estimate of `metric` (a key of
+    `hphp.reducers.Summary`).
+
+    The outcome of a rep is the mean of `metric` over the years from
+    `warm_up` on. Reps are added `batch_size` at a time, from
+    `min_repetitions` up to at most `max_repetitions`, until the half-width
+    of the `confidence` interval of the mean outcome is at most `tolerance`.
+    With `paired` the interval is that of `paired_estimate`, for antithetic
+    configurations, and reps are added in whole pairs: the number of reps is
+    rounded up to an even number, which can exceed an odd `max_repetitions`
+    by one.
+    """
+
+    metric: str = "mean_aces"
+    warm_up: int = 0
+    tolerance: float = 0.01
+    min_repetitions: int = 5
+    max_repetitions: int = 50
+    batch_size: int = 5
+    confidence: float = 0.95
+    paired: bool = False
+
+    def outcomes(self, replicates: Iterable[Replicate]) -> np.ndarray:
+        """
+        Return the outcome of each replicate.
+        """
+        return np.array(
+            [
+                np.nanmean(
+                    [
+                        summary[self.metric]
+                        for summary in replicate.summaries[self.warm_up :]
+                    ]
+                )
+                for replicate in replicates
+            ]
+        )
+
+    def half_width(self, replicates: Iterable[Replicate]) -> float:
+        """
+        Return the half-width of the confidence interval of the mean outcome
+        of the replicates (infinite with fewer than two samples).
+        """
+        outcomes = self.outcomes(replicates)
+        if self.paired:
+            return paired_estimate(outcomes, confidence=self.confidence).half_width
+        return half_width(outcomes, confidence=self.confidence)
+
+    def additional_repetitions(self, replicates: list[Replicate]) -> int:
+        """
+        Return the number of reps to add to `replicates`, 0 once the target
+        is met.
+        """
+        repetitions = len(replicates)
+        if repetitions < self.min_repetitions:
+            additional = self.min_repetitions - repetitions
+        elif (
+            repetitions >= self.max_repetitions
+            or self.half_width(replicates) <= self.tolerance
+        ):
+            return 0
+        else:
+            additional = min(self.batch_size, self.max_repetitions - repetitions)
+        if self.paired:
+            additional += (repetitions + additional) % 2
+        return additional
+
+
+def half_width(values: np.ndarray, confidence: float = 0.95) -> float:
+    """
+    Return the half-width of the Student t confidence interval of the mean of
+    `values`, ignoring NaNs (infinite with fewer than two values).
+    """
+    values = values[~np.isnan(values)]
+    if len(values) < 2:
+        return np.inf
+    quantile = scipy.stats.t.ppf((1 + confidence) / 2, df=len(values) - 1)
+    return float(quantile * values.std(ddof=1) / np.sqrt(len(values)))
+
+
+def estimate(values: np.ndarray, confidence: float = 0.95) -> Estimate:
+    """
+    Return the mean of `values` with its confidence interval, treating the
+    values as independent and ignoring NaNs.
+    """
+    values = values[~np.isnan(values)]
+    return Estimate(
+        mean=float(np.mean(values)) if len(values) else np.nan,
+        half_width=half_width(values, confidence=confidence),
+        samples=len(values),
+    )
+
+
+def paired_estimate(values: np.ndarray, confidence: float = 0.95) -> Estimate:
+    """
+    Return the mean of the outcomes of antithetic pairs of reps with its
+    confidence interval.
+
+    `values` are in rep order, so that values `2 k` and `2 k + 1` are the
+    outcomes of a pair. The mean of each complete pair is one independent
+    sample: pairs with a NaN outcome and an unpaired last value are left out.
+    """
+    number_of_pairs = len(values) // 2
+    pair_means = values[: 2 * number_of_pairs].reshape(number_of_pairs, 2).mean(axis=1)
+    return estimate(pair_means, confidence=confidence)
+
+
+def replicate_until(
+    configuration: Configuration,
+    precision: Precision,
+    seed: int | None = None,
+    pyramid_years: Iterable[int] = (),
+    processes: int | None = None,
+) -> list[Replicate]:
+    """
+    Run replicates of a configuration until `precision` is met.
+
+    Parameters
+    ----------
+    configuration : Configuration
+        The parameters of the runs.
+
+    precision : Precision
+        The target precision and the bounds on the number of reps.
+
+    seed : int or None
+        Base seed of the random streams of the replicates.
+
+    pyramid_years : iterable of int
+        Years at which to record the population pyramid.
+
+    processes : int or None
+        Number of worker processes (the number of CPUs if None). With 1 the
+        replicates run one after another in this process.
+
+    Returns
+    -------
+    replicates : list of Replicate
+        The replicates in rep order. For a given seed these do not depend on
+        the number of processes.
+    """
+    run = functools.partial(
+        run_replicate,
+        configuration,
+        seed=seed,
+        pyramid_years=tuple(pyramid_years),
+    )
+    replicates: list[Replicate] = []
+    if processes == 1:
+        while repetitions := precision.additional_repetitions(replicates):
+            reps = range(len(replicates), len(replicates) + repetitions)
+            replicates.extend(run(rep=rep) for rep in reps)
+        return replicates
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+        while repetitions := precision.additional_repetitions(replicates):
+            reps = range(len(replicates), len(replicates) + repetitions)
+            replicates.extend(executor.map(run, reps))
+    return replicates
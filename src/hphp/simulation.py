@@ -1,7 +1,8 @@
-from collections.abc import Callable
-from typing import Any
+from collections.abc import Callable, Iterator
+from typing import Any, Literal, overload
 
 import numpy as np
+import numpy.typing as npt
 
 from .birth_death import (
     adjust_aces,
@@ -9,8 +10,22 @@ from .birth_death import (
     death,
     sample_intergenerational_number_of_aces,
     sample_number_of_aces,
+    sample_number_of_aces_array,
 )
 from .individual import Individual
+from .population import Population, to_counts
+from .rates import (
+    NUMBER_OF_AGES,
+    UK_AGE_GROUP_PROBABILITIES,
+    UK_AGE_GROUPS,
+    UK_PROBABILITY_OF_MALE_BY_AGE_GROUP,
+)
+from .sampling import (
+    ACE_SAMPLER,
+    UK_AGE_SAMPLER,
+    UK_POPULATION_SAMPLER,
+    UK_SEX_SAMPLER,
+)
 
 
 def simulate(
@@ -19,7 +34,7 @@ def simulate(
     probability_of_male_birth: float,
     alpha: float = 1.1,
     tempo_years_per_ace: int = 3,
-    seed: int | None = None,
+    seed: int | np.random.Generator | None = None,
     probability_of_heal: float = 0,
     probability_of_trauma: float = 0,
 ) -> list[list[Individual]]:
@@ -62,8 +77,10 @@ def simulate(
         (tempo effect), motivated by empirical associations between ACE
         exposure and earlier age at first birth.
 
-    seed : int or None
-        Random seed for reproducibility.
+    seed : int, Generator or None
+        Random seed for reproducibility. An int (or None) seeds the global
+        `np.random` state; a Generator (see `hphp.streams`) is used instead of
+        the global state so that independent runs can share a process.
 
     probability_of_heal : float
         Annual probability that an adult reduces their ACE count by one.
@@ -74,15 +91,49 @@ def simulate(
     Returns
     -------
     populations : list of lists
-        A history of the population at each year.
+        A history of the population at each year. Use `stream` to consume
+        the years one at a time instead.
     """
-    np.random.seed(seed)
-    populations: list[list[Individual]] = [initial_population]
-    for _ in range(number_of_years):
+    return list(
+        stream(
+            number_of_years=number_of_years,
+            initial_population=initial_population,
+            probability_of_male_birth=probability_of_male_birth,
+            alpha=alpha,
+            tempo_years_per_ace=tempo_years_per_ace,
+            seed=seed,
+            probability_of_heal=probability_of_heal,
+            probability_of_trauma=probability_of_trauma,
+        )
+    )
+
+
+def stream(
+    number_of_years: int,
+    initial_population: list[Individual],
+    probability_of_male_birth: float,
+    alpha: float = 1.1,
+    tempo_years_per_ace: int = 3,
+    seed: int | np.random.Generator | None = None,
+    probability_of_heal: float = 0,
+    probability_of_trauma: float = 0,
+) -> Iterator[list[Individual]]:
+    """
+    Yield the population at each year of `simulate`, starting with the
+    initial population.
 
+    Only the current year is kept in memory so a caller that reduces each
+    year as it is yielded never holds the full history. For a given seed this
+    yields exactly the populations returned by `simulate`.
+    """
+    rng = _generator(seed)
+    random = np.random.random if rng is None else rng.random
+    previous_population = initial_population
+    yield previous_population
+    for _ in range(number_of_years):
         population: list[Individual] = []
 
-        for individual in populations[-1]:
+        for individual in previous_population:
             if (
                 individual.sex == "Female"
                 and birth(
@@ -90,27 +141,25 @@ def simulate(
                     number_of_aces=individual.number_of_aces,
                     alpha=alpha,
                     tempo_years_per_ace=tempo_years_per_ace,
+                    rng=rng,
                 )
                 is True
             ):
-                sex = (
-                    "Male"
-                    if np.random.random() < probability_of_male_birth
-                    else "Female"
-                )
+                sex = "Male" if random() < probability_of_male_birth else "Female"
                 number_of_aces = sample_intergenerational_number_of_aces(
-                    number_of_maternal_aces=individual.number_of_aces
+                    number_of_maternal_aces=individual.number_of_aces, rng=rng
                 )
                 population.append(
                     Individual(sex=sex, number_of_aces=number_of_aces, age=0)
                 )
 
-            if death(age=individual.age, sex=individual.sex) is False:
+            if death(age=individual.age, sex=individual.sex, rng=rng) is False:
                 new_age = individual.age + 1
                 aces_delta = adjust_aces(
                     individual,
                     probability_of_heal=probability_of_heal,
                     probability_of_trauma=probability_of_trauma,
+                    rng=rng,
                 )
                 new_number_of_aces = individual.number_of_aces + aces_delta
                 sex = individual.sex
@@ -118,21 +167,26 @@ def simulate(
                     Individual(age=new_age, sex=sex, number_of_aces=new_number_of_aces)
                 )
 
-        populations.append(population)
-
-    return populations
+        yield population
+        previous_population = population
 
 
 def get_population(
     number_of_individuals: int,
     population_pyramid: Callable[..., tuple[int, str]],
-    seed: int | None = None,
+    seed: int | np.random.Generator | None = None,
     **population_pyramid_kwargs: Any,
 ) -> list[Individual]:
     """
     Create a population by sampling from `population_pyramid`.
+
+    As for `simulate`, an int (or None) `seed` seeds the global `np.random`
+    state and a Generator is used instead of it, in which case it is also
+    passed to `population_pyramid` as `rng`.
     """
-    np.random.seed(seed)
+    rng = _generator(seed)
+    if rng is not None:
+        population_pyramid_kwargs["rng"] = rng
     individuals: list[Individual] = []
     for _ in range(number_of_individuals):
         age, sex = population_pyramid(**population_pyramid_kwargs)
@@ -140,13 +194,13 @@ def get_population(
             Individual(
                 age=age,
                 sex=sex,
-                number_of_aces=sample_number_of_aces(sex=sex),
+                number_of_aces=sample_number_of_aces(sex=sex, rng=rng),
             )
         )
     return individuals
 
 
-def uk_population_pyramid() -> tuple[int, str]:
+def uk_population_pyramid(rng: np.random.Generator | None = None) -> tuple[int, str]:
     """
     Based on this data from the Office of National Statistics
 
@@ -171,83 +225,141 @@ def uk_population_pyramid() -> tuple[int, str]:
     90-94	186735	327263
     95-99	44769	104314
     100	5159	18725
+
+    Draws use `rng` if given and the global `np.random` state otherwise.
     """
-    age_groups = (
-        (0, 4),
-        (5, 9),
-        (10, 14),
-        (15, 19),
-        (20, 24),
-        (25, 29),
-        (30, 34),
-        (35, 39),
-        (40, 44),
-        (45, 49),
-        (50, 54),
-        (55, 59),
-        (60, 64),
-        (65, 69),
-        (70, 74),
-        (75, 79),
-        (80, 84),
-        (85, 89),
-        (90, 94),
-        (95, 99),
-        (100, 100),
+    if rng is None:
+        choice, random, integers = np.random.choice, np.random.random, np.random.randint
+    else:
+        choice, random, integers = rng.choice, rng.random, rng.integers
+    age_group_index = choice(
+        a=range(len(UK_AGE_GROUPS)),
+        p=UK_AGE_GROUP_PROBABILITIES,
     )
-    age_group_probabilities = (
-        0.0513237924129001,
-        0.058884838521506,
-        0.0619580723863934,
-        0.0581970881968707,
-        0.057191298005245,
-        0.0645622406293206,
-        0.067976013212672,
-        0.0661025261737008,
-        0.0645271046276757,
-        0.0591204711779157,
-        0.0659205275903903,
-        0.0678406510281835,
-        0.0618128189745511,
-        0.052067346975442,
-        0.046912910297153,
-        0.042289292978169,
-        0.0265148374094072,
-        0.0166564873142573,
-        0.00758816578718646,
-        0.00220091619043483,
-        0.000352600110625258,
+
+    lower_bound, upper_bound = UK_AGE_GROUPS[age_group_index]
+    probability_of_male = UK_PROBABILITY_OF_MALE_BY_AGE_GROUP[age_group_index]
+    sex = "Male" if random() < probability_of_male else "Female"
+
+    return int(integers(lower_bound, upper_bound + 1)), sex
+
+
+def uk_population_pyramid_array(
+    number_of_individuals: int, rng: np.random.Generator
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int8]]:
+    """
+    Array counterpart of `uk_population_pyramid`: return the ages and sexes
+    (indices of `hphp.individual.SEXES`) of `number_of_individuals`
+    individuals.
+
+    Ages are uniform within each age group, as for `uk_population_pyramid`,
+    and the sex and age are drawn together from
+    `hphp.rates.UK_POPULATION_DISTRIBUTION`.
+    """
+    cells = UK_POPULATION_SAMPLER.sample(rng=rng, size=number_of_individuals)
+    sex, age = np.divmod(cells, NUMBER_OF_AGES)
+    return age, sex.astype(np.int8)
+
+
+@overload
+def get_population_array(
+    number_of_individuals: int,
+    population_pyramid: Callable[..., tuple[npt.ArrayLike, npt.ArrayLike]] = ...,
+    seed: int | np.random.Generator | None = ...,
+    counts: Literal[False] = ...,
+    **population_pyramid_kwargs: Any,
+) -> Population: ...
+
+
+@overload
+def get_population_array(
+    number_of_individuals: int,
+    population_pyramid: Callable[..., tuple[npt.ArrayLike, npt.ArrayLike]] = ...,
+    seed: int | np.random.Generator | None = ...,
+    *,
+    counts: Literal[True],
+    **population_pyramid_kwargs: Any,
+) -> npt.NDArray[np.int64]: ...
+
+
+def get_population_array(
+    number_of_individuals: int,
+    population_pyramid: Callable[..., tuple[npt.ArrayLike, npt.ArrayLike]] = (
+        uk_population_pyramid_array
+    ),
+    seed: int | np.random.Generator | None = None,
+    counts: bool = False,
+    **population_pyramid_kwargs: Any,
+) -> Population | npt.NDArray[np.int64]:
+    """
+    Array counterpart of `get_population`: create a population by sampling
+    every age, sex and number of aces at once.
+
+    Parameters
+    ----------
+    number_of_individuals : int
+        Number of individuals to create.
+
+    population_pyramid : callable, default=uk_population_pyramid_array
+        Called as `population_pyramid(number_of_individuals, rng, **kwargs)`
+        and returning arrays of ages and of sexes (indices of
+        `hphp.individual.SEXES`).
+
+    seed : int, Generator or None
+        Random seed or generator for reproducibility.
+
+    counts : bool, default=False
+        Return the number of individuals in each (sex, age, number of aces)
+        cell (see `hphp.population.to_counts`) instead of a `Population`.
+
+    Returns
+    -------
+    population : Population or array
+        The population, which can be passed to `hphp.vectorised.simulate` or,
+        as counts, to `hphp.cohort.simulate`.
+    """
+    rng = np.random.default_rng(seed)
+    age, sex = population_pyramid(
+        number_of_individuals, rng=rng, **population_pyramid_kwargs
     )
-    probability_of_male_by_age_group = (
-        0.513176005009623,
-        0.512991799271436,
-        0.512329630786584,
-        0.512666396758669,
-        0.51361696250989,
-        0.513646750154748,
-        0.506477500050494,
-        0.496241825649744,
-        0.494564798361146,
-        0.495115030573354,
-        0.491374605424786,
-        0.48998347880055,
-        0.488664442959425,
-        0.484560127591707,
-        0.47659713065616,
-        0.466910754637479,
-        0.442840041647411,
-        0.412134823892074,
-        0.363299078984743,
-        0.3002958083752,
-        0.216002344665885,
+    sex = np.asarray(sex, dtype=np.int8)
+    population = Population(
+        sex=sex,
+        age=np.asarray(age, dtype=np.int64),
+        number_of_aces=sample_number_of_aces_array(sex=sex, rng=rng),
     )
-    age_group_index = np.random.choice(
-        a=range(len(age_groups)),
-        p=age_group_probabilities,
+    if counts:
+        return to_counts(population)
+    return population
+
+
+def get_population_from_uniforms(
+    uniforms: npt.NDArray[np.float64],
+) -> Population:
+    """
+    Create a population from the UK population pyramid by the inverse
+    distribution functions of given uniforms, one individual per column.
+
+    The three rows of `uniforms` give the sex of each individual, their age
+    given their sex and their number of aces given their sex, each by the
+    inverse of its own distribution function. Larger uniforms give females
+    rather than males, older individuals and more aces, so the populations of
+    `u` and `1 - u` are antithetic in every one of them.
+    """
+    sex = UK_SEX_SAMPLER.quantile(uniforms[0])
+    return Population(
+        sex=sex.astype(np.int8),
+        age=UK_AGE_SAMPLER.quantile(uniforms[1], rows=sex).astype(np.int64),
+        number_of_aces=ACE_SAMPLER.quantile(uniforms[2], rows=sex).astype(np.int64),
     )
 
-    lower_bound, upper_bound = age_groups[age_group_index]
-    probability_of_male = probability_of_male_by_age_group[age_group_index]
-    sex = "Male" if np.random.random() < probability_of_male else "Female"
 
-    return int(np.random.randint(lower_bound, upper_bound + 1)), sex
+def _generator(seed: int | np.random.Generator | None) -> np.random.Generator | None:
+    """
+    Return `seed` if it is a Generator. Otherwise seed the global `np.random`
+    state with it and return None so that draws use the global state.
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    np.random.seed(seed)
+    return None
@@ -0,0 +1,165 @@
+"""
+Stop a run early once its outcome is settled.
+
+The engines always simulate every year they are asked for, even after the
+population has died out or once its summary statistics have stopped
+changing. A stopping rule looks at the counts of each year (like a
+`hphp.reducers.Reducer`) and `observe` stops the run as soon as one of them
+is met, returning a `Stop` that records when and why.
+
+After extinction the population stays empty so carrying its last state
+forward gives exactly the rest of the run. After stationarity it only
+approximates the metrics that settled (proportions and means): the sizes of
+a growing or shrinking population keep changing, so the carried years are
+marked (see `is_carried_forward`). After the population passes a ceiling the
+rest of the run is unknown and is best left out.
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from typing import NamedTuple
+
+import numpy as np
+
+from .individual import Individual
+from .population import Counts, Population, as_counts
+from .reducers import Reducer, Summary
+
+# The reasons for stopping a run.
+EXTINCTION, CEILING, STATIONARITY = "extinction", "ceiling", "stationarity"
+
+# The reasons after which the last state can stand for the rest of the run.
+CARRY_FORWARD = (EXTINCTION, STATIONARITY)
+
+
+class Stop(NamedTuple):
+    """
+    A run stopped after observing `year` because of `reason`, with the
+    `counts` of that year.
+    """
+
+    year: int
+    reason: str
+    counts: Counts
+
+
+class StoppingRule(ABC):
+    """
+    A condition on the population for stopping a run.
+
+    Subclasses implement `update` which is called with the (sex, age, number
+    of aces) counts of each year in turn and returns whether the run should
+    stop.
+    """
+
+    reason: str
+
+    @abstractmethod
+    def update(self, counts: Counts) -> bool:
+        """
+        Return whether the run should stop after the year with `counts`.
+        """
+
+
+class Extinction(StoppingRule):
+    """Stop once the population is empty."""
+
+    reason = EXTINCTION
+
+    def update(self, counts: Counts) -> bool:
+        return bool(counts.sum() == 0)
+
+
+class Ceiling(StoppingRule):
+    """Stop once the population has more than `max_size` individuals."""
+
+    reason = CEILING
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+
+    def update(self, counts: Counts) -> bool:
+        return bool(counts.sum() > self.max_size)
+
+
+class Stationarity(StoppingRule):
+    """
+    Stop once the summary `metrics` (keys of `hphp.reducers.Summary`) have
+    settled.
+
+    The last `window` years are split into two halves: the run stops when,
+    for every metric, the means over the two halves differ by at most
+    `tolerance`. A metric that is NaN in the window (for example over an
+    empty population) is not considered settled.
+    """
+
+    reason = STATIONARITY
+
+    def __init__(
+        self,
+        metrics: Iterable[str] = ("mean_aces", "prop_traumatised"),
+        window: int = 20,
+        tolerance: float = 1e-3,
+        trauma_threshold: int = 1,
+    ) -> None:
+        self.metrics = tuple(metrics)
+        self.window = window
+        self.tolerance = tolerance
+        self.summary = Summary(trauma_threshold=trauma_threshold)
+        self.values: list[list[float]] = []
+
+    def update(self, counts: Counts) -> bool:
+        summary = self.summary.reduce(counts)
+        self.values.append([summary[metric] for metric in self.metrics])
+        self.values = self.values[-self.window :]
+        if len(self.values) < self.window:
+            return False
+        values = np.array(self.values)
+        half = self.window // 2
+        difference = np.abs(values[:half].mean(axis=0) - values[-half:].mean(axis=0))
+        return bool(np.all(difference <= self.tolerance))
+
+
+def observe(
+    populations: Iterable[Counts | Population | list[Individual]],
+    reducers: Iterable[Reducer],
+    rules: Iterable[StoppingRule],
+) -> Stop | None:
+    """
+    Update every reducer with each population of `populations`, as
+    `hphp.reducers.observe` does, until one of the `rules` is met.
+
+    Returns the `Stop` of the first rule met (the populations after it are
+    never simulated), or None if the run went to the end.
+    """
+    reducers = list(reducers)
+    rules = list(rules)
+    for year, population in enumerate(populations):
+        counts = as_counts(population)
+        for reducer in reducers:
+            reducer.update(counts)
+        for rule in rules:
+            if rule.update(counts):
+                return Stop(year=year, reason=rule.reason, counts=counts)
+    return None
+
+
+def carry_forward(
+    reducers: Iterable[Reducer], stop: Stop, number_of_years: int
+) -> None:
+    """
+    Update every reducer with the counts of the year a run stopped for each
+    of `number_of_years` further years, standing in for the rest of the run.
+    """
+    reducers = list(reducers)
+    for _ in range(number_of_years):
+        for reducer in reducers:
+            reducer.update(stop.counts)
+
+
+def is_carried_forward(stop: Stop | None, year: int) -> bool:
+    """
+    Return whether `year` of a run that stopped with `stop` (None if it went
+    to the end) was filled in by `carry_forward` rather than simulated.
+    """
+    return stop is not None and stop.reason in CARRY_FORWARD and year > stop.year
@@ -0,0 +1,176 @@
+"""
+Reproducible, independent random number streams.
+
+Every run draws from generators derived from a `numpy.random.SeedSequence`
+tree: the root is a base seed, the branches are keyed by a configuration
+(the parameters of the run) and a rep, and each leaf is the stream of one use
+(the initial population or the dynamics). A rep therefore gets the same
+numbers whatever order, thread or process it runs in, and no two reps,
+configurations or uses share a stream.
+
+For common random numbers (`common_generators`) the branches are keyed by the
+rep alone and the dynamics are split into a stream for each year and
+demographic process (`CommonRandomNumbers`), so that the same rep of
+different configurations draws matched numbers for the same purpose and
+their difference has a lower variance.
+
+The same streams with every uniform u replaced by 1 - u (`Antithetic`) give
+the antithetic twin of a run: the two runs of such a pair are negatively
+correlated, so their mean has a lower variance than that of two independent
+runs.
+"""
+
+import hashlib
+import numbers
+from collections.abc import Iterable
+from typing import Any, NamedTuple
+
+import numpy as np
+
+# Indices of the streams of `generators`.
+POPULATION, DYNAMICS = range(2)
+NUMBER_OF_STREAMS = 2
+
+# The key of the branches of common random numbers, which do not depend on
+# the configuration.
+COMMON = ("common random numbers",)
+
+
+class Processes(NamedTuple):
+    """
+    A generator for each demographic process of `hphp.vectorised.step`: who
+    gives birth, the sex and the number of aces of the children, who dies,
+    healing and trauma, and thinning (see `hphp.population.thin`).
+    """
+
+    birth: np.random.Generator
+    sex: np.random.Generator
+    aces: np.random.Generator
+    death: np.random.Generator
+    adjustment: np.random.Generator
+    thinning: np.random.Generator
+
+
+def configuration_key(configuration: Iterable[Any]) -> tuple[int, ...]:
+    """
+    Return a key of 32 bit integers identifying a configuration.
+
+    The key is a hash of the values of the configuration (for example
+    `(alpha, probability_of_heal, probability_of_trauma)`) that, unlike
+    `hash`, is the same in every process. Numbers are hashed as floats, so
+    equal values such as `1`, `1.0` and `np.float64(1)` give the same key.
+    """
+    values = tuple(_normalise(value) for value in configuration)
+    digest = hashlib.sha256(repr(values).encode()).digest()
+    return tuple(
+        int.from_bytes(digest[start : start + 4], "little") for start in range(0, 16, 4)
+    )
+
+
+def _normalise(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, numbers.Real) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+def seed_sequence(
+    seed: int | None, configuration: Iterable[Any] = (), rep: int = 0
+) -> np.random.SeedSequence:
+    """
+    Return the node of the seed tree of `rep` of `configuration`.
+
+    With a seed of None the root is drawn from fresh entropy, so runs are
+    independent but not reproducible.
+    """
+    return np.random.SeedSequence(
+        entropy=seed, spawn_key=(*configuration_key(configuration), rep)
+    )
+
+
+def generators(
+    seed: int | None, configuration: Iterable[Any] = (), rep: int = 0
+) -> list[np.random.Generator]:
+    """
+    Return the independent generators of `rep` of `configuration`, indexed by
+    `POPULATION` (to create the initial population) and `DYNAMICS` (to
+    simulate it).
+    """
+    return [
+        np.random.default_rng(child)
+        for child in seed_sequence(
+            seed=seed, configuration=configuration, rep=rep
+        ).spawn(NUMBER_OF_STREAMS)
+    ]
+
+
+class Antithetic(np.random.Generator):
+    """
+    A generator whose uniforms are 1 - u for the uniforms u of a
+    `numpy.random.Generator` with the same bit generator.
+
+    Only `random` is reflected: it is what every Bernoulli draw and inverse
+    distribution function of `hphp.vectorised.step` uses with `Processes`.
+    """
+
+    def random(self, size=None, dtype=np.float64, out=None):
+        uniforms = super().random(size=size, dtype=dtype, out=out)
+        if out is None:
+            return 1 - uniforms
+        np.subtract(1, out, out=out)
+        return out
+
+
+class CommonRandomNumbers(NamedTuple):
+    """
+    The random numbers of the dynamics of a rep, with a stream for each year
+    and process.
+
+    Every year has its own `Processes`, keyed by the year rather than drawn
+    one after the other, so runs whose populations differ in size still draw
+    the same numbers for the same year and process. With `antithetic` every
+    uniform u is replaced by 1 - u.
+    """
+
+    seed_sequence: np.random.SeedSequence
+    antithetic: bool = False
+
+    def processes(self, year: int) -> Processes:
+        """
+        Return the generators of the processes of `year`.
+        """
+        year_sequence = np.random.SeedSequence(
+            entropy=self.seed_sequence.entropy,
+            spawn_key=(*self.seed_sequence.spawn_key, year),
+        )
+        generator = Antithetic if self.antithetic else np.random.Generator
+        return Processes(
+            *(
+                generator(np.random.PCG64(child))
+                for child in year_sequence.spawn(len(Processes._fields))
+            )
+        )
+
+
+def process_generators(
+    seed: int | None, configuration: Iterable[Any] = (), rep: int = 0
+) -> tuple[np.random.Generator, CommonRandomNumbers]:
+    """
+    Return the generator of the initial population of `rep` of
+    `configuration` and the `CommonRandomNumbers` of its dynamics.
+    """
+    population, dynamics = seed_sequence(
+        seed=seed, configuration=configuration, rep=rep
+    ).spawn(NUMBER_OF_STREAMS)
+    return np.random.default_rng(population), CommonRandomNumbers(dynamics)
+
+
+def common_generators(
+    seed: int | None, rep: int = 0
+) -> tuple[np.random.Generator, CommonRandomNumbers]:
+    """
+    Return the common random numbers of `rep`: the `process_generators` that
+    are the same for every configuration.
+    """
+    return process_generators(seed=seed, configuration=COMMON, rep=rep)
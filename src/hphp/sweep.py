@@ -0,0 +1,335 @@
+"""
+Run a sweep over a grid of configurations in one pool of worker processes.
+
+Every (configuration, rep) pair is a task. The tasks of all configurations
+share a single `concurrent.futures.ProcessPoolExecutor`, so the cost of
+starting an interpreter and importing the model is paid once per worker
+rather than once per configuration. The results of a configuration are
+written (see `hphp.output`) as soon as all of its reps are done, and
+configurations whose results already exist are skipped, so an interrupted
+sweep resumes where it stopped.
+
+Tasks are handed to the workers longest first, as predicted by
+`hphp.cost.CostModel` from the expected growth of the population and the
+measured times of completed tasks, so that the workers finish together
+instead of waiting on a few long runs at the end.
+
+With a `hphp.sequential.Precision` the number of reps is adaptive: each
+configuration starts with the minimum number of reps and gets another batch
+whenever its reps so far are all done without meeting the target, so the
+workers spend their time on the configurations with the most variance.
+"""
+
+import concurrent.futures
+import heapq
+import itertools
+import os
+import sys
+import time
+from collections.abc import Iterable
+from typing import Any, TextIO
+
+from . import output
+from .cost import CostModel
+from .replication import Configuration, Replicate, run_replicate
+from .sequential import Precision
+
+
+def grid(
+    alpha_values: Iterable[float],
+    heal_values: Iterable[float],
+    trauma_values: Iterable[float],
+    decimals: int = 2,
+    **parameters: Any,
+) -> list[Configuration]:
+    """
+    Return the configurations of every combination of the values of alpha,
+    the probability of healing and the probability of trauma.
+
+    Values are rounded to `decimals` decimal places. The other `parameters`
+    (for example `years`) are the same for every configuration.
+    """
+    return [
+        Configuration(
+            alpha=round(float(alpha), decimals),
+            probability_of_heal=round(float(heal), decimals),
+            probability_of_trauma=round(float(trauma), decimals),
+            **parameters,
+        )
+        for trauma, heal, alpha in itertools.product(
+            trauma_values, heal_values, alpha_values
+        )
+    ]
+
+
+class Progress:
+    """
+    The number of completed tasks of a sweep with the elapsed time and an
+    estimate of the time remaining.
+    """
+
+    def __init__(self, total: int, stream: TextIO | None = sys.stderr) -> None:
+        self.total = total
+        self.completed = 0
+        self.stream = stream
+        self.start = time.monotonic()
+
+    def update(self, completed: int = 1) -> None:
+        self.completed += completed
+        if self.stream is not None:
+            print(f"\r{self}", end="", file=self.stream, flush=True)
+
+    def eta(self) -> float:
+        """
+        Return the estimated number of seconds until all tasks are done.
+        """
+        if self.completed == 0:
+            return float("nan")
+        elapsed = time.monotonic() - self.start
+        return elapsed / self.completed * (self.total - self.completed)
+
+    def __str__(self) -> str:
+        elapsed = time.monotonic() - self.start
+        return (
+            f"{self.completed}/{self.total} tasks, "
+            f"{_format_duration(elapsed)} elapsed, "
+            f"ETA {_format_duration(self.eta())}"
+        )
+
+
+class Schedule:
+    """
+    The tasks of a sweep that are still to be run, in decreasing order of
+    predicted cost.
+
+    Priorities are in expected individual-years: a configuration that has
+    been observed by the cost model has its measured time converted at the
+    current seconds per individual-year, and `update` reorders it.
+    """
+
+    def __init__(
+        self,
+        configurations: Iterable[Configuration],
+        repetitions: int,
+        cost_model: CostModel,
+    ) -> None:
+        self.cost_model = cost_model
+        self.remaining = {
+            configuration: list(reversed(range(repetitions)))
+            for configuration in configurations
+        }
+        self.counter = itertools.count()
+        self.priorities: dict[Configuration, float] = {}
+        self.heap: list[tuple[float, int, Configuration]] = []
+        for configuration in self.remaining:
+            self.update(configuration)
+
+    def __len__(self) -> int:
+        return sum(len(reps) for reps in self.remaining.values())
+
+    def add(self, configuration: Configuration, reps: Iterable[int]) -> None:
+        """
+        Add reps of a configuration, to run after those already scheduled.
+        """
+        self.remaining[configuration] = list(reversed(list(reps))) + (
+            self.remaining.get(configuration, [])
+        )
+        self.update(configuration)
+
+    def update(self, configuration: Configuration) -> None:
+        """
+        Recompute the priority of a configuration from the cost model.
+        """
+        if configuration not in self.remaining:
+            return
+        priority = -(
+            self.cost_model.predict(configuration)
+            / self.cost_model.seconds_per_individual_year()
+        )
+        self.priorities[configuration] = priority
+        heapq.heappush(self.heap, (priority, next(self.counter), configuration))
+
+    def pop(self) -> tuple[Configuration, int] | None:
+        """
+        Remove and return the (configuration, rep) of the next task, or None if
+        there are none left.
+        """
+        while self.heap:
+            priority, _, configuration = self.heap[0]
+            if (
+                configuration not in self.remaining
+                or priority != self.priorities[configuration]
+            ):
+                heapq.heappop(self.heap)
+                continue
+            reps = self.remaining[configuration]
+            rep = reps.pop()
+            if not reps:
+                del self.remaining[configuration]
+                heapq.heappop(self.heap)
+            return configuration, rep
+        return None
+
+
+def run(
+    configurations: Iterable[Configuration],
+    repetitions: int,
+    output_dir: str,
+    seed: int | None = None,
+    pyramid_years: Iterable[int] = output.PYRAMID_YEARS,
+    processes: int | None = None,
+    progress: TextIO | None = sys.stderr,
+    cost_model: CostModel | None = None,
+    precision: Precision | None = None,
+    columnar: bool = False,
+) -> list[str]:
+    """
+    Run every rep of every configuration and write the results of each
+    configuration to its directory of `output_dir`.
+
+    Parameters
+    ----------
+    configurations : iterable of Configuration
+        The configurations to run (see `grid`).
+
+    repetitions : int
+        Number of replicates of each configuration. With a `precision` this
+        is only used to name the directories of the results, and is usually
+        its maximum number of reps.
+
+    output_dir : str
+        Directory holding a directory of results for each configuration.
+
+    seed : int or None
+        Base seed of the random streams (see `hphp.replication`).
+
+    pyramid_years : iterable of int
+        Years at which to record the population pyramid.
+
+    processes : int or None
+        Number of worker processes (the number of CPUs if None).
+
+    progress : file or None
+        Where to report progress, or None for no report.
+
+    cost_model : CostModel or None
+        Model of the duration of the tasks, which is updated with the
+        measured durations. A new model if None.
+
+    precision : Precision or None
+        If not None, reps of each configuration are added until this
+        precision is met (see `hphp.sequential`) rather than running
+        `repetitions` reps.
+
+    columnar : bool
+        Whether to write the results as columns (see
+        `hphp.output.write_columns`) rather than as csv files.
+
+    Returns
+    -------
+    paths : list of str
+        The directories written by this call. Configurations with complete
+        results in `output_dir` are skipped.
+    """
+    pyramid_years = tuple(pyramid_years)
+    paths = {}
+    for configuration in configurations:
+        path = os.path.join(
+            output_dir, output.directory_name(configuration, repetitions)
+        )
+        if not output.is_complete(path, columnar=columnar):
+            paths[configuration] = path
+
+    if cost_model is None:
+        cost_model = CostModel()
+    initial_repetitions = (
+        repetitions if precision is None else precision.additional_repetitions([])
+    )
+    schedule = Schedule(paths, repetitions=initial_repetitions, cost_model=cost_model)
+    # The number of reps of each configuration that are scheduled or running.
+    pending = dict.fromkeys(paths, initial_repetitions)
+    replicates: dict[Configuration, list[Replicate]] = {
+        configuration: [] for configuration in paths
+    }
+    tracker = Progress(total=len(schedule), stream=progress)
+    written = []
+    processes = processes or os.cpu_count() or 1
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processes) as executor:
+        # Only a few tasks per worker are submitted at a time so that the
+        # schedule can use the durations measured so far.
+        futures: dict[concurrent.futures.Future, Configuration] = {}
+
+        def submit() -> None:
+            while len(futures) < 2 * processes and (task := schedule.pop()):
+                configuration, rep = task
+                future = executor.submit(
+                    _timed_run_replicate,
+                    configuration,
+                    rep,
+                    seed=seed,
+                    pyramid_years=pyramid_years,
+                )
+                futures[future] = configuration
+
+        submit()
+        while futures:
+            done, _ = concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                configuration = futures.pop(future)
+                replicate, seconds = future.result()
+                cost_model.observe(configuration, seconds)
+                schedule.update(configuration)
+                replicates[configuration].append(replicate)
+                pending[configuration] -= 1
+                tracker.update()
+                if pending[configuration] > 0:
+                    continue
+                finished = sorted(replicates[configuration], key=lambda r: r.rep)
+                additional = (
+                    0
+                    if precision is None
+                    else precision.additional_repetitions(finished)
+                )
+                if additional:
+                    start = len(finished)
+                    schedule.add(configuration, range(start, start + additional))
+                    pending[configuration] = additional
+                    tracker.total += additional
+                    continue
+                del replicates[configuration]
+                output.write(
+                    path=paths[configuration],
+                    configuration=configuration,
+                    repetitions=len(finished),
+                    seed=seed,
+                    replicates=finished,
+                    columnar=columnar,
+                )
+                written.append(paths[configuration])
+            submit()
+    if progress is not None and paths:
+        print(file=progress)
+    return written
+
+
+def _timed_run_replicate(
+    configuration: Configuration,
+    rep: int,
+    seed: int | None,
+    pyramid_years: tuple[int, ...],
+) -> tuple[Replicate, float]:
+    start = time.perf_counter()
+    replicate = run_replicate(
+        configuration, rep, seed=seed, pyramid_years=pyramid_years
+    )
+    return replicate, time.perf_counter() - start
+
+
+def _format_duration(seconds: float) -> str:
+    if seconds != seconds:
+        return "--:--:--"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
@@ -0,0 +1,254 @@
+from collections.abc import Iterator
+
+import numpy as np
+
+from .birth_death import (
+    adjust_aces_array,
+    birth_array,
+    death_array,
+    sample_intergenerational_number_of_aces_array,
+)
+from .individual import FEMALE, MALE, Individual
+from .population import Population, from_individuals, thin
+from .rates import MAXIMUM_NUMBER_OF_ACES
+from .sampling import INTERGENERATIONAL_ACE_SAMPLER
+from .streams import CommonRandomNumbers, Processes
+
+
+def step(
+    population: Population,
+    rng: np.random.Generator | Processes,
+    probability_of_male_birth: float,
+    alpha: float = 1.1,
+    tempo_years_per_ace: int = 3,
+    probability_of_heal: float = 0,
+    probability_of_trauma: float = 0,
+) -> Population:
+    """
+    Advance a population by one year.
+
+    This applies the same rules as `hphp.simulation.simulate` to every
+    individual at once with the array functions of `hphp.birth_death`:
+
+    - every female gives birth (`birth_array`), the child's sex is male with
+      probability `probability_of_male_birth` and their number of aces is
+      drawn from the mother's (`sample_intergenerational_number_of_aces_array`);
+    - every individual dies with the probability of `death_array`;
+    - every survivor ages by a year and has their number of aces adjusted
+      (`adjust_aces_array`).
+
+    Children have the weight of the population.
+
+    With `Processes` rather than a single generator each process draws from
+    its own stream (see `hphp.streams.CommonRandomNumbers`) and every draw is
+    indexed by individual: the i-th number of a stream decides the birth,
+    the child's sex and aces, the death and the healing or trauma of the
+    i-th individual, whatever happens to the others. The number of aces of
+    a child is the inverse of the distribution function at its number, so
+    that matched numbers give ordered outcomes.
+    """
+    if isinstance(rng, Processes):
+        common = True
+        birth_rng, sex_rng, aces_rng, death_rng, adjustment_rng = (
+            rng.birth,
+            rng.sex,
+            rng.aces,
+            rng.death,
+            rng.adjustment,
+        )
+    else:
+        common = False
+        birth_rng = sex_rng = aces_rng = death_rng = adjustment_rng = rng
+    sex, age, number_of_aces = (
+        population.sex,
+        population.age,
+        population.number_of_aces,
+    )
+
+    # ---- Births ----
+    gives_birth = (sex == FEMALE) & birth_array(
+        age=age,
+        number_of_aces=number_of_aces,
+        rng=birth_rng,
+        alpha=alpha,
+        tempo_years_per_ace=tempo_years_per_ace,
+    )
+    maternal_aces = number_of_aces[gives_birth]
+    number_of_births = len(maternal_aces)
+    if common:
+        child_sex_uniforms = sex_rng.random(len(age))[gives_birth]
+        child_number_of_aces = INTERGENERATIONAL_ACE_SAMPLER.quantile(
+            aces_rng.random(len(age))[gives_birth],
+            rows=np.minimum(maternal_aces, MAXIMUM_NUMBER_OF_ACES),
+        )
+    else:
+        child_sex_uniforms = sex_rng.random(number_of_births)
+        child_number_of_aces = sample_intergenerational_number_of_aces_array(
+            number_of_maternal_aces=maternal_aces, rng=aces_rng
+        )
+    child_sex = np.where(
+        child_sex_uniforms < probability_of_male_birth, MALE, FEMALE
+    ).astype(np.int8)
+
+    # ---- Deaths ----
+    survives = ~death_array(age=age, sex=sex, rng=death_rng)
+    if common:
+        # Everyone draws for healing and trauma before the dead are removed.
+        adjustment = adjust_aces_array(
+            age=age,
+            number_of_aces=number_of_aces,
+            probability_of_heal=probability_of_heal,
+            probability_of_trauma=probability_of_trauma,
+            rng=adjustment_rng,
+        )[survives]
+    sex = sex[survives]
+    age = age[survives]
+    number_of_aces = number_of_aces[survives]
+
+    # ---- Healing and trauma ----
+    if not common:
+        adjustment = adjust_aces_array(
+            age=age,
+            number_of_aces=number_of_aces,
+            probability_of_heal=probability_of_heal,
+            probability_of_trauma=probability_of_trauma,
+            rng=adjustment_rng,
+        )
+    number_of_aces = number_of_aces + adjustment
+
+    return Population(
+        sex=np.concatenate((sex, child_sex)),
+        age=np.concatenate((age + 1, np.zeros(number_of_births, dtype=np.int64))),
+        number_of_aces=np.concatenate(
+            (number_of_aces, child_number_of_aces.astype(np.int64))
+        ),
+        weight=population.weight,
+    )
+
+
+def simulate(
+    number_of_years: int,
+    initial_population: Population | list[Individual],
+    probability_of_male_birth: float,
+    alpha: float = 1.1,
+    tempo_years_per_ace: int = 3,
+    seed: int | np.random.Generator | CommonRandomNumbers | None = None,
+    probability_of_heal: float = 0,
+    probability_of_trauma: float = 0,
+    max_population: int | None = None,
+) -> list[Population]:
+    """
+    Simulate the model of `hphp.simulation.simulate` with the population
+    stored as arrays.
+
+    Births, deaths, healing and trauma are applied to the whole population
+    each year as masked array operations (see `step`). The results have the
+    same distribution as `hphp.simulation.simulate` but are not identical
+    for a given seed.
+
+    Parameters
+    ----------
+    number_of_years : int
+        Number of years to simulate.
+
+    initial_population : Population or list of Individual
+        Initial population state.
+
+    probability_of_male_birth : float
+        Probability that a newborn is male.
+
+    alpha : float, default=1.1
+        Multiplicative fertility factor (quantum effect).
+
+    tempo_years_per_ace : int, default=3
+        Number of years by which reproduction is shifted earlier per ACE
+        (tempo effect).
+
+    seed : int, Generator, CommonRandomNumbers or None
+        Random seed or generator for reproducibility, or common random
+        numbers giving a generator for each process of each year (see
+        `hphp.streams.CommonRandomNumbers`).
+
+    probability_of_heal : float
+        Annual probability that an individual reduces their ACE count by one.
+
+    probability_of_trauma : float
+        Annual probability that a child experiences an additional ACE.
+
+    max_population : int or None
+        If not None, the population is thinned to `max_population` individuals
+        whenever it grows beyond it (see `hphp.population.thin`). Each
+        individual kept then stands for several, as given by the weight of
+        the population, so the cost of a year is bounded while weighted
+        summaries (see `hphp.reducers`) remain unbiased.
+
+    Returns
+    -------
+    populations : list of Population
+        A history of the population at each year.
+    """
+    return list(
+        stream(
+            number_of_years=number_of_years,
+            initial_population=initial_population,
+            probability_of_male_birth=probability_of_male_birth,
+            alpha=alpha,
+            tempo_years_per_ace=tempo_years_per_ace,
+            seed=seed,
+            probability_of_heal=probability_of_heal,
+            probability_of_trauma=probability_of_trauma,
+            max_population=max_population,
+        )
+    )
+
+
+def stream(
+    number_of_years: int,
+    initial_population: Population | list[Individual],
+    probability_of_male_birth: float,
+    alpha: float = 1.1,
+    tempo_years_per_ace: int = 3,
+    seed: int | np.random.Generator | CommonRandomNumbers | None = None,
+    probability_of_heal: float = 0,
+    probability_of_trauma: float = 0,
+    max_population: int | None = None,
+) -> Iterator[Population]:
+    """
+    Yield the population at each year of `simulate`, starting with the
+    initial population.
+
+    Only the current year is kept in memory. For a given seed this yields
+    exactly the populations returned by `simulate`.
+    """
+    if not isinstance(initial_population, Population):
+        initial_population = from_individuals(initial_population)
+    if isinstance(seed, CommonRandomNumbers):
+        processes = seed.processes
+    else:
+        generator = np.random.default_rng(seed)
+
+        def processes(year: int) -> np.random.Generator | Processes:
+            return generator
+
+    population = initial_population
+    if max_population is not None:
+        population = thin(population, max_population, _thinning(processes(0)))
+    yield population
+    for year in range(1, number_of_years + 1):
+        rng = processes(year)
+        population = step(
+            population,
+            rng=rng,
+            probability_of_male_birth=probability_of_male_birth,
+            alpha=alpha,
+            tempo_years_per_ace=tempo_years_per_ace,
+            probability_of_heal=probability_of_heal,
+            probability_of_trauma=probability_of_trauma,
+        )
+        if max_population is not None:
+            population = thin(population, max_population, _thinning(rng))
+        yield population
+
+
+def _thinning(rng: np.random.Generator | Processes) -> np.random.Generator:
+    return rng.thinning if isinstance(rng, Processes) else rng
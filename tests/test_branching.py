@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+import hphp.branching
+import hphp.cohort
+import hphp.reducers
+import hphp.simulation
+
+PARAMETERS = dict(
+    probability_of_male_birth=0.51,
+    alpha=1.3,
+    probability_of_heal=0.05,
+    probability_of_trauma=0.05,
+)
+
+
+@pytest.fixture
+def initial_population():
+    return hphp.simulation.get_population(
+        number_of_individuals=200,
+        population_pyramid=hphp.simulation.uk_population_pyramid,
+        seed=0,
+    )
+
+
+def test_warm_up_and_fork_without_seed_is_a_single_run(initial_population):
+    snapshot = hphp.branching.warm_up(
+        number_of_years=6,
+        initial_population=initial_population,
+        reducers=[hphp.reducers.Summary()],
+        seed=1,
+        **PARAMETERS,
+    )
+    assert snapshot.year == 6
+    (fork,) = hphp.branching.fork(
+        snapshot, number_of_years=4, reducers=[hphp.reducers.Summary()], **PARAMETERS
+    )
+    (whole,) = hphp.branching.fork(
+        hphp.branching.warm_up(
+            number_of_years=0,
+            initial_population=initial_population,
+            seed=1,
+            **PARAMETERS,
+        ),
+        number_of_years=10,
+        reducers=[hphp.reducers.Summary()],
+        **PARAMETERS,
+    )
+    assert snapshot.reducers[0].result() + fork.result()[1:] == whole.result()
+
+
+def test_fork_all_gives_reproducible_independent_forks(initial_population):
+    snapshot = hphp.branching.warm_up(
+        number_of_years=5,
+        initial_population=initial_population,
+        engine=hphp.cohort,
+        seed=1,
+        **PARAMETERS,
+    )
+    parameters = [
+        dict(PARAMETERS, probability_of_heal=probability_of_heal)
+        for probability_of_heal in (0.0, 0.2, 0.0)
+    ]
+    kwargs = dict(
+        snapshot=snapshot,
+        number_of_years=5,
+        parameters=parameters,
+        reducers=lambda: [hphp.reducers.MeanAces()],
+        engine=hphp.cohort,
+        seed=2,
+    )
+    serial = [
+        reducers[0].result().tolist() for reducers in hphp.branching.fork_all(**kwargs)
+    ]
+    assert serial[0] == serial[2]
+    assert serial[0] != serial[1]
+    # Every fork starts from the population of the snapshot.
+    assert serial[0][0] == serial[1][0]
+    assert serial != [
+        reducers[0].result().tolist()
+        for reducers in hphp.branching.fork_all(**dict(kwargs, rep=1))
+    ]
+
+
+def test_fork_with_an_int_seed_leaves_the_global_random_state_alone(
+    initial_population,
+):
+    snapshot = hphp.branching.warm_up(
+        number_of_years=2, initial_population=initial_population, seed=1, **PARAMETERS
+    )
+    np.random.seed(0)
+    expected = np.random.random()
+    np.random.seed(0)
+    forks = [
+        hphp.branching.fork(
+            snapshot,
+            number_of_years=4,
+            reducers=[hphp.reducers.Summary()],
+            seed=2,
+            **PARAMETERS,
+        )[0].result()
+        for _ in range(2)
+    ]
+    assert np.random.random() == expected
+    assert forks[0] == forks[1]
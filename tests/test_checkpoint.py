@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+import hphp.checkpoint
+import hphp.cohort
+import hphp.population
+import hphp.reducers
+import hphp.simulation
+import hphp.vectorised
+
+PARAMETERS = dict(
+    probability_of_male_birth=0.51,
+    alpha=1.3,
+    probability_of_heal=0.05,
+    probability_of_trauma=0.05,
+)
+
+
+@pytest.mark.parametrize(
+    "engine", (hphp.simulation, hphp.vectorised, hphp.cohort), ids=lambda e: e.__name__
+)
+def test_resuming_gives_the_results_of_an_uninterrupted_run(tmp_path, engine):
+    initial_population = hphp.simulation.get_population(
+        number_of_individuals=200,
+        population_pyramid=hphp.simulation.uk_population_pyramid,
+        seed=0,
+    )
+
+    def reducers():
+        return [hphp.reducers.Summary(), hphp.reducers.Pyramid(years=(0, 7, 12))]
+
+    uninterrupted = hphp.checkpoint.simulate(
+        path=str(tmp_path / "uninterrupted.npz"),
+        number_of_years=12,
+        initial_population=initial_population,
+        reducers=reducers(),
+        engine=engine,
+        seed=1,
+        every=5,
+        **PARAMETERS,
+    )
+
+    # Stopping after 7 years leaves a checkpoint at year 7 to resume from.
+    path = str(tmp_path / "interrupted.npz")
+    hphp.checkpoint.simulate(
+        path=path,
+        number_of_years=7,
+        initial_population=initial_population,
+        reducers=reducers(),
+        engine=engine,
+        seed=1,
+        every=5,
+        **PARAMETERS,
+    )
+    assert hphp.checkpoint.load(path).year == 7
+    resumed = hphp.checkpoint.simulate(
+        path=path,
+        number_of_years=12,
+        initial_population=None,
+        reducers=[],
+        engine=engine,
+        every=5,
+        **PARAMETERS,
+    )
+
+    assert len(resumed[0].result()) == 13
+    assert resumed[0].result() == uninterrupted[0].result()
+    assert resumed[1].recorded_years == [0, 7, 12]
+    assert np.array_equal(resumed[1].result(), uninterrupted[1].result())
+
+
+def test_save_and_load_round_trip(tmp_path):
+    rng = np.random.default_rng(3)
+    population = hphp.simulation.get_population_array(number_of_individuals=50, seed=2)
+    reducer = hphp.reducers.MeanAces()
+    reducer.update(hphp.population.to_counts(population))
+    path = str(tmp_path / "checkpoint.npz")
+    hphp.checkpoint.save(
+        path,
+        hphp.checkpoint.Checkpoint(
+            year=4,
+            population=population,
+            rng_state=rng.bit_generator.state,
+            reducers=[reducer],
+        ),
+    )
+    checkpoint = hphp.checkpoint.load(path)
+    assert checkpoint.year == 4
+    for a, b in zip(checkpoint.population, population, strict=True):
+        assert np.array_equal(a, b)
+    assert checkpoint.reducers[0].result() == reducer.result()
+    assert hphp.checkpoint.generator(checkpoint.rng_state).random() == rng.random()
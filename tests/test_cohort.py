@@ -0,0 +1,93 @@
+import numpy as np
+
+import hphp.cohort
+import hphp.population
+import hphp.simulation
+import hphp.vectorised
+
+
+def test_to_counts_and_from_counts_round_trip():
+    individuals = [
+        hphp.simulation.Individual(sex="Male", age=21, number_of_aces=3),
+        hphp.simulation.Individual(sex="Female", age=0, number_of_aces=0),
+        hphp.simulation.Individual(sex="Female", age=0, number_of_aces=0),
+        hphp.simulation.Individual(sex="Female", age=100, number_of_aces=8),
+    ]
+    counts = hphp.population.to_counts(hphp.population.from_individuals(individuals))
+    assert counts.shape == hphp.population.COUNTS_SHAPE
+    assert counts.sum() == 4
+    assert counts[0, 21, 3] == 1
+    assert counts[1, 0, 0] == 2
+    assert counts[1, 100, 8] == 1
+    population = hphp.population.from_counts(counts)
+    assert sorted(hphp.population.to_individuals(population)) == sorted(individuals)
+
+
+def test_simulate_keeps_valid_states():
+    initial_population = hphp.simulation.get_population(
+        number_of_individuals=1_000,
+        population_pyramid=hphp.simulation.uk_population_pyramid,
+        seed=0,
+    )
+    populations = hphp.cohort.simulate(
+        number_of_years=120,
+        initial_population=initial_population,
+        probability_of_male_birth=0.51,
+        alpha=1.3,
+        seed=0,
+        probability_of_heal=0.05,
+        probability_of_trauma=0.05,
+    )
+    assert len(populations) == 121
+    assert populations[0].sum() == 1_000
+    for counts in populations:
+        assert counts.shape == hphp.population.COUNTS_SHAPE
+        assert counts.min() >= 0
+
+
+def test_simulate_without_births_only_ages_the_population():
+    counts = np.zeros(hphp.population.COUNTS_SHAPE, dtype=np.int64)
+    counts[0, 5, 2] = 1_000
+    populations = hphp.cohort.simulate(
+        number_of_years=3,
+        initial_population=counts,
+        probability_of_male_birth=0.51,
+        seed=0,
+    )
+    for year, counts in enumerate(populations):
+        assert counts.sum() == counts[0, 5 + year, 2]
+    assert 990 <= populations[-1].sum() < 1_000
+
+
+def test_simulate_has_same_distribution_as_vectorised_simulate():
+    """
+    Compare the mean population size, age and number of aces after 20 years
+    over repeated runs of both engines.
+    """
+    initial_population = hphp.simulation.get_population(
+        number_of_individuals=1_000,
+        population_pyramid=hphp.simulation.uk_population_pyramid,
+        seed=0,
+    )
+    kwargs = dict(
+        number_of_years=20,
+        initial_population=initial_population,
+        probability_of_male_birth=0.51,
+        alpha=1.5,
+        probability_of_heal=0.05,
+        probability_of_trauma=0.1,
+    )
+    cohort = []
+    vectorised = []
+    for seed in range(50):
+        population = hphp.population.from_counts(
+            hphp.cohort.simulate(seed=seed, **kwargs)[-1]
+        )
+        cohort.append(
+            (len(population.age), population.age.mean(), population.number_of_aces.mean())
+        )
+        population = hphp.vectorised.simulate(seed=seed, **kwargs)[-1]
+        vectorised.append(
+            (len(population.age), population.age.mean(), population.number_of_aces.mean())
+        )
+    assert np.allclose(np.mean(cohort, axis=0), np.mean(vectorised, axis=0), rtol=0.01)
@@ -0,0 +1,79 @@
+import numpy as np
+
+import hphp.control
+import hphp.population
+import hphp.replication
+import hphp.sequential
+
+CONFIGURATION = hphp.replication.Configuration(
+    years=20,
+    initial_population_size=300,
+    alpha=1.2,
+    probability_of_heal=0.05,
+    probability_of_trauma=0.05,
+)
+
+
+def test_control_variate_estimate_removes_the_explained_variance():
+    rng = np.random.default_rng(0)
+    controls = rng.normal(size=50)
+    outcomes = 2 + 3 * controls + rng.normal(scale=0.01, size=50)
+    estimate = hphp.control.control_variate_estimate(outcomes, controls, control_mean=0)
+    assert np.isclose(estimate.mean, 2, atol=0.01)
+    assert estimate.half_width < 0.01
+    assert estimate.samples == 50
+    assert hphp.sequential.half_width(outcomes) > 0.5
+
+
+def test_control_variate_estimate_includes_the_error_of_the_control_mean():
+    rng = np.random.default_rng(0)
+    controls = rng.normal(size=50)
+    outcomes = 2 + 3 * controls + rng.normal(scale=0.01, size=50)
+    exact = hphp.control.control_variate_estimate(outcomes, controls, control_mean=0)
+    estimated = hphp.control.control_variate_estimate(
+        outcomes, controls, control_mean=0, control_mean_variance=0.01
+    )
+    assert estimated.mean == exact.mean
+    assert estimated.half_width > 0.5
+
+
+def test_sampled_outcomes_have_the_mean_of_the_controls_of_the_reps():
+    initial_populations = [
+        hphp.replication.initial_population(CONFIGURATION, rep=rep, seed=0)
+        for rep in range(200)
+    ]
+    projected = hphp.control.projected_outcomes(
+        CONFIGURATION, initial_populations, metric="prop_traumatised", warm_up=5
+    )
+    sampled = hphp.control.sampled_outcomes(
+        CONFIGURATION, 200, seed=0, metric="prop_traumatised", warm_up=5
+    )
+    assert len(projected) == len(sampled) == 200
+    assert not np.array_equal(np.sort(projected), np.sort(sampled))
+    assert np.isclose(
+        projected.mean(),
+        sampled.mean(),
+        atol=3 * np.sqrt((projected.var() + sampled.var()) / 200),
+    )
+
+
+def test_initial_population_is_the_one_of_run_replicate():
+    population = hphp.replication.initial_population(CONFIGURATION, rep=3, seed=1)
+    replicate = hphp.replication.run_replicate(CONFIGURATION, rep=3, seed=1)
+    counts = hphp.population.to_counts(population)
+    initial_mean_aces = (
+        counts.sum(axis=(0, 1)) * np.arange(counts.shape[2])
+    ).sum() / counts.sum()
+    assert np.isclose(replicate.summaries[0]["mean_aces"], initial_mean_aces)
+
+
+def test_estimate_is_tighter_than_the_plain_mean():
+    replicates = hphp.replication.replicate(CONFIGURATION, 20, seed=0, processes=1)
+    controlled = hphp.control.estimate(
+        CONFIGURATION, replicates, seed=0, metric="mean_aces", warm_up=5
+    )
+    plain = hphp.sequential.estimate(
+        hphp.sequential.Precision(metric="mean_aces", warm_up=5).outcomes(replicates)
+    )
+    assert controlled.half_width < plain.half_width
+    assert abs(controlled.mean - plain.mean) < plain.half_width
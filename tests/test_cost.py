@@ -0,0 +1,68 @@
+import numpy as np
+
+import hphp.cost
+import hphp.jobqueue
+import hphp.replication
+import hphp.sweep
+
+CONFIGURATIONS = hphp.sweep.grid(
+    alpha_values=(1.0, 1.5),
+    heal_values=(0.0, 0.5),
+    trauma_values=(0.05,),
+    years=50,
+    initial_population_size=100,
+)
+
+
+def test_expected_individual_years():
+    configuration = hphp.replication.Configuration(years=0, initial_population_size=10)
+    assert np.isclose(hphp.cost.expected_individual_years(configuration), 10)
+    low_alpha_no_heal, high_alpha_no_heal, _, high_alpha_heal = [
+        hphp.cost.expected_individual_years(configuration)
+        for configuration in CONFIGURATIONS
+    ]
+    assert high_alpha_no_heal > low_alpha_no_heal
+    assert high_alpha_no_heal > high_alpha_heal
+
+
+def test_cost_model_learns_from_measured_times():
+    model = hphp.cost.CostModel()
+    first, second = CONFIGURATIONS[:2]
+    assert model.predict(first) == hphp.cost.expected_individual_years(first)
+    model.observe(first, seconds=2.0)
+    model.observe(first, seconds=4.0)
+    assert model.predict(first) == 3.0
+    rate = 6.0 / (2 * hphp.cost.expected_individual_years(first))
+    assert np.isclose(model.seconds_per_individual_year(), rate)
+    assert np.isclose(
+        model.predict(second), hphp.cost.expected_individual_years(second) * rate
+    )
+
+
+def test_schedule_pops_the_longest_tasks_first():
+    model = hphp.cost.CostModel()
+    schedule = hphp.sweep.Schedule(CONFIGURATIONS, repetitions=2, cost_model=model)
+    assert len(schedule) == 8
+    longest = max(CONFIGURATIONS, key=model.predict)
+    assert schedule.pop() == (longest, 0)
+    assert schedule.pop() == (longest, 1)
+
+    # Once measured as very long, a configuration moves to the front.
+    shortest = min(CONFIGURATIONS, key=model.predict)
+    model.observe(longest, seconds=1.0)
+    model.observe(shortest, seconds=1_000.0)
+    schedule.update(shortest)
+    assert schedule.pop() == (shortest, 0)
+    tasks = []
+    while (task := schedule.pop()) is not None:
+        tasks.append(task)
+    assert len(tasks) == 5
+
+
+def test_job_queue_claims_the_costliest_tasks_first(tmp_path):
+    queue = hphp.jobqueue.JobQueue(str(tmp_path / "queue.db"))
+    queue.add(CONFIGURATIONS, repetitions=1)
+    claimed = [queue.claim("worker").configuration for _ in CONFIGURATIONS]
+    assert claimed == sorted(
+        CONFIGURATIONS, key=hphp.cost.expected_individual_years, reverse=True
+    )
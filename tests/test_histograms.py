@@ -0,0 +1,84 @@
+import numpy as np
+
+import hphp.histograms
+import hphp.output
+import hphp.replication
+import hphp.stopping
+
+CONFIGURATION = hphp.replication.Configuration(
+    years=10,
+    initial_population_size=300,
+    alpha=1.3,
+    probability_of_heal=0.05,
+    probability_of_trauma=0.05,
+)
+
+
+def test_histograms_give_the_summaries_of_any_trauma_threshold():
+    replicates = {
+        threshold: hphp.replication.replicate(
+            CONFIGURATION._replace(trauma_threshold=threshold),
+            repetitions=3,
+            seed=0,
+            processes=1,
+        )
+        for threshold in (1, 2, 4)
+    }
+    histograms = hphp.histograms.Histograms.from_replicates(replicates[1])
+    assert histograms.counts.shape == (3, 11, 1, 9)
+    proportions = hphp.histograms.proportion_traumatised(histograms, (1, 2, 4))
+    for index, threshold in enumerate((1, 2, 4)):
+        expected = [
+            [summary["prop_traumatised"] for summary in replicate.summaries]
+            for replicate in replicates[threshold]
+        ]
+        np.testing.assert_allclose(proportions[index], expected)
+    np.testing.assert_allclose(
+        hphp.histograms.mean_aces(histograms),
+        [
+            [summary["mean_aces"] for summary in replicate.summaries]
+            for replicate in replicates[1]
+        ],
+    )
+
+
+def test_age_bands_split_the_histogram_of_all_ages():
+    replicate = hphp.replication.run_replicate(CONFIGURATION, rep=0, seed=0)
+    banded = hphp.replication.run_replicate(
+        CONFIGURATION, rep=0, seed=0, age_bands=(0, 18, 65, 101)
+    )
+    assert banded.ace_histograms.shape == (11, 3, 9)
+    np.testing.assert_array_equal(
+        banded.ace_histograms.sum(axis=1), replicate.ace_histograms[:, 0]
+    )
+    histograms = hphp.histograms.Histograms.from_replicates([banded])
+    children = hphp.histograms.proportion_traumatised(histograms, [1], age_band=0)
+    assert children.shape == (1, 1, 11)
+    assert np.all((children >= 0) & (children <= 1))
+
+
+def test_histograms_are_written_with_the_output_and_padded_after_a_stop(tmp_path):
+    configuration = CONFIGURATION._replace(years=50, alpha=2.5, population_ceiling=400)
+    replicates = hphp.replication.replicate(
+        configuration, repetitions=2, seed=0, processes=1
+    )
+    assert all(
+        replicate.stop.reason == hphp.stopping.CEILING for replicate in replicates
+    )
+    hphp.output.write_csv(
+        tmp_path, configuration, repetitions=2, seed=0, replicates=replicates
+    )
+    histograms = hphp.histograms.Histograms.load(tmp_path / hphp.output.HISTOGRAMS)
+    np.testing.assert_array_equal(histograms.reps, [0, 1])
+    for replicate, counts in zip(replicates, histograms.counts):
+        years = len(replicate.summaries)
+        np.testing.assert_array_equal(counts[:years], replicate.ace_histograms)
+        assert np.isnan(counts[years:]).all()
+
+    table = hphp.histograms.threshold_table(histograms, trauma_thresholds=(1, 3))
+    assert len(table["prop_traumatised"]) == 2 * 2 * histograms.counts.shape[1]
+    first_years = (table["trauma_threshold"] == 1) & (table["rep"] == 0)
+    np.testing.assert_array_equal(
+        table["prop_traumatised"][first_years],
+        hphp.histograms.proportion_traumatised(histograms, [1])[0, 0],
+    )
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+import hphp.history
+import hphp.population
+import hphp.reducers
+import hphp.simulation
+import hphp.vectorised
+
+
+def _run():
+    initial_population = hphp.simulation.get_population(
+        number_of_individuals=300,
+        population_pyramid=hphp.simulation.uk_population_pyramid,
+        seed=0,
+    )
+    return hphp.simulation.simulate(
+        number_of_years=10,
+        initial_population=initial_population,
+        probability_of_male_birth=0.51,
+        alpha=1.3,
+        seed=0,
+        probability_of_heal=0.05,
+        probability_of_trauma=0.05,
+    )
+
+
+def test_history_turns_every_year_back_into_its_individuals():
+    populations = _run()
+    history = hphp.history.History.from_populations(populations)
+    assert len(history) == 11
+    assert history.result().shape == (11, *hphp.population.COUNTS_SHAPE)
+    for year, individuals in enumerate(populations):
+        assert sorted(history.individuals(year)) == sorted(individuals)
+
+
+def test_history_queries_match_the_reducers():
+    populations = _run()
+    history = hphp.history.History.from_populations(populations)
+    summary = hphp.reducers.Summary(trauma_threshold=2)
+    pyramid = hphp.reducers.Pyramid()
+    hphp.reducers.observe(populations, [summary, pyramid])
+    summaries = summary.result()
+    assert list(history.sizes()) == [s["population_size"] for s in summaries]
+    assert list(history.males()) == [s["males"] for s in summaries]
+    assert np.allclose(history.mean_aces(), [s["mean_aces"] for s in summaries])
+    assert np.allclose(history.mean_age(), [s["mean_age"] for s in summaries])
+    assert np.allclose(
+        history.proportion_traumatised(trauma_threshold=2),
+        [s["prop_traumatised"] for s in summaries],
+    )
+    assert np.array_equal(history.pyramids(), pyramid.result())
+
+
+def test_history_save_and_load_round_trip(tmp_path):
+    history = hphp.history.History.from_populations(_run())
+    path = str(tmp_path / "history.npz")
+    history.save(path)
+    loaded = hphp.history.History.load(path)
+    assert np.array_equal(loaded.result(), history.result())
+    assert loaded.individuals(3) == history.individuals(3)
+
+
+def test_empty_years_have_nan_means():
+    history = hphp.history.History.from_populations([[]])
+    assert history.sizes().tolist() == [0]
+    assert np.isnan(history.mean_aces()[0])
+    assert np.isnan(history.proportion_traumatised()[0])
+
+
+def test_weighted_years_cannot_be_turned_into_individuals():
+    history = hphp.history.History.from_populations(
+        hphp.vectorised.stream(
+            number_of_years=5,
+            initial_population=hphp.simulation.get_population_array(
+                number_of_individuals=300, seed=0
+            ),
+            probability_of_male_birth=0.51,
+            alpha=1.3,
+            seed=0,
+            max_population=100,
+        )
+    )
+    assert history.sizes()[-1] > 100
+    with pytest.raises(ValueError, match="weighted"):
+        history.individuals(5)
@@ -0,0 +1,105 @@
+import os
+
+import pandas as pd
+
+import hphp.jobqueue
+import hphp.output
+import hphp.replication
+import hphp.sweep
+
+CONFIGURATIONS = hphp.sweep.grid(
+    alpha_values=(1.1, 1.3),
+    heal_values=(0.05,),
+    trauma_values=(0.05,),
+    years=3,
+    initial_population_size=50,
+)
+
+
+def test_add_is_idempotent(tmp_path):
+    queue = hphp.jobqueue.JobQueue(str(tmp_path / "queue.db"))
+    assert queue.add(CONFIGURATIONS, repetitions=3) == 6
+    assert queue.add(CONFIGURATIONS, repetitions=3) == 0
+    assert queue.counts() == {"pending": 6, "running": 0, "done": 0, "failed": 0}
+
+
+def test_claim_is_exclusive_until_the_lease_expires(tmp_path):
+    queue = hphp.jobqueue.JobQueue(str(tmp_path / "queue.db"), lease_seconds=0)
+    queue.add(CONFIGURATIONS[:1], repetitions=1)
+    task = queue.claim("first")
+    assert task.configuration == CONFIGURATIONS[0]
+    assert task.attempts == 1
+
+    # The lease of 0 seconds has expired so another worker takes the task over
+    # and the first worker can no longer complete it.
+    stolen = queue.claim("second")
+    assert stolen.id == task.id
+    assert stolen.attempts == 2
+    replicate = hphp.replication.run_replicate(task.configuration, task.rep)
+    assert queue.complete(task, "first", replicate) is None
+    replicates = queue.complete(stolen, "second", replicate)
+    assert [r.summaries for r in replicates] == [replicate.summaries]
+    assert queue.claim("third") is None
+
+
+def test_complete_returns_the_replicates_once_every_rep_is_done(tmp_path):
+    queue = hphp.jobqueue.JobQueue(str(tmp_path / "queue.db"))
+    queue.add(CONFIGURATIONS[:1], repetitions=2)
+    first, second = queue.claim("worker"), queue.claim("worker")
+    replicate = hphp.replication.run_replicate(first.configuration, first.rep)
+    assert queue.complete(first, "worker", replicate) == []
+    assert len(queue.complete(second, "worker", replicate)) == 2
+
+
+def test_failed_tasks_are_retried_up_to_max_attempts(tmp_path):
+    queue = hphp.jobqueue.JobQueue(str(tmp_path / "queue.db"), max_attempts=2)
+    queue.add(CONFIGURATIONS[:1], repetitions=1)
+    queue.fail(queue.claim("worker"), "worker", error="first")
+    assert queue.counts()["pending"] == 1
+    queue.fail(queue.claim("worker"), "worker", error="second")
+    assert queue.counts()["failed"] == 1
+    assert queue.claim("worker") is None
+
+
+def test_work_writes_the_output_of_the_sweep(tmp_path):
+    path = str(tmp_path / "queue.db")
+    queue = hphp.jobqueue.JobQueue(path)
+    queue.add(CONFIGURATIONS, repetitions=2, seed=0, pyramid_years=(0, 3))
+    assert hphp.jobqueue.work(path, str(tmp_path / "queue")) == 4
+    assert queue.counts()["done"] == 4
+    assert len(list(queue.completed())) == 2
+
+    hphp.sweep.run(
+        configurations=CONFIGURATIONS,
+        repetitions=2,
+        output_dir=str(tmp_path / "sweep"),
+        seed=0,
+        pyramid_years=(0, 3),
+        processes=1,
+        progress=None,
+    )
+    for configuration in CONFIGURATIONS:
+        name = hphp.output.directory_name(configuration, repetitions=2)
+        for file in (hphp.output.MAIN, hphp.output.PYRAMIDS):
+            assert pd.read_csv(tmp_path / "queue" / name / file).equals(
+                pd.read_csv(tmp_path / "sweep" / name / file)
+            )
+
+
+def test_work_writes_completed_configurations_with_missing_results(tmp_path):
+    path = str(tmp_path / "queue.db")
+    queue = hphp.jobqueue.JobQueue(path)
+    queue.add(CONFIGURATIONS[:1], repetitions=1)
+    hphp.jobqueue.work(path, str(tmp_path / "first"))
+    assert hphp.jobqueue.work(path, str(tmp_path / "second")) == 0
+    name = hphp.output.directory_name(CONFIGURATIONS[0], repetitions=1)
+    assert hphp.output.is_complete(os.path.join(tmp_path, "second", name))
+
+
+def test_work_only_counts_the_completions_that_were_recorded(tmp_path, monkeypatch):
+    path = str(tmp_path / "queue.db")
+    hphp.jobqueue.JobQueue(path).add(CONFIGURATIONS[:1], repetitions=1)
+    monkeypatch.setattr(
+        hphp.jobqueue.JobQueue, "complete", lambda self, task, worker, replicate: None
+    )
+    assert hphp.jobqueue.work(path, str(tmp_path / "output")) == 0
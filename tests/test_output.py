@@ -0,0 +1,84 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import hphp.output
+import hphp.replication
+import hphp.stopping
+
+CONFIGURATION = hphp.replication.Configuration(
+    years=20,
+    initial_population_size=300,
+    alpha=2.5,
+    probability_of_heal=0.05,
+    probability_of_trauma=0.05,
+    population_ceiling=330,
+)
+
+
+def _write_both(tmp_path):
+    replicates = hphp.replication.replicate(
+        CONFIGURATION, repetitions=3, seed=0, pyramid_years=(0, 5), processes=1
+    )
+    assert any(replicate.stop is not None for replicate in replicates)
+    for columnar, name in ((False, "csv"), (True, "columns")):
+        hphp.output.write(
+            path=os.path.join(tmp_path, name),
+            configuration=CONFIGURATION,
+            repetitions=3,
+            seed=0,
+            replicates=replicates,
+            columnar=columnar,
+        )
+    return os.path.join(tmp_path, "csv"), os.path.join(tmp_path, "columns")
+
+
+def test_columns_hold_the_csv_output(tmp_path):
+    csv_path, columns_path = _write_both(tmp_path)
+    assert hphp.output.is_complete(columns_path, columnar=True)
+    assert not hphp.output.is_complete(columns_path)
+    assert not hphp.output.is_complete(csv_path, columnar=True)
+
+    columns = hphp.output.read_columns(columns_path)
+    assert isinstance(columns.main["mean_aces"], np.memmap)
+    assert columns.parameters == hphp.output.input_parameters(
+        CONFIGURATION, repetitions=3, seed=0
+    )
+
+    main = pd.read_csv(
+        os.path.join(csv_path, hphp.output.MAIN), float_precision="round_trip"
+    )
+    table = pd.DataFrame(columns.table())
+    assert list(table.columns) == list(main.columns)
+    stopped = table["stop_year"] != hphp.output.NO_STOP_YEAR
+    table["stop_year"] = table["stop_year"].where(stopped)
+    table["stop_reason"] = table["stop_reason"].where(stopped)
+    pd.testing.assert_frame_equal(table, main, check_dtype=False)
+
+    pyramids = pd.read_csv(os.path.join(csv_path, hphp.output.PYRAMIDS))
+    pd.testing.assert_frame_equal(
+        pd.DataFrame(columns.pyramid_table()), pyramids, check_dtype=False
+    )
+
+
+def test_columns_are_read_into_memory_without_mmap_mode(tmp_path):
+    _, columns_path = _write_both(tmp_path)
+    columns = hphp.output.read_columns(columns_path, mmap_mode=None)
+    assert not isinstance(columns.main["rep"], np.memmap)
+    assert columns.main["stop_reason"].dtype.kind == "U"
+    assert set(columns.main["stop_reason"]) <= {
+        hphp.output.NO_STOP_REASON,
+        hphp.stopping.CEILING,
+    }
+    assert columns.pyramids["pyramids"].shape == (6, 2, 101)
+
+
+def test_columns_of_no_replicates_are_empty(tmp_path):
+    hphp.output.write_columns(
+        tmp_path, CONFIGURATION, repetitions=0, seed=0, replicates=[]
+    )
+    columns = hphp.output.read_columns(tmp_path)
+    assert all(len(values) == 0 for values in columns.table().values())
+    assert columns.main["rep"].dtype == np.int64
+    assert columns.pyramids["pyramids"].shape == (0, 2, 101)
@@ -0,0 +1,74 @@
+import numpy as np
+
+import hphp.cohort
+import hphp.population
+import hphp.projection
+import hphp.simulation
+
+
+def test_projection_matrix_shape_and_non_negative():
+    matrix = hphp.projection.projection_matrix(probability_of_male_birth=0.51)
+    number_of_cells = np.prod(hphp.population.COUNTS_SHAPE)
+    assert matrix.shape == (number_of_cells, number_of_cells)
+    assert matrix.min() >= 0
+
+
+def test_project_without_births_gives_expected_survivors():
+    counts = np.zeros(hphp.population.COUNTS_SHAPE)
+    counts[0, 25, 0] = 1_000
+    populations = hphp.projection.project(
+        number_of_years=1,
+        initial_population=counts,
+        probability_of_male_birth=0.51,
+    )
+    assert len(populations) == 2
+    assert np.isclose(populations[-1].sum(), 1_000 * (1 - 0.00312))
+    assert np.isclose(populations[-1][0, 26, 0], 1_000 * (1 - 0.00312))
+
+
+def test_project_is_the_mean_of_cohort_simulate():
+    initial_population = hphp.simulation.get_population(
+        number_of_individuals=1_000,
+        population_pyramid=hphp.simulation.uk_population_pyramid,
+        seed=0,
+    )
+    kwargs = dict(
+        number_of_years=20,
+        initial_population=initial_population,
+        probability_of_male_birth=0.51,
+        alpha=1.5,
+        probability_of_heal=0.05,
+        probability_of_trauma=0.1,
+    )
+    expected = hphp.projection.project(**kwargs)[-1]
+    simulated = np.mean(
+        [hphp.cohort.simulate(seed=seed, **kwargs)[-1] for seed in range(100)], axis=0
+    )
+    assert np.isclose(expected.sum(), simulated.sum(), rtol=0.01)
+    assert np.allclose(
+        expected.sum(axis=(0, 1)) / expected.sum(),
+        simulated.sum(axis=(0, 1)) / simulated.sum(),
+        atol=0.005,
+    )
+
+
+def test_dominant_eigenpair_is_the_long_run_growth():
+    kwargs = dict(probability_of_male_birth=0.51, alpha=1.5, probability_of_heal=0.05)
+    growth_rate, structure = hphp.projection.dominant_eigenpair(**kwargs)
+    assert structure.shape == hphp.population.COUNTS_SHAPE
+    assert np.isclose(structure.sum(), 1)
+    populations = hphp.projection.project(
+        number_of_years=400,
+        initial_population=hphp.population.to_counts(
+            hphp.population.from_individuals(
+                [hphp.simulation.Individual(sex="Female", age=20, number_of_aces=1)]
+            )
+        ),
+        **kwargs,
+    )
+    assert np.isclose(growth_rate, populations[-1].sum() / populations[-2].sum())
+    assert np.allclose(
+        hphp.projection.stable_ace_distribution(**kwargs),
+        populations[-1].sum(axis=(0, 1)) / populations[-1].sum(),
+        atol=1e-6,
+    )
@@ -0,0 +1,74 @@
+import itertools
+
+import numpy as np
+
+import hphp.individual
+import hphp.rates
+
+
+def test_death_probability_matches_life_tables():
+    assert hphp.rates.death_probability(age=25, sex="Male") == 0.00312
+    assert hphp.rates.death_probability(age=25, sex="Female") == 0.00214
+    assert hphp.rates.death_probability(age=100, sex="Female") == 1
+    assert hphp.rates.death_probability(age=120, sex="Male") == 1
+
+
+def test_probability_of_death_matches_death_probability():
+    ages = np.arange(110)
+    for sex in hphp.individual.SEXES:
+        sexes = np.full(len(ages), hphp.individual.SEXES.index(sex))
+        assert list(hphp.rates.probability_of_death(age=ages, sex=sexes)) == [
+            hphp.rates.death_probability(age=int(age), sex=sex) for age in ages
+        ]
+
+
+def test_birth_probability_with_tempo_and_alpha():
+    assert hphp.rates.birth_probability(age=25) == 0.134492
+    assert hphp.rates.birth_probability(age=14) == 0
+    assert hphp.rates.birth_probability(age=28, number_of_aces=1) == 0.134492
+    assert hphp.rates.birth_probability(age=28, number_of_aces=1, alpha=1.5) == min(
+        1, 1.5 * 0.134492
+    )
+    assert hphp.rates.birth_probability(age=25, alpha=1.5) == 0.134492
+
+
+def test_probability_of_birth_matches_birth_probability():
+    ages, number_of_aces = np.indices((110, 9)).reshape(2, -1)
+    for alpha, tempo_years_per_ace in itertools.product((1.0, 1.37, 12), (0, 3)):
+        assert list(
+            hphp.rates.probability_of_birth(
+                age=ages,
+                number_of_aces=number_of_aces,
+                alpha=alpha,
+                tempo_years_per_ace=tempo_years_per_ace,
+            )
+        ) == [
+            hphp.rates.birth_probability(
+                age=int(age),
+                number_of_aces=int(aces),
+                alpha=alpha,
+                tempo_years_per_ace=tempo_years_per_ace,
+            )
+            for age, aces in zip(ages, number_of_aces)
+        ]
+
+
+def test_fertility_surface_is_computed_once_and_read_only():
+    surface = hphp.rates.fertility_surface(alpha=1.2, tempo_years_per_ace=3)
+    assert surface is hphp.rates.fertility_surface(alpha=1.2, tempo_years_per_ace=3)
+    assert surface.shape == (hphp.rates.NUMBER_OF_AGES, 9)
+    assert not surface.flags.writeable
+
+
+def test_intergenerational_ace_distribution_rows_sum_to_one():
+    distribution = hphp.rates.INTERGENERATIONAL_ACE_DISTRIBUTION
+    assert distribution.shape == (9, 9)
+    assert np.allclose(distribution.sum(axis=1), 1)
+    assert np.array_equal(distribution[2], distribution[3])
+    assert np.array_equal(distribution[4], distribution[8])
+
+
+def test_death_probability_uses_the_female_table_for_any_other_sex():
+    assert hphp.rates.death_probability(
+        age=25, sex="Unknown"
+    ) == hphp.rates.death_probability(age=25, sex="Female")
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+import hphp.cohort
+import hphp.population
+import hphp.reducers
+import hphp.simulation
+import hphp.vectorised
+
+
+def test_reducers_on_individuals():
+    individuals = [
+        hphp.simulation.Individual(sex="Male", age=10, number_of_aces=0),
+        hphp.simulation.Individual(sex="Female", age=20, number_of_aces=1),
+        hphp.simulation.Individual(sex="Female", age=30, number_of_aces=3),
+        hphp.simulation.Individual(sex="Male", age=40, number_of_aces=0),
+    ]
+    reducers = [
+        hphp.reducers.PopulationSize(),
+        hphp.reducers.SexCounts(),
+        hphp.reducers.MeanAge(),
+        hphp.reducers.MeanAces(),
+        hphp.reducers.ProportionTraumatised(trauma_threshold=2),
+    ]
+    hphp.reducers.observe([individuals, []], reducers)
+    size, sexes, mean_age, mean_aces, proportion = (r.result() for r in reducers)
+    assert list(size) == [4, 0]
+    assert sexes.tolist() == [[2, 2], [0, 0]]
+    assert mean_age[0] == 25 and np.isnan(mean_age[1])
+    assert mean_aces[0] == 1 and np.isnan(mean_aces[1])
+    assert proportion[0] == 0.25 and np.isnan(proportion[1])
+
+
+def test_a_reducer_must_implement_reduce():
+    class Incomplete(hphp.reducers.Reducer):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_summary():
+    individuals = [
+        hphp.simulation.Individual(sex="Male", age=10, number_of_aces=0),
+        hphp.simulation.Individual(sex="Female", age=20, number_of_aces=1),
+        hphp.simulation.Individual(sex="Female", age=30, number_of_aces=3),
+    ]
+    summary = hphp.reducers.Summary(trauma_threshold=1)
+    hphp.reducers.observe([individuals, []], [summary])
+    first, second = summary.result()
+    assert first == {
+        "population_size": 3,
+        "males": 1,
+        "females": 2,
+        "mean_age": 20.0,
+        "mean_aces": 4 / 3,
+        "prop_traumatised": 2 / 3,
+        "mean_age_traumatised": 25.0,
+        "mean_age_not_traumatised": 10.0,
+    }
+    assert second["population_size"] == 0
+    assert np.isnan(second["mean_age_traumatised"])
+
+
+def test_pyramid_records_given_years():
+    initial_population = hphp.simulation.get_population(
+        number_of_individuals=500,
+        population_pyramid=hphp.simulation.uk_population_pyramid,
+        seed=0,
+    )
+    pyramid = hphp.reducers.Pyramid(years=[0, 5, 10])
+    size = hphp.reducers.PopulationSize()
+    hphp.reducers.observe(
+        hphp.vectorised.stream(
+            number_of_years=10,
+            initial_population=initial_population,
+            probability_of_male_birth=0.51,
+            seed=0,
+        ),
+        [pyramid, size],
+    )
+    assert pyramid.recorded_years == [0, 5, 10]
+    assert pyramid.result().shape == (3, 2, 101)
+    assert list(pyramid.result().sum(axis=(1, 2))) == list(size.result()[[0, 5, 10]])
+    ages = [individual.age for individual in initial_population]
+    assert pyramid.result()[0].sum(axis=0)[41] == ages.count(41)
+
+
+def test_observe_the_same_run_on_every_engine_representation():
+    populations = hphp.cohort.simulate(
+        number_of_years=5,
+        initial_population=hphp.simulation.get_population(
+            number_of_individuals=300,
+            population_pyramid=hphp.simulation.uk_population_pyramid,
+            seed=0,
+        ),
+        probability_of_male_birth=0.51,
+        seed=0,
+    )
+    from_counts = hphp.reducers.Summary()
+    from_individuals = hphp.reducers.Summary()
+    hphp.reducers.observe(populations, [from_counts])
+    hphp.reducers.observe(
+        (
+            hphp.population.to_individuals(hphp.population.from_counts(counts))
+            for counts in populations
+        ),
+        [from_individuals],
+    )
+    assert from_counts.result() == from_individuals.result()
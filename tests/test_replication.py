@@ -0,0 +1,98 @@
+import numpy as np
+
+import hphp.replication
+
+CONFIGURATION = hphp.replication.Configuration(
+    years=5,
+    initial_population_size=200,
+    alpha=1.3,
+    probability_of_heal=0.05,
+    probability_of_trauma=0.05,
+)
+
+
+def test_replicate_in_processes_gives_the_serial_output_in_rep_order():
+    kwargs = dict(
+        configuration=CONFIGURATION, repetitions=4, seed=0, pyramid_years=(0, 5)
+    )
+    serial = hphp.replication.replicate(processes=1, **kwargs)
+    parallel = hphp.replication.replicate(processes=2, **kwargs)
+    assert [replicate.rep for replicate in parallel] == [0, 1, 2, 3]
+    for a, b in zip(serial, parallel, strict=True):
+        assert a.summaries == b.summaries
+        assert a.pyramid_years == b.pyramid_years == [0, 5]
+        assert np.array_equal(a.pyramids, b.pyramids)
+    assert serial[0].summaries != serial[1].summaries
+
+
+def test_run_replicate_is_reproducible_and_has_a_summary_per_year():
+    first = hphp.replication.run_replicate(CONFIGURATION, rep=2, seed=3)
+    second = hphp.replication.run_replicate(CONFIGURATION, rep=2, seed=3)
+    assert first.summaries == second.summaries
+    assert len(first.summaries) == CONFIGURATION.years + 1
+    assert first.summaries[0]["population_size"] == 200
+    assert first.pyramid_years == []
+
+
+def test_trauma_threshold_does_not_change_the_populations():
+    first = hphp.replication.run_replicate(CONFIGURATION, rep=0, seed=0)
+    second = hphp.replication.run_replicate(
+        CONFIGURATION._replace(trauma_threshold=3), rep=0, seed=0
+    )
+    assert [s["mean_aces"] for s in first.summaries] == [
+        s["mean_aces"] for s in second.summaries
+    ]
+    assert first.summaries != second.summaries
+
+
+def test_run_replicate_with_max_population_reports_the_implied_size():
+    configuration = CONFIGURATION._replace(max_population=50)
+    replicate = hphp.replication.run_replicate(configuration, rep=0, seed=0)
+    assert replicate.summaries[0]["population_size"] == 200
+    assert replicate.summaries[-1]["population_size"] > 50
+    assert hphp.replication.stream_configuration(
+        configuration
+    ) != hphp.replication.stream_configuration(CONFIGURATION)
+
+
+def test_common_random_numbers_reduce_the_variance_of_differences():
+    def final_mean_aces(common_random_numbers, rep, **parameters):
+        configuration = CONFIGURATION._replace(
+            years=20,
+            initial_population_size=500,
+            common_random_numbers=common_random_numbers,
+            **parameters,
+        )
+        replicate = hphp.replication.run_replicate(configuration, rep=rep, seed=0)
+        return replicate.summaries[-1]["mean_aces"]
+
+    variances = {}
+    for common_random_numbers in (False, True):
+        differences = [
+            final_mean_aces(
+                common_random_numbers, rep, alpha=1.25, probability_of_heal=0.06
+            )
+            - final_mean_aces(
+                common_random_numbers, rep, alpha=1.2, probability_of_heal=0.05
+            )
+            for rep in range(10)
+        ]
+        variances[common_random_numbers] = np.var(differences)
+    assert variances[True] < variances[False] / 2
+
+
+def test_antithetic_pairs_are_negatively_correlated():
+    configuration = CONFIGURATION._replace(
+        years=1, initial_population_size=200, antithetic=True
+    )
+    outcomes = np.array(
+        [
+            hphp.replication.run_replicate(configuration, rep=rep, seed=0).summaries[
+                -1
+            ]["mean_aces"]
+            for rep in range(60)
+        ]
+    )
+    pairs = outcomes.reshape(30, 2)
+    assert np.corrcoef(pairs.T)[0, 1] < -0.3
+    assert np.var(pairs.mean(axis=1)) < np.var(outcomes) / 3
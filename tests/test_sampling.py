@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+import hphp.individual
+import hphp.rates
+import hphp.sampling
+
+
+def test_sample_has_the_given_distribution():
+    probabilities = np.array([0.5, 0.1, 0.0, 0.3, 0.1])
+    sampler = hphp.sampling.CategoricalSampler(probabilities)
+    rng = np.random.default_rng(0)
+    samples = sampler.sample(rng=rng, size=100_000)
+    frequencies = np.bincount(samples, minlength=5) / len(samples)
+    assert np.allclose(frequencies, probabilities, atol=0.005)
+    assert frequencies[2] == 0
+
+
+def test_sample_uses_the_distribution_of_each_row():
+    sampler = hphp.sampling.ACE_SAMPLER
+    rng = np.random.default_rng(1)
+    for sex in (hphp.individual.MALE, hphp.individual.FEMALE):
+        samples = sampler.sample(rng=rng, rows=np.full(100_000, sex))
+        frequencies = np.bincount(samples, minlength=9) / len(samples)
+        assert np.allclose(frequencies, hphp.rates.ACE_DISTRIBUTION[sex], atol=0.005)
+
+
+def test_sample_requires_rows_with_more_than_one_distribution():
+    with pytest.raises(ValueError):
+        hphp.sampling.ACE_SAMPLER.sample(rng=np.random.default_rng(0), size=10)
+
+
+def test_quantile_is_monotone_and_inverts_the_cdf():
+    sampler = hphp.sampling.CategoricalSampler([0.2, 0.3, 0.5])
+    uniforms = np.linspace(0, 1, 10, endpoint=False)
+    categories = sampler.quantile(uniforms)
+    assert list(categories) == [0, 0, 1, 1, 1, 2, 2, 2, 2, 2]
+    assert np.all(np.diff(categories) >= 0)
+
+
+def test_uk_population_sampler_matches_the_pyramid():
+    rng = np.random.default_rng(2)
+    cells = hphp.sampling.UK_POPULATION_SAMPLER.sample(rng=rng, size=200_000)
+    sex, age = np.unravel_index(cells, hphp.rates.UK_POPULATION_DISTRIBUTION.shape)
+    assert np.isclose(
+        np.mean(sex == hphp.individual.MALE),
+        hphp.rates.UK_POPULATION_DISTRIBUTION[hphp.individual.MALE].sum(),
+        atol=0.005,
+    )
+    assert np.isclose(
+        age.mean(),
+        (hphp.rates.UK_POPULATION_DISTRIBUTION.sum(axis=0) * np.arange(101)).sum(),
+        atol=0.2,
+    )
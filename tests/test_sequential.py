@@ -0,0 +1,84 @@
+import numpy as np
+import scipy.stats
+
+import hphp.replication
+import hphp.sequential
+
+CONFIGURATION = hphp.replication.Configuration(
+    years=5,
+    initial_population_size=100,
+    alpha=1.3,
+    probability_of_heal=0.05,
+    probability_of_trauma=0.05,
+)
+
+
+def _replicate(values):
+    return hphp.replication.Replicate(
+        rep=0,
+        summaries=[{"mean_aces": value} for value in values],
+        pyramid_years=[],
+        pyramids=np.zeros((0, 2, 101)),
+    )
+
+
+def test_half_width_is_the_student_t_interval():
+    values = np.array([1.0, 2.0, 4.0, np.nan])
+    expected = scipy.stats.t.ppf(0.975, df=2) * np.std([1, 2, 4], ddof=1) / np.sqrt(3)
+    assert np.isclose(hphp.sequential.half_width(values), expected)
+    assert hphp.sequential.half_width(np.array([1.0])) == np.inf
+
+
+def test_outcomes_are_means_after_the_warm_up():
+    precision = hphp.sequential.Precision(warm_up=2)
+    replicates = [_replicate([10, 10, 1, 3]), _replicate([0, 0, 2, np.nan])]
+    assert list(precision.outcomes(replicates)) == [2, 2]
+
+
+def test_additional_repetitions_respects_the_bounds_and_the_tolerance():
+    precision = hphp.sequential.Precision(
+        tolerance=0.1, min_repetitions=3, max_repetitions=7, batch_size=3
+    )
+    spread = [_replicate([value]) for value in (0, 1, 2, 3, 4, 5)]
+    settled = [_replicate([1]) for _ in range(3)]
+    assert precision.additional_repetitions([]) == 3
+    assert precision.additional_repetitions(spread[:1]) == 2
+    assert precision.additional_repetitions(spread[:3]) == 3
+    assert precision.additional_repetitions(spread) == 1
+    assert precision.additional_repetitions(spread + spread[:1]) == 0
+    assert precision.additional_repetitions(settled) == 0
+
+    paired = precision._replace(paired=True)
+    assert paired.additional_repetitions([]) == 4
+    assert paired.additional_repetitions(spread[:4]) == 4
+    assert paired.additional_repetitions(spread) == 2
+
+
+def test_replicate_until_runs_the_first_reps_whatever_the_processes():
+    precision = hphp.sequential.Precision(
+        tolerance=0, min_repetitions=2, max_repetitions=5, batch_size=2
+    )
+    serial = hphp.sequential.replicate_until(
+        CONFIGURATION, precision, seed=0, processes=1
+    )
+    parallel = hphp.sequential.replicate_until(
+        CONFIGURATION, precision, seed=0, processes=2
+    )
+    assert [replicate.rep for replicate in serial] == [0, 1, 2, 3, 4]
+    fixed = hphp.replication.replicate(CONFIGURATION, 5, seed=0, processes=1)
+    for a, b, c in zip(serial, parallel, fixed, strict=True):
+        assert a.summaries == b.summaries == c.summaries
+
+    loose = precision._replace(tolerance=np.inf)
+    assert len(hphp.sequential.replicate_until(CONFIGURATION, loose, processes=1)) == 2
+
+
+def test_paired_estimate_uses_the_means_of_complete_pairs():
+    values = np.array([1.0, 3.0, 2.0, 2.0, 5.0])
+    paired = hphp.sequential.paired_estimate(values)
+    assert paired.mean == 2
+    assert paired.samples == 2
+    assert paired.half_width == 0
+    usual = hphp.sequential.estimate(values)
+    assert usual.mean == 2.6
+    assert usual.samples == 5
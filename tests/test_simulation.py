@@ -1,6 +1,8 @@
 import numpy as np
 import hphp.simulation
 import hphp.birth_death
+import hphp.population
+import hphp.rates
 
 
 def test_number_of_births_in_given_year_for_ages_out_of_data_set():
@@ -482,3 +484,156 @@ def test_get_initial_population():
         assert individual.sex in ("Male", "Female")
         assert 0 <= individual.age <= 100
         assert 0 <= individual.number_of_aces <= 8
+
+
+def test_stream_yields_the_populations_of_simulate():
+    initial_population = hphp.simulation.get_population(
+        number_of_individuals=200,
+        population_pyramid=hphp.simulation.uk_population_pyramid,
+        seed=0,
+    )
+    kwargs = dict(
+        number_of_years=10,
+        initial_population=initial_population,
+        probability_of_male_birth=0.51,
+        alpha=1.3,
+        seed=2,
+        probability_of_heal=0.05,
+        probability_of_trauma=0.05,
+    )
+    stream = hphp.simulation.stream(**kwargs)
+    assert not isinstance(stream, list)
+    assert list(stream) == hphp.simulation.simulate(**kwargs)
+
+
+def test_death_array_for_ages_outside_range_gives_a_death():
+    rng = np.random.default_rng(0)
+    ages = np.repeat(np.arange(100, 105), 1_000)
+    for sex in (0, 1):
+        sexes = np.full(len(ages), sex, dtype=np.int8)
+        assert hphp.birth_death.death_array(age=ages, sex=sexes, rng=rng).all()
+
+
+def test_death_array_expected_number_of_deaths_for_50_year_olds():
+    rng = np.random.default_rng(0)
+    ages = np.full(1_000_000, 50)
+    for expected_value, sex in zip((9.92, 6.22), (0, 1)):
+        sexes = np.full(len(ages), sex, dtype=np.int8)
+        deaths = hphp.birth_death.death_array(age=ages, sex=sexes, rng=rng)
+        assert expected_value - 1 <= deaths.sum() / 1_000 <= expected_value + 1
+
+
+def test_birth_array_expected_number_of_births():
+    rng = np.random.default_rng(0)
+    ages = np.full(1_000_000, 25)
+    for number_of_aces, alpha, expected_value in (
+        (0, 1.0, 134.492),
+        (1, 1.0, 121.126),
+        (1, 1.5, 1.5 * 121.126),
+        (3, 1.5, 1.5 * 25.16),
+        (4, 1.5, 0),
+    ):
+        births = hphp.birth_death.birth_array(
+            age=ages,
+            number_of_aces=np.full(len(ages), number_of_aces),
+            rng=rng,
+            alpha=alpha,
+        )
+        assert expected_value - 1 <= births.sum() / 1_000 <= expected_value + 1
+    for age in (*range(15), *range(50, 100)):
+        assert not hphp.birth_death.birth_array(
+            age=np.full(1_000, age), number_of_aces=np.zeros(1_000, dtype=int), rng=rng
+        ).any()
+
+
+def test_sample_number_of_aces_array():
+    rng = np.random.default_rng(0)
+    for sex, expected_mean in ((0, 1.218), (1, 1.4829)):
+        number_of_aces = hphp.birth_death.sample_number_of_aces_array(
+            sex=np.full(100_000, sex, dtype=np.int8), rng=rng
+        )
+        assert number_of_aces.min() == 0
+        assert number_of_aces.max() == 8
+        assert np.isclose(number_of_aces.mean(), expected_mean, atol=0.02)
+
+
+def test_sample_intergenerational_number_of_aces_array():
+    rng = np.random.default_rng(0)
+    distribution = hphp.rates.INTERGENERATIONAL_ACE_DISTRIBUTION
+    for number_of_maternal_aces in range(9):
+        expected_mean = (distribution[number_of_maternal_aces] * np.arange(9)).sum()
+        number_of_aces = hphp.birth_death.sample_intergenerational_number_of_aces_array(
+            number_of_maternal_aces=np.full(100_000, number_of_maternal_aces), rng=rng
+        )
+        assert np.isclose(number_of_aces.mean(), expected_mean, atol=0.02)
+
+
+def test_adjust_aces_array():
+    rng = np.random.default_rng(0)
+    ages = rng.integers(0, 100, size=10_000)
+    number_of_aces = rng.integers(0, 9, size=10_000)
+    delta = hphp.birth_death.adjust_aces_array(
+        age=ages,
+        number_of_aces=number_of_aces,
+        probability_of_heal=0,
+        probability_of_trauma=0,
+        rng=rng,
+    )
+    assert not delta.any()
+    delta = hphp.birth_death.adjust_aces_array(
+        age=ages,
+        number_of_aces=number_of_aces,
+        probability_of_heal=0.5,
+        probability_of_trauma=0.5,
+        rng=rng,
+    )
+    assert set(delta[ages >= 18]) == {-1, 0}
+    assert set(delta[ages < 18]) == {-1, 0, 1}
+    assert 0 <= (number_of_aces + delta).min() <= (number_of_aces + delta).max() <= 8
+
+
+def test_get_population_array_has_the_distribution_of_get_population():
+    population = hphp.simulation.get_population_array(
+        number_of_individuals=100_000, seed=0
+    )
+    assert len(population.age) == 100_000
+    assert 0 <= population.age.min() and population.age.max() <= 100
+    assert np.isclose(population.age.mean(), 41.1292, atol=0.3)
+    probability_of_sex = hphp.rates.UK_POPULATION_DISTRIBUTION.sum(axis=1)
+    assert np.isclose(np.mean(population.sex == 0), probability_of_sex[0], atol=0.005)
+    expected_mean_aces = probability_of_sex @ hphp.rates.ACE_DISTRIBUTION @ np.arange(9)
+    assert np.isclose(population.number_of_aces.mean(), expected_mean_aces, atol=0.02)
+
+
+def test_get_population_array_with_counts():
+    population = hphp.simulation.get_population_array(
+        number_of_individuals=1_000, seed=1
+    )
+    counts = hphp.simulation.get_population_array(
+        number_of_individuals=1_000, seed=1, counts=True
+    )
+    assert counts.shape == hphp.population.COUNTS_SHAPE
+    assert counts.sum() == 1_000
+    assert np.array_equal(counts, hphp.population.to_counts(population))
+
+
+def test_get_population_from_uniforms_is_monotone():
+    uniforms = np.array([[0.0, 1 - 1e-12], [0.0, 1 - 1e-12], [0.0, 1 - 1e-12]])
+    population = hphp.simulation.get_population_from_uniforms(uniforms)
+    assert list(population.sex) == [0, 1]
+    assert list(population.age) == [0, 100]
+    assert list(population.number_of_aces) == [0, 8]
+
+
+def test_get_population_from_uniforms_follows_the_uk_population_pyramid():
+    uniforms = np.random.default_rng(0).random((3, 100_000))
+    for population in (
+        hphp.simulation.get_population_from_uniforms(uniforms),
+        hphp.simulation.get_population_from_uniforms(1 - uniforms),
+    ):
+        counts = hphp.population.to_counts(population).sum(axis=2)
+        assert np.allclose(
+            counts / counts.sum(),
+            hphp.rates.UK_POPULATION_DISTRIBUTION,
+            atol=0.003,
+        )
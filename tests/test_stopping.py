@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import hphp.output
+import hphp.population
+import hphp.reducers
+import hphp.replication
+import hphp.stopping
+
+
+def _counts(size):
+    counts = np.zeros(hphp.population.COUNTS_SHAPE, dtype=np.int64)
+    counts[0, 20, 1] = size
+    return counts
+
+
+def test_observe_stops_at_the_first_rule_met_and_simulates_no_further():
+    simulated = []
+
+    def populations():
+        for size in (10, 5, 0, 0, 0):
+            simulated.append(size)
+            yield _counts(size)
+
+    size = hphp.reducers.PopulationSize()
+    stop = hphp.stopping.observe(
+        populations(),
+        [size],
+        rules=[hphp.stopping.Ceiling(100), hphp.stopping.Extinction()],
+    )
+    assert stop.year == 2
+    assert stop.reason == hphp.stopping.EXTINCTION
+    assert simulated == [10, 5, 0]
+    assert list(size.result()) == [10, 5, 0]
+
+    hphp.stopping.carry_forward([size], stop, number_of_years=2)
+    assert list(size.result()) == [10, 5, 0, 0, 0]
+
+
+def test_observe_returns_none_when_no_rule_is_met():
+    stop = hphp.stopping.observe(
+        (_counts(size) for size in (10, 20)),
+        [],
+        rules=[hphp.stopping.Ceiling(20), hphp.stopping.Extinction()],
+    )
+    assert stop is None
+
+
+def test_a_stopping_rule_must_implement_update():
+    class Incomplete(hphp.stopping.StoppingRule):
+        reason = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_stationarity_needs_a_full_window_of_settled_metrics():
+    rule = hphp.stopping.Stationarity(metrics=("mean_aces",), window=4)
+    assert [rule.update(_counts(10)) for _ in range(4)] == [False] * 3 + [True]
+
+    rule = hphp.stopping.Stationarity(metrics=("mean_aces",), window=4)
+    assert not any(rule.update(_counts(0)) for _ in range(10))
+
+
+def test_run_replicate_carries_an_extinct_run_forward_exactly():
+    configuration = hphp.replication.Configuration(
+        years=120, initial_population_size=20, alpha=0
+    )
+    replicate = hphp.replication.run_replicate(configuration, rep=0, seed=0)
+    assert replicate.stop.reason == hphp.stopping.EXTINCTION
+    assert replicate.stop.year < 120
+    assert len(replicate.summaries) == 121
+    assert all(
+        summary["population_size"] == 0
+        for summary in replicate.summaries[replicate.stop.year :]
+    )
+
+
+def test_run_replicate_stops_at_the_ceiling():
+    configuration = hphp.replication.Configuration(
+        years=50, initial_population_size=100, alpha=2.5, population_ceiling=120
+    )
+    replicate = hphp.replication.run_replicate(configuration, rep=0, seed=0)
+    assert replicate.stop.reason == hphp.stopping.CEILING
+    assert len(replicate.summaries) == replicate.stop.year + 1 < 51
+    assert replicate.summaries[-1]["population_size"] > 120
+
+
+def test_years_carried_forward_after_stationarity_are_marked_in_main(tmp_path):
+    configuration = hphp.replication.Configuration(
+        years=30,
+        initial_population_size=300,
+        stationarity_window=10,
+        stationarity_tolerance=0.05,
+    )
+    replicate = hphp.replication.run_replicate(configuration, rep=0, seed=0)
+    assert replicate.stop.reason == hphp.stopping.STATIONARITY
+    hphp.output.write_csv(
+        tmp_path, configuration, repetitions=1, seed=0, replicates=[replicate]
+    )
+    main = pd.read_csv(tmp_path / hphp.output.MAIN)
+    assert len(main) == 31
+    assert list(main["carried_forward"]) == [
+        year > replicate.stop.year for year in range(31)
+    ]
@@ -0,0 +1,103 @@
+import numpy as np
+
+import hphp.simulation
+import hphp.streams
+
+
+def test_generators_are_reproducible():
+    first = hphp.streams.generators(seed=0, configuration=(1.1, 0.05), rep=3)
+    second = hphp.streams.generators(seed=0, configuration=(1.1, 0.05), rep=3)
+    for a, b in zip(first, second, strict=True):
+        assert np.array_equal(a.random(10), b.random(10))
+
+
+def test_generators_differ_by_configuration_rep_and_use():
+    draws = [
+        generator.random(5)
+        for configuration, rep in (((1.1, 0.05), 0), ((1.1, 0.05), 1), ((1.2, 0.05), 0))
+        for generator in hphp.streams.generators(
+            seed=0, configuration=configuration, rep=rep
+        )
+    ]
+    assert len(draws) == 3 * hphp.streams.NUMBER_OF_STREAMS
+    assert len({tuple(draw) for draw in draws}) == len(draws)
+
+
+def test_configuration_key_is_the_same_for_numpy_values():
+    assert hphp.streams.configuration_key(
+        (np.float64(1.1), np.int64(3))
+    ) == hphp.streams.configuration_key((1.1, 3))
+
+
+def test_configuration_key_is_the_same_for_equal_numbers():
+    assert hphp.streams.configuration_key(
+        (1, np.float64(0.05))
+    ) == hphp.streams.configuration_key((1.0, 0.05))
+    assert hphp.streams.configuration_key((1,)) != hphp.streams.configuration_key(
+        (True,)
+    )
+
+
+def test_simulate_with_generators_does_not_use_the_global_state():
+    np.random.seed(0)
+    expected = np.random.random()
+    np.random.seed(0)
+    population_rng, dynamics_rng = hphp.streams.generators(seed=1)
+    initial_population = hphp.simulation.get_population(
+        number_of_individuals=100,
+        population_pyramid=hphp.simulation.uk_population_pyramid,
+        seed=population_rng,
+    )
+    populations = hphp.simulation.simulate(
+        number_of_years=5,
+        initial_population=initial_population,
+        probability_of_male_birth=0.51,
+        alpha=1.3,
+        seed=dynamics_rng,
+        probability_of_heal=0.05,
+        probability_of_trauma=0.05,
+    )
+    assert np.random.random() == expected
+
+    population_rng, dynamics_rng = hphp.streams.generators(seed=1)
+    assert initial_population == hphp.simulation.get_population(
+        number_of_individuals=100,
+        population_pyramid=hphp.simulation.uk_population_pyramid,
+        seed=population_rng,
+    )
+    assert populations == hphp.simulation.simulate(
+        number_of_years=5,
+        initial_population=initial_population,
+        probability_of_male_birth=0.51,
+        alpha=1.3,
+        seed=dynamics_rng,
+        probability_of_heal=0.05,
+        probability_of_trauma=0.05,
+    )
+
+
+def test_common_generators_do_not_depend_on_the_configuration_and_differ_by_year():
+    population, common = hphp.streams.common_generators(seed=0, rep=1)
+    other_population, other_common = hphp.streams.common_generators(seed=0, rep=1)
+    assert np.array_equal(population.random(5), other_population.random(5))
+    for a, b in zip(common.processes(3), other_common.processes(3), strict=True):
+        assert np.array_equal(a.random(5), b.random(5))
+    draws = [
+        generator.random(5) for year in (1, 2) for generator in common.processes(year)
+    ]
+    assert len({tuple(draw) for draw in draws}) == len(draws)
+
+
+def test_antithetic_processes_reflect_the_uniforms():
+    _, common = hphp.streams.common_generators(seed=0, rep=0)
+    antithetic = common._replace(antithetic=True)
+    for a, b in zip(common.processes(1), antithetic.processes(1), strict=True):
+        assert np.allclose(a.random(5), 1 - b.random(5))
+
+
+def test_antithetic_random_fills_out():
+    generator = np.random.Generator(np.random.PCG64(0))
+    antithetic = hphp.streams.Antithetic(np.random.PCG64(0))
+    out = np.empty(5)
+    assert antithetic.random(out=out) is out
+    assert np.allclose(out, 1 - generator.random(5))
@@ -0,0 +1,139 @@
+import io
+import os
+
+import pandas as pd
+
+import hphp.output
+import hphp.replication
+import hphp.sequential
+import hphp.sweep
+
+
+def test_grid_rounds_values_and_orders_configurations_as_jobs():
+    configurations = hphp.sweep.grid(
+        alpha_values=(1.0149, 1.2),
+        heal_values=(0.0, 0.1),
+        trauma_values=(0,),
+        years=10,
+    )
+    assert len(configurations) == 4
+    assert [c.alpha for c in configurations] == [1.01, 1.2, 1.01, 1.2]
+    assert [c.probability_of_heal for c in configurations] == [0.0, 0.0, 0.1, 0.1]
+    assert all(c.years == 10 for c in configurations)
+
+
+def test_directory_name_matches_main():
+    configuration = hphp.replication.Configuration(
+        alpha=1.1, probability_of_heal=0, probability_of_trauma=0.05
+    )
+    assert (
+        hphp.output.directory_name(configuration, repetitions=50)
+        == "alpha1.1_male0.51_heal0.0_trauma0.05_thr1_reps50"
+    )
+
+
+def test_run_writes_the_output_of_replicate_and_resumes(tmp_path):
+    configurations = hphp.sweep.grid(
+        alpha_values=(1.1, 1.3),
+        heal_values=(0.05,),
+        trauma_values=(0.05,),
+        years=4,
+        initial_population_size=100,
+    )
+    progress = io.StringIO()
+    written = hphp.sweep.run(
+        configurations=configurations,
+        repetitions=3,
+        output_dir=str(tmp_path),
+        seed=0,
+        pyramid_years=(0, 4),
+        processes=2,
+        progress=progress,
+    )
+    assert len(written) == 2
+    path = os.path.join(
+        tmp_path, hphp.output.directory_name(configurations[1], repetitions=3)
+    )
+    assert path in written
+    assert "6/6 tasks" in progress.getvalue()
+
+    main = pd.read_csv(
+        os.path.join(path, hphp.output.MAIN), float_precision="round_trip"
+    )
+    assert list(main["rep"].unique()) == [0, 1, 2]
+    assert len(main) == 3 * 5
+    replicates = hphp.replication.replicate(
+        configuration=configurations[1],
+        repetitions=3,
+        seed=0,
+        pyramid_years=(0, 4),
+        processes=1,
+    )
+    assert list(main["mean_aces"]) == [
+        summary["mean_aces"]
+        for replicate in replicates
+        for summary in replicate.summaries
+    ]
+    pyramids = pd.read_csv(os.path.join(path, hphp.output.PYRAMIDS))
+    assert len(pyramids) == 3 * 2 * 101
+
+    assert (
+        hphp.sweep.run(
+            configurations=configurations,
+            repetitions=3,
+            output_dir=str(tmp_path),
+            seed=0,
+            progress=None,
+        )
+        == []
+    )
+
+
+def test_run_with_precision_adds_reps_until_the_target_is_met(tmp_path):
+    configurations = hphp.sweep.grid(
+        alpha_values=(1.1,),
+        heal_values=(0.05,),
+        trauma_values=(0.05,),
+        years=4,
+        initial_population_size=100,
+    )
+    precision = hphp.sequential.Precision(
+        tolerance=0, min_repetitions=2, max_repetitions=5, batch_size=2
+    )
+    written = hphp.sweep.run(
+        configurations=configurations,
+        repetitions=5,
+        output_dir=str(tmp_path),
+        seed=0,
+        pyramid_years=(),
+        processes=2,
+        progress=None,
+        precision=precision,
+    )
+    main = pd.read_csv(os.path.join(written[0], hphp.output.MAIN))
+    assert sorted(main["rep"].unique()) == [0, 1, 2, 3, 4]
+    assert (main["repetitions"] == 5).all()
+
+
+def test_columnar_run_writes_columns_and_resumes_from_them(tmp_path):
+    configurations = hphp.sweep.grid(
+        alpha_values=(1.1,),
+        heal_values=(0.05,),
+        trauma_values=(0.05,),
+        years=4,
+        initial_population_size=100,
+    )
+    parameters = dict(
+        configurations=configurations,
+        repetitions=2,
+        output_dir=str(tmp_path),
+        seed=0,
+        processes=1,
+        progress=None,
+        columnar=True,
+    )
+    (path,) = hphp.sweep.run(**parameters)
+    assert not os.path.exists(os.path.join(path, hphp.output.MAIN))
+    columns = hphp.output.read_columns(path)
+    assert list(columns.main["rep"]) == [0] * 5 + [1] * 5
+    assert hphp.sweep.run(**parameters) == []
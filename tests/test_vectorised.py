@@ -0,0 +1,161 @@
+import numpy as np
+
+import hphp.population
+import hphp.simulation
+import hphp.vectorised
+
+
+def test_from_individuals_and_to_individuals_round_trip():
+    individuals = [
+        hphp.simulation.Individual(sex="Male", age=21, number_of_aces=3),
+        hphp.simulation.Individual(sex="Female", age=0, number_of_aces=0),
+        hphp.simulation.Individual(sex="Female", age=100, number_of_aces=8),
+    ]
+    population = hphp.population.from_individuals(individuals)
+    assert list(population.sex) == [0, 1, 1]
+    assert list(population.age) == [21, 0, 100]
+    assert list(population.number_of_aces) == [3, 0, 8]
+    assert hphp.population.to_individuals(population) == individuals
+
+
+def test_simulate_keeps_valid_states():
+    initial_population = hphp.simulation.get_population(
+        number_of_individuals=1_000,
+        population_pyramid=hphp.simulation.uk_population_pyramid,
+        seed=0,
+    )
+    populations = hphp.vectorised.simulate(
+        number_of_years=30,
+        initial_population=initial_population,
+        probability_of_male_birth=0.51,
+        alpha=1.3,
+        seed=0,
+        probability_of_heal=0.05,
+        probability_of_trauma=0.05,
+    )
+    assert len(populations) == 31
+    assert hphp.population.to_individuals(populations[0]) == initial_population
+    for population in populations:
+        assert set(population.sex) <= {0, 1}
+        assert population.age.min() >= 0
+        assert population.age.max() <= 100
+        assert population.number_of_aces.min() >= 0
+        assert population.number_of_aces.max() <= 8
+
+
+def test_simulate_with_seed_is_reproducible():
+    initial_population = hphp.simulation.get_population(
+        number_of_individuals=200,
+        population_pyramid=hphp.simulation.uk_population_pyramid,
+        seed=1,
+    )
+    kwargs = dict(
+        number_of_years=10,
+        initial_population=initial_population,
+        probability_of_male_birth=0.51,
+        seed=3,
+    )
+    first = hphp.vectorised.simulate(**kwargs)
+    second = hphp.vectorised.simulate(**kwargs)
+    for a, b in zip(first, second):
+        assert np.array_equal(a.age, b.age)
+        assert np.array_equal(a.number_of_aces, b.number_of_aces)
+
+
+def test_simulate_has_same_distribution_as_simulation_simulate():
+    """
+    Compare the mean population size, age and number of aces after 10 years
+    over repeated runs of both engines.
+    """
+    initial_population = hphp.simulation.get_population(
+        number_of_individuals=500,
+        population_pyramid=hphp.simulation.uk_population_pyramid,
+        seed=0,
+    )
+    kwargs = dict(
+        number_of_years=10,
+        initial_population=initial_population,
+        probability_of_male_birth=0.51,
+        alpha=1.5,
+        probability_of_heal=0.05,
+        probability_of_trauma=0.1,
+    )
+    loop = []
+    vectorised = []
+    for seed in range(20):
+        population = hphp.simulation.simulate(seed=seed, **kwargs)[-1]
+        loop.append(
+            (
+                len(population),
+                np.mean([individual.age for individual in population]),
+                np.mean([individual.number_of_aces for individual in population]),
+            )
+        )
+        population = hphp.vectorised.simulate(seed=seed, **kwargs)[-1]
+        vectorised.append(
+            (len(population.age), population.age.mean(), population.number_of_aces.mean())
+        )
+    assert np.allclose(np.mean(loop, axis=0), np.mean(vectorised, axis=0), rtol=0.03)
+
+
+def test_stream_yields_the_populations_of_simulate():
+    initial_population = hphp.simulation.get_population(
+        number_of_individuals=200,
+        population_pyramid=hphp.simulation.uk_population_pyramid,
+        seed=0,
+    )
+    kwargs = dict(
+        number_of_years=10,
+        initial_population=initial_population,
+        probability_of_male_birth=0.51,
+        seed=2,
+    )
+    for a, b in zip(
+        hphp.vectorised.stream(**kwargs), hphp.vectorised.simulate(**kwargs), strict=True
+    ):
+        assert np.array_equal(a.age, b.age)
+        assert np.array_equal(a.number_of_aces, b.number_of_aces)
+
+
+def test_thin_keeps_at_most_max_population_with_weight():
+    population = hphp.population.Population(
+        sex=np.zeros(1_000, dtype=np.int8),
+        age=np.arange(1_000) % 101,
+        number_of_aces=np.arange(1_000) % 9,
+    )
+    thinned = hphp.population.thin(population, 100, np.random.default_rng(0))
+    assert len(thinned.age) == 100
+    assert thinned.weight == 10
+    assert hphp.population.as_counts(thinned).sum() == 1_000
+    assert hphp.population.thin(population, 1_000, None) is population
+
+
+def test_simulate_with_max_population_estimates_the_full_population():
+    """
+    The weighted size and mean number of aces of bounded runs are close to
+    those of unbounded runs.
+    """
+    initial_population = hphp.simulation.get_population(
+        number_of_individuals=1_000,
+        population_pyramid=hphp.simulation.uk_population_pyramid,
+        seed=0,
+    )
+    kwargs = dict(
+        number_of_years=30,
+        initial_population=initial_population,
+        probability_of_male_birth=0.51,
+        alpha=1.5,
+        probability_of_heal=0.05,
+        probability_of_trauma=0.05,
+    )
+    sizes, bounded_sizes, aces, bounded_aces = [], [], [], []
+    for seed in range(10):
+        final = hphp.vectorised.simulate(seed=seed, **kwargs)[-1]
+        bounded = hphp.vectorised.simulate(seed=seed, max_population=300, **kwargs)
+        assert all(len(population.age) <= 300 for population in bounded)
+        sizes.append(len(final.age))
+        bounded_sizes.append(hphp.population.as_counts(bounded[-1]).sum())
+        aces.append(final.number_of_aces.mean())
+        bounded_aces.append(bounded[-1].number_of_aces.mean())
+    assert np.isclose(np.mean(bounded_sizes), np.mean(sizes), rtol=0.1)
+    assert np.isclose(np.mean(bounded_aces), np.mean(aces), rtol=0.1)
@@ -9,6 +9,9 @@ import numpy as np
 import pandas as pd
 from matplotlib.lines import Line2D
 
+import hphp.individual
+import hphp.rates
+
 
 # rcParams
 mpl.rcParams.update(
@@ -50,42 +53,9 @@ PYRAMID_BIN_SIZE = 5  # group single-year ages into 5-year bins for display
 AGE_DISPLAY_BINS = list(range(0, 100, PYRAMID_BIN_SIZE))
 AGE_LABELS = [f"{a}–{a+4}" for a in AGE_DISPLAY_BINS[:-1]] + ["95+"]
 
-# Life-table death probabilities (UN 1985, from birth_death.py)
-_MALE_Q = np.array([
-    0.07446, 0.01592, 0.00925, 0.00641, 0.00485, 0.00377, 0.00299,
-    0.00241, 0.00199, 0.00172, 0.00157, 0.00150, 0.00150, 0.00153,
-    0.00161, 0.00173, 0.00189, 0.00209, 0.00230, 0.00248, 0.00265,
-    0.00279, 0.00290, 0.00303, 0.00311, 0.00312, 0.00310, 0.00309,
-    0.00313, 0.00317, 0.00326, 0.00334, 0.00345, 0.00356, 0.00368,
-    0.00385, 0.00400, 0.00407, 0.00433, 0.00455, 0.00488, 0.00516,
-    0.00550, 0.00596, 0.00634, 0.00686, 0.00736, 0.00785, 0.00848,
-    0.00909, 0.00992, 0.01064, 0.01154, 0.01240, 0.01327, 0.01428,
-    0.01534, 0.01660, 0.01805, 0.01963, 0.02168, 0.02369, 0.02580,
-    0.02821, 0.03048, 0.03334, 0.03566, 0.03874, 0.04193, 0.04536,
-    0.04968, 0.05367, 0.05856, 0.06368, 0.06924, 0.07541, 0.08165,
-    0.08858, 0.09608, 0.10417, 0.11372, 0.12342, 0.13357, 0.14442,
-    0.15646, 0.16863, 0.17992, 0.19350, 0.20749, 0.22131, 0.23581,
-    0.25014, 0.26705, 0.28080, 0.29747, 0.31033, 0.32555, 0.34112,
-    0.35664, 0.37224, 1.0000,
-])
-
-_FEMALE_Q = np.array([
-    0.07033, 0.01503, 0.00883, 0.00630, 0.00494, 0.00393, 0.00312,
-    0.00246, 0.00194, 0.00159, 0.00141, 0.00132, 0.00130, 0.00131,
-    0.00137, 0.00145, 0.00155, 0.00166, 0.00177, 0.00183, 0.00188,
-    0.00192, 0.00197, 0.00205, 0.00211, 0.00214, 0.00216, 0.00217,
-    0.00222, 0.00226, 0.00231, 0.00236, 0.00242, 0.00247, 0.00254,
-    0.00264, 0.00280, 0.00288, 0.00306, 0.00326, 0.00346, 0.00360,
-    0.00376, 0.00393, 0.00409, 0.00433, 0.00459, 0.00488, 0.00530,
-    0.00571, 0.00622, 0.00670, 0.00720, 0.00766, 0.00811, 0.00865,
-    0.00927, 0.01002, 0.01096, 0.01199, 0.01329, 0.01457, 0.01605,
-    0.01767, 0.01921, 0.02124, 0.02314, 0.02537, 0.02758, 0.02976,
-    0.03265, 0.03525, 0.03877, 0.04252, 0.04665, 0.05145, 0.05614,
-    0.06161, 0.06740, 0.07378, 0.08176, 0.08972, 0.09839, 0.10751,
-    0.11900, 0.13060, 0.14029, 0.15284, 0.16478, 0.17836, 0.19303,
-    0.20629, 0.22322, 0.23829, 0.25346, 0.27026, 0.28709, 0.30468,
-    0.32225, 0.33985, 1.0000,
-])
+# Life-table death probabilities (UN 1985, shared with the simulations)
+_MALE_Q = hphp.rates.PROBABILITY_OF_DEATH[hphp.individual.MALE]
+_FEMALE_Q = hphp.rates.PROBABILITY_OF_DEATH[hphp.individual.FEMALE]
 
 
 def _survivorship(q):
@@ -1,16 +1,132 @@
 """
-Python script to write jobs
+Python script to run the sweep of the figure 4 data
+
+Every (alpha, heal, trauma, rep) task runs in one pool of worker processes and
+each configuration is written to `raw` in the layout of `main.py`. Re-running
+skips the configurations that are already complete.
+
+With `--queue` the tasks are added to a shared job queue (see `hphp.jobqueue`)
+instead, and this process runs workers on it: running the script again, on
+this or another machine, adds workers to the same sweep.
+
+With `--common_random_numbers` every configuration uses the same random
+numbers for a given rep, so differences between neighbouring cells need fewer
+repetitions to show.
+
+With `--tolerance` the number of reps of each configuration is adaptive: reps
+are added until the 95% confidence interval of the mean ACEs after the
+warm-up of the figure is within the tolerance, between `--min_repetitions`
+and `--repetitions` reps (see `hphp.sequential`).
+
+With `--antithetic` the reps of every cell run in antithetic pairs.
+
+With `--columnar` every configuration is written as `.npy` columns rather than
+csv files (see `hphp.output.write_columns`), which `../main.py` loads much
+faster.
 """
 
+import argparse
+
 import numpy as np
-import itertools
+
+import hphp.jobqueue as jobqueue
+import hphp.sequential as sequential
+import hphp.sweep as sweep
 
 q_values = np.linspace(0, 0.60, 60)
 p_values = (0, 0.05)
 alpha_values = np.linspace(1.01, 1.50, 49)
+warm_up = 100
+
 
-for p, q, alpha in itertools.product(p_values, q_values, alpha_values):
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the figure 4 sweep.")
+    parser.add_argument("--repetitions", type=int, default=50)
+    parser.add_argument("--years", type=int, default=200)
+    parser.add_argument("--initial_population_size", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--output_dir", type=str, default="raw")
+    parser.add_argument(
+        "--common_random_numbers",
+        action="store_true",
+        help="Use the same random numbers for a given rep of every cell.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=None,
+        help="Add reps until the mean ACEs is known to within this tolerance.",
+    )
+    parser.add_argument("--min_repetitions", type=int, default=6)
+    parser.add_argument(
+        "--antithetic",
+        action="store_true",
+        help="Run the repetitions of every cell in antithetic pairs.",
+    )
+    parser.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Write the results as .npy columns instead of csv files.",
+    )
+    parser.add_argument(
+        "--queue",
+        type=str,
+        default=None,
+        help="Path of a job queue database to share the sweep between workers.",
+    )
+    return parser.parse_args()
 
-    print(
-        f"uv run main.py --repetitions 50 --years 200 --initial_population_size 10000 --probability_of_trauma {p:.02f} --probability_of_heal {q:.02f} --alpha {alpha:.02f}"
+
+def main():
+    args = parse_args()
+    configurations = sweep.grid(
+        alpha_values=alpha_values,
+        heal_values=q_values,
+        trauma_values=p_values,
+        years=args.years,
+        initial_population_size=args.initial_population_size,
+        common_random_numbers=args.common_random_numbers,
+        antithetic=args.antithetic,
+    )
+    precision = None
+    if args.tolerance is not None:
+        precision = sequential.Precision(
+            metric="mean_aces",
+            warm_up=warm_up,
+            tolerance=args.tolerance,
+            min_repetitions=args.min_repetitions,
+            max_repetitions=args.repetitions,
+            batch_size=6,
+            paired=args.antithetic,
+        )
+    if args.queue is not None:
+        if precision is not None:
+            raise SystemExit("--tolerance is not supported with --queue")
+        queue = jobqueue.JobQueue(args.queue)
+        queue.add(
+            configurations=configurations,
+            repetitions=args.repetitions,
+            seed=args.seed,
+        )
+        jobqueue.run_workers(
+            path=args.queue,
+            output_dir=args.output_dir,
+            processes=args.processes,
+            columnar=args.columnar,
+        )
+        print(queue.counts())
+        return
+    sweep.run(
+        configurations=configurations,
+        repetitions=args.repetitions,
+        output_dir=args.output_dir,
+        seed=args.seed,
+        processes=args.processes,
+        precision=precision,
+        columnar=args.columnar,
     )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,19 @@
 import argparse
 import os
-import csv
-import numpy as np
 
-import hphp.simulation as sim
+import hphp.control as control
+import hphp.output as output
+import hphp.reducers as reducers
+import hphp.replication as replication
+import hphp.sequential as sequential
 
-PYRAMID_YEARS = [0, 50, 100, 150, 200]
-AGE_BIN_SIZE = 1
-AGE_BINS = list(range(0, 101))  # [0, 1, 2, ..., 100]
+# Metrics whose final-year estimates are reported.
+REPORTED_METRICS = ("mean_aces", "prop_traumatised")
 
 
 def parse_args():
     parser = argparse.ArgumentParser(
-        description="Run hphp simulations and write results to CSV."
+        description="Run hphp simulations and write results to CSV or columns."
     )
 
     parser.add_argument("--repetitions", type=int, default=10)
@@ -33,177 +34,99 @@ def parse_args():
     )
 
     parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=None,
+        help="Number of worker processes for the repetitions (all CPUs if unset).",
+    )
     parser.add_argument("--output_dir", type=str, default="raw")
-
-    return parser.parse_args()
-
-
-def make_output_directory(args):
-    dir_name = (
-        f"alpha{args.alpha}_"
-        f"male{args.probability_of_male_birth}_"
-        f"heal{args.probability_of_heal}_"
-        f"trauma{args.probability_of_trauma}_"
-        f"thr{args.trauma_threshold}_"
-        f"reps{args.repetitions}"
+    parser.add_argument(
+        "--antithetic",
+        action="store_true",
+        help="Run the repetitions in antithetic pairs.",
+    )
+    parser.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Write the results as .npy columns instead of csv files.",
+    )
+    parser.add_argument(
+        "--age_bands",
+        type=int,
+        nargs="+",
+        default=list(reducers.ALL_AGES),
+        help="Edges of the age bands of the ACE histograms (all ages if unset).",
     )
 
-    full_path = os.path.join(args.output_dir, dir_name)
-    os.makedirs(full_path, exist_ok=True)
-    return full_path
-
-
-def summarise_population(individuals, trauma_threshold: int):
-    """Return simple summary statistics for a population."""
-    size = len(individuals)
-    if size == 0:
-        return {
-            "population_size": 0,
-            "males": 0,
-            "females": 0,
-            "mean_age": np.nan,
-            "mean_aces": np.nan,
-            "prop_traumatised": np.nan,
-            "mean_age_traumatised": np.nan,
-            "mean_age_not_traumatised": np.nan,
-        }
-
-    males = sum(1 for ind in individuals if ind.sex == "Male")
-    females = size - males
-
-    ages = np.array([ind.age for ind in individuals], dtype=float)
-    aces = np.array([ind.number_of_aces for ind in individuals], dtype=float)
-
-    traum = aces >= trauma_threshold
-    n_tr = int(np.sum(traum))
-
-    prop_tr = n_tr / size
-
-    # Means by trauma state; NaN if group is empty
-    mean_age_tr = float(np.mean(ages[traum])) if n_tr > 0 else np.nan
-    mean_age_nt = float(np.mean(ages[~traum])) if n_tr < size else np.nan
-
-    return {
-        "population_size": size,
-        "males": males,
-        "females": females,
-        "mean_age": float(np.mean(ages)),
-        "mean_aces": float(np.mean(aces)),
-        "prop_traumatised": float(prop_tr),
-        "mean_age_traumatised": mean_age_tr,
-        "mean_age_not_traumatised": mean_age_nt,
-    }
-
-
-def age_distribution(individuals):
-    """Count males and females in each 5-year age bin."""
-    n_bins = len(AGE_BINS)
-    male_counts = np.zeros(n_bins, dtype=int)
-    female_counts = np.zeros(n_bins, dtype=int)
-    for ind in individuals:
-        bin_idx = min(int(ind.age) // AGE_BIN_SIZE, n_bins - 1)
-        if ind.sex == "Male":
-            male_counts[bin_idx] += 1
-        else:
-            female_counts[bin_idx] += 1
-    return male_counts, female_counts
+    return parser.parse_args()
 
 
 def main():
     args = parse_args()
 
-    output_path = make_output_directory(args)
-    csv_path = os.path.join(output_path, "main.csv")
-    pyramid_path = os.path.join(output_path, "pyramids.csv")
-
-    # ---- collect all input parameters once ----
-    input_params = {
-        "repetitions": args.repetitions,
-        "years": args.years,
-        "initial_population_size": args.initial_population_size,
-        "alpha": args.alpha,
-        "probability_of_male_birth": args.probability_of_male_birth,
-        "probability_of_heal": args.probability_of_heal,
-        "probability_of_trauma": args.probability_of_trauma,
-        "trauma_threshold": args.trauma_threshold,
-        "base_seed": args.seed,
-    }
-
-    fieldnames = [
-        "rep",
-        "year",
-        *input_params.keys(),
-        "population_size",
-        "males",
-        "females",
-        "mean_age",
-        "mean_aces",
-        "prop_traumatised",
-        "mean_age_traumatised",
-        "mean_age_not_traumatised",
-    ]
-
-    rows = []
-    pyramid_rows = []
-    pyramid_fieldnames = ["rep", "year", "age_group", "males", "females"]
-
-    for rep in range(args.repetitions):
-
-        seed = None if args.seed is None else args.seed + rep
-
-        initial_population = sim.get_population(
-            number_of_individuals=args.initial_population_size,
-            population_pyramid=sim.uk_population_pyramid,
-            seed=seed,
-        )
+    configuration = replication.Configuration(
+        years=args.years,
+        initial_population_size=args.initial_population_size,
+        alpha=args.alpha,
+        probability_of_male_birth=args.probability_of_male_birth,
+        probability_of_heal=args.probability_of_heal,
+        probability_of_trauma=args.probability_of_trauma,
+        trauma_threshold=args.trauma_threshold,
+        antithetic=args.antithetic,
+    )
+    output_path = os.path.join(
+        args.output_dir, output.directory_name(configuration, args.repetitions)
+    )
 
-        history = sim.simulate(
-            number_of_years=args.years,
-            initial_population=initial_population,
-            probability_of_male_birth=args.probability_of_male_birth,
-            alpha=args.alpha,
-            probability_of_heal=args.probability_of_heal,
-            probability_of_trauma=args.probability_of_trauma,
-            seed=seed,
-        )
+    replicates = replication.replicate(
+        configuration=configuration,
+        repetitions=args.repetitions,
+        seed=args.seed,
+        pyramid_years=output.PYRAMID_YEARS,
+        processes=args.processes,
+        age_bands=args.age_bands,
+    )
+    output.write(
+        path=output_path,
+        configuration=configuration,
+        repetitions=args.repetitions,
+        seed=args.seed,
+        replicates=replicates,
+        columnar=args.columnar,
+    )
 
-        for year, population in enumerate(history):
-            s = summarise_population(population, args.trauma_threshold)
-
-            row = {
-                "rep": rep,
-                "year": year,
-                **input_params,
-                **s,
-            }
-
-            rows.append(row)
-
-            if year in PYRAMID_YEARS:
-                male_counts, female_counts = age_distribution(population)
-                for i, age_group in enumerate(AGE_BINS):
-                    pyramid_rows.append(
-                        {
-                            "rep": rep,
-                            "year": year,
-                            "age_group": age_group,
-                            "males": int(male_counts[i]),
-                            "females": int(female_counts[i]),
-                        }
-                    )
-
-    with open(csv_path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
-
-    with open(pyramid_path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=pyramid_fieldnames)
-        writer.writeheader()
-        writer.writerows(pyramid_rows)
-
-    print(f"Wrote results to {csv_path}")
-    print(f"Wrote pyramids to {pyramid_path}")
+    if args.columnar:
+        print(f"Wrote results to {os.path.join(output_path, output.COLUMNS)}")
+    else:
+        print(f"Wrote results to {os.path.join(output_path, output.MAIN)}")
+        print(f"Wrote pyramids to {os.path.join(output_path, output.PYRAMIDS)}")
+    print(f"Wrote ACE histograms to {os.path.join(output_path, output.HISTOGRAMS)}")
+    for metric in REPORTED_METRICS:
+        outcomes = sequential.Precision(metric=metric, warm_up=args.years).outcomes(
+            replicates
+        )
+        report = format_estimate(sequential.estimate(outcomes), "reps")
+        if args.antithetic:
+            paired = format_estimate(sequential.paired_estimate(outcomes), "pairs")
+            report = f"{report}; paired {paired}"
+        elif args.seed is not None:
+            controlled = control.estimate(
+                configuration,
+                replicates,
+                seed=args.seed,
+                metric=metric,
+                warm_up=args.years,
+            )
+            report = f"{report}; control variate {format_estimate(controlled, 'reps')}"
+        print(f"Final {metric}: {report}")
+
+
+def format_estimate(estimate, samples):
+    return (
+        f"{estimate.mean:.4f} \u00b1 {estimate.half_width:.4f} "
+        f"({estimate.samples} {samples})"
+    )
 
 
 if __name__ == "__main__":
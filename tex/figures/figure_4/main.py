@@ -12,6 +12,8 @@ from matplotlib.lines import Line2D
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 from sklearn.cluster import KMeans
 
+import hphp.output as output
+
 # rcParams
 mpl.rcParams.update(
     {
@@ -581,12 +583,29 @@ def make_figure_2col(
     return fig
 
 
+# Data loading
+
+
+def load_main(raw_data_path):
+    """
+    Load the summaries of every configuration in raw_data_path, from the
+    columns written by `hphp.output.write_columns` where they exist and from
+    main.csv otherwise.
+    """
+    frames = []
+    for path in sorted(raw_data_path.iterdir()):
+        if output.is_complete(path, columnar=True):
+            frames.append(pd.DataFrame(output.read_columns(path).table()))
+        elif (path / output.MAIN).exists() and (path / output.MAIN).stat().st_size:
+            frames.append(pd.read_csv(path / output.MAIN))
+    return pd.concat(frames)
+
+
 # Entry point
 
 if __name__ == "__main__":
     raw_data_path = pathlib.Path(__file__).parent / "data" / "raw"
-    csv_paths = raw_data_path.glob("**/main.csv")
-    df = pd.concat(pd.read_csv(p) for p in csv_paths if p.stat().st_size > 0)
+    df = load_main(raw_data_path)
 
     shared_kwargs = dict(
         q_heal=[0.0, 0.01, 0.02, 0.05, 0.1],